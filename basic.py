@@ -5,6 +5,8 @@ import os
 from pathlib import Path
 import logging
 from display_adapter import display_full_refresh, initialize_display, display_cleanup
+from frame_diff import FrameChangeTracker
+from ghosting import GhostingBudget
 import time
 from datetime import datetime, timedelta
 from weather.display import WeatherService, draw_weather_display
@@ -50,13 +52,20 @@ from token_usage import (
     token_view_at,
 )
 from screen_arbiter import ScreenArbiter
+from deadline_scheduler import DeadlineScheduler
 from rss_plugin import RSSPlugin
 from breaking_news_plugin import BreakingNewsPlugin
 from calendar_plugin import CalendarPlugin
+from calendar_service import CalendarClient
 from ynab_plugin import YnabGlancePlugin
 from home_assistant_plugin import HomeAssistantPlugin
 from display_override_api import DisplayOverrideServer
+from display_protocol import DEFAULT_CHANNEL
 from plugins import DisplayOverride, PluginContext, PluginRegistry
+from publication_display import PublicationDisplay
+from render_lock import RenderLock
+from snapshot_worker import SnapshotWorker
+from io_runtime import configured_io_runtime
 
 logger = logging.getLogger(__name__)
 # Set logging level for PIL.PngImagePlugin and urllib3.connectionpool to warning
@@ -67,8 +76,13 @@ display_lock = return_display_lock()  # Global lock for display operations
 
 DISPLAY_REFRESH_INTERVAL = int(os.getenv("refresh_interval", 90))
 DISPLAY_REFRESH_MINIMAL_TIME = int(os.getenv("refresh_minimal_time", 30))
-DISPLAY_REFRESH_FULL_INTERVAL = int(os.getenv("refresh_full_interval", 3600))
 WEATHER_UPDATE_INTERVAL = int(os.getenv("refresh_weather_interval", 600))
+# The update loop sleeps until its next deadline; this caps an idle sleep so
+# a wall-clock jump (NTP sync after boot) delays a deadline by at most as much.
+DISPLAY_LOOP_MAX_IDLE = 30
+# A deadline found past due but not acted on (a failed prefetch) retries at
+# the old polling cadence instead of spinning.
+DISPLAY_LOOP_RETRY = 1
 BUS_DATA_MAX_AGE = max(90, DISPLAY_REFRESH_INTERVAL)  # Ensure bus data doesn't become stale before next refresh
 
 weather_enabled = True if os.getenv("weather_enabled", "true").lower() == "true" else False
@@ -125,15 +139,30 @@ class WeatherManager:
         self.last_update = None
         self._lock = threading.Lock()
         self._thread = None
+        self._task = None
         self._stop_event = threading.Event()
         logger.info("WeatherManager initialized")
 
-    def start(self):
+    def start(self, runtime=None):
+        if (self._thread and self._thread.is_alive()) or self._task is not None:
+            # Shared between display profiles; the first start wins.
+            return
         if weather_enabled and self.weather_service:
-            logger.info("Starting weather manager thread...")
-            self._thread = threading.Thread(target=self._update_weather, daemon=True)
-            self._thread.start()
-            logger.info("Weather manager thread started")
+            if runtime is not None:
+                self._task = runtime.every(
+                    "WeatherManager",
+                    self._update_weather_if_due,
+                    min(60, WEATHER_UPDATE_INTERVAL),
+                    initial_delay=min(60, WEATHER_UPDATE_INTERVAL),
+                )
+                logger.info("Weather manager scheduled on the shared runtime")
+            else:
+                logger.info("Starting weather manager thread...")
+                self._thread = threading.Thread(
+                    target=self._update_weather, daemon=True
+                )
+                self._thread.start()
+                logger.info("Weather manager thread started")
             # Get initial weather data
             logger.info("Getting initial weather data...")
             self._update_weather_once()
@@ -176,18 +205,7 @@ class WeatherManager:
         logger.info("Weather update loop started")
         while not self._stop_event.is_set():
             try:
-                current_time = datetime.now()
-                if not self.last_update:
-                    logger.debug("No previous update, updating weather now")
-                    self._update_weather_once()
-                else:
-                    time_since_update = (current_time - self.last_update).total_seconds()
-                    logger.debug(f"Time since last weatherupdate: {time_since_update:.1f} seconds")
-                    if time_since_update >= WEATHER_UPDATE_INTERVAL:
-                        logger.debug("Update interval reached, updating weather")
-                        self._update_weather_once()
-                    else:
-                        logger.debug(f"Next update in {WEATHER_UPDATE_INTERVAL - time_since_update:.1f} seconds")
+                self._update_weather_if_due()
             except Exception as e:
                 logger.error(f"Error in weather update loop: {e}")
                 logger.debug(traceback.format_exc())
@@ -196,6 +214,20 @@ class WeatherManager:
             logger.debug(f"Sleeping for {sleep_time} seconds")
             time.sleep(sleep_time)
 
+    def _update_weather_if_due(self):
+        current_time = datetime.now()
+        if not self.last_update:
+            logger.debug("No previous update, updating weather now")
+            self._update_weather_once()
+        else:
+            time_since_update = (current_time - self.last_update).total_seconds()
+            logger.debug(f"Time since last weatherupdate: {time_since_update:.1f} seconds")
+            if time_since_update >= WEATHER_UPDATE_INTERVAL:
+                logger.debug("Update interval reached, updating weather")
+                self._update_weather_once()
+            else:
+                logger.debug(f"Next update in {WEATHER_UPDATE_INTERVAL - time_since_update:.1f} seconds")
+
     def get_weather(self):
         """Get current weather data"""
         if not weather_enabled:
@@ -206,6 +238,9 @@ class WeatherManager:
             return self.weather_data
 
     def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
         if self._thread:
             logger.info("Stopping weather manager thread...")
             self._stop_event.set()
@@ -221,8 +256,8 @@ class WeatherManager:
             return self.weather_data
 
 class BusManager:
-    def __init__(self):
-        self.bus_service = BusService() if transit_enabled else None
+    def __init__(self, stop_id=None, lines=None):
+        self.bus_service = BusService(stop_id, lines) if transit_enabled else None
         self.bus_data = {
             'data': [],
             'error_message': None if transit_enabled else "Transit display is disabled",
@@ -288,6 +323,84 @@ class BusManager:
         with self._lock:
             return self.bus_data.get('stop_name')
 
+class SharedDataServices:
+    """Upstream data fetched once for every display profile of a render server.
+
+    Weather, ADS-B flights (plus the recent-flight and statistics history),
+    calendar events and the Home Assistant connection do not depend on the
+    panel. Profiles share these instead of each polling the same sources.
+    """
+
+    def __init__(self):
+        self.weather_manager = WeatherManager()
+        self.io_runtime = configured_io_runtime()
+        self.recent_flights = RecentFlightCache(max_entries=4)
+        self.flight_statistics = _open_flight_statistics()
+        self.calendar_client = None
+        self._flight_getter = None
+        self._flight_history_owner = None
+        self._home_assistant_service = None
+        self._lock = threading.Lock()
+
+    def flight_getter(self):
+        with self._lock:
+            if self._flight_getter is None:
+                self._flight_getter = gather_flights_within_radius(
+                    COORDINATES_LAT,
+                    COORDINATES_LNG,
+                    FLIGHT_MAX_RADIUS * 2,
+                    FLIGHT_MAX_RADIUS,
+                    flight_check_interval=flight_check_interval,
+                    aeroapi_enabled=aeroapi_enabled,
+                )
+            return self._flight_getter
+
+    def records_flight_history(self, display_id):
+        """Return True for the one profile that records observed flights."""
+        with self._lock:
+            if self._flight_history_owner is None:
+                self._flight_history_owner = display_id
+            return self._flight_history_owner == display_id
+
+    def stop(self):
+        """Stop the weather fetcher and runtime after every profile has."""
+        self.weather_manager.stop()
+        if self.io_runtime is not None:
+            self.io_runtime.stop()
+
+    def calendar(self):
+        with self._lock:
+            if self.calendar_client is None:
+                self.calendar_client = CalendarClient()
+            return self.calendar_client
+
+    def home_assistant_plugin(self, context):
+        with self._lock:
+            plugin = HomeAssistantPlugin.from_env(
+                context, service=self._home_assistant_service
+            )
+            if plugin is not None:
+                self._home_assistant_service = plugin.service
+            return plugin
+
+
+def _open_flight_statistics():
+    try:
+        return FlightStatisticsStore(
+            os.getenv("flight_statistics_db", "cache/flight_statistics.sqlite3"),
+            retention_days=int(os.getenv("flight_statistics_retention_days", "400")),
+            encounter_gap_minutes=int(
+                os.getenv("flight_statistics_encounter_gap_minutes", "30")
+            ),
+            update_interval_seconds=int(
+                os.getenv("flight_statistics_update_seconds", "120")
+            ),
+        )
+    except (OSError, sqlite3.Error, ValueError) as exc:
+        logger.warning("Flight statistics are unavailable: %s", exc)
+        return None
+
+
 class DisplayManager:
     FLIGHT_SCREEN_OWNER = "flight"
     ISS_SCREEN_OWNER = "iss"
@@ -310,20 +423,31 @@ class DisplayManager:
         "weather": "weather",
     }
 
-    def __init__(self, epd):
+    def __init__(self, epd, *, profile=None, shared=None):
         self.epd = epd
-        self.update_count = 0
+        # A render server with several panels runs one manager per display
+        # profile, all reading from the same SharedDataServices.
+        self.profile = profile
+        self.shared = shared
         self.last_weather_data = None
         self.last_weather_update = datetime.now()
         self.last_display_update = datetime.now()
         self.last_flight_update = datetime.now()
         self.in_weather_mode = False
-        self.weather_manager = WeatherManager()
-        self.bus_manager = BusManager()
+        self.weather_manager = shared.weather_manager if shared else WeatherManager()
+        # None in the default threaded mode; see io_runtime.py.
+        self.io_runtime = shared.io_runtime if shared else configured_io_runtime()
+        self.bus_manager = (
+            BusManager(profile.stop, profile.lines) if profile else BusManager()
+        )
         self.prefetch_done = False  # Flag to track if we've prefetched for the next update
         if transit_enabled and self.bus_manager and self.bus_manager.bus_service:
             self.bus_manager.bus_service.set_epd(epd)  # Set the EPD object for the bus service
-        self._display_lock = threading.Lock()
+        self._display_lock = RenderLock(
+            warn_after_seconds=float(os.getenv("display_lock_warn_seconds", "2"))
+        )
+        if isinstance(epd, PublicationDisplay):
+            epd.render_lock = self._display_lock
         self._prefetch_lock = threading.Lock()  # Add lock for prefetch operations
         self._check_data_thread = None
         self._flight_thread = None
@@ -335,21 +459,16 @@ class DisplayManager:
         self.coordinates_lat = float(os.getenv('Coordinates_LAT', '50.8503'))
         self.coordinates_lng = float(os.getenv('Coordinates_LNG', '4.3517'))
         self.flight_getter = None
-        self.recent_flights = RecentFlightCache(max_entries=4)
-        try:
-            self.flight_statistics = FlightStatisticsStore(
-                os.getenv("flight_statistics_db", "cache/flight_statistics.sqlite3"),
-                retention_days=int(os.getenv("flight_statistics_retention_days", "400")),
-                encounter_gap_minutes=int(
-                    os.getenv("flight_statistics_encounter_gap_minutes", "30")
-                ),
-                update_interval_seconds=int(
-                    os.getenv("flight_statistics_update_seconds", "120")
-                ),
+        if shared:
+            self.recent_flights = shared.recent_flights
+            self.flight_statistics = shared.flight_statistics
+            self.records_flight_history = shared.records_flight_history(
+                profile.display_id if profile else None
             )
-        except (OSError, sqlite3.Error, ValueError) as exc:
-            logger.warning("Flight statistics are unavailable: %s", exc)
-            self.flight_statistics = None
+        else:
+            self.recent_flights = RecentFlightCache(max_entries=4)
+            self.flight_statistics = _open_flight_statistics()
+            self.records_flight_history = True
         self.in_flight_mode = False
         self.flight_mode_start = None
         self.flight_mode_duration = 30  # Duration in seconds for flight mode
@@ -370,6 +489,11 @@ class DisplayManager:
             os.getenv("screen_priority_iss", default_iss_priority)
         )
         self.screen_arbiter = ScreenArbiter()
+        self._scheduler = DeadlineScheduler()
+        # Takeovers, overrides and releases wake the update loop at once.
+        self.screen_arbiter.add_listener(
+            lambda previous, current: self._scheduler.notify("screen-owner")
+        )
         self.override_priority = int(os.getenv("display_override_priority", "30"))
         self.override_duration_seconds = max(
             1, int(os.getenv("display_override_duration_seconds", "300"))
@@ -385,6 +509,20 @@ class DisplayManager:
         self.next_prefetch_time = None
         self.token_usage_client = TokenUsageClient()
         self.ynab_client = YnabBudgetClient()
+        # Token and YNAB endpoints are fetched here, never under the display
+        # lock; renders read the clients' cached snapshots.
+        self._snapshot_workers = [
+            SnapshotWorker(
+                name,
+                client.get_snapshot,
+                interval_seconds=client.refresh_interval,
+            )
+            for name, client in (
+                ("token-usage", self.token_usage_client),
+                ("ynab", self.ynab_client),
+            )
+            if client.enabled
+        ]
         self.display_schedule = configured_schedule()
         self.token_views = configured_token_views()
         self.ynab_views = configured_ynab_views()
@@ -396,9 +534,11 @@ class DisplayManager:
             self.screen_arbiter,
             self._display_lock,
             self._plugin_rendered,
+            runtime=self.io_runtime,
         )
         self.calendar_plugin = CalendarPlugin(
             plugin_context,
+            client=shared.calendar() if shared else None,
             base_mode_at=self.display_schedule.mode_at,
         )
         self.ynab_glance_plugin = YnabGlancePlugin(
@@ -411,18 +551,32 @@ class DisplayManager:
             on_release=self._ynab_glance_released,
             is_current=lambda: self.current_display_mode == YnabGlancePlugin.OWNER,
             base_mode_at=self.display_schedule.mode_at,
+            runtime=self.io_runtime,
         )
         self.rss_plugin = RSSPlugin(plugin_context)
         self.breaking_news_plugin = BreakingNewsPlugin(plugin_context)
-        self.home_assistant_plugin = HomeAssistantPlugin.from_env(plugin_context)
+        self.home_assistant_plugin = None
+        if profile is None or profile.allows_plugin("home_assistant"):
+            # Each plugin listens on the shared service, so only build it for
+            # profiles that show Home Assistant screens.
+            self.home_assistant_plugin = (
+                shared.home_assistant_plugin(plugin_context)
+                if shared
+                else HomeAssistantPlugin.from_env(plugin_context)
+            )
+        plugins = {
+            "calendar": self.calendar_plugin,
+            "rss": self.rss_plugin,
+            "breaking_news": self.breaking_news_plugin,
+            "ynab": self.ynab_glance_plugin,
+            "home_assistant": self.home_assistant_plugin,
+        }
         self.plugin_registry = PluginRegistry(
-            [plugin for plugin in [
-                self.calendar_plugin,
-                self.rss_plugin,
-                self.breaking_news_plugin,
-                self.ynab_glance_plugin,
-                self.home_assistant_plugin,
-            ] if plugin is not None]
+            [
+                plugin
+                for name, plugin in plugins.items()
+                if plugin is not None and (profile is None or profile.allows_plugin(name))
+            ]
         )
         self._configure_display_overrides()
         self.override_server = DisplayOverrideServer(
@@ -430,6 +584,9 @@ class DisplayManager:
             self.clear_display_override,
             self.display_override_status,
         )
+        if profile is not None and profile.display_id != DEFAULT_CHANNEL:
+            # The override API has one listener; it drives the default panel.
+            self.override_server.enabled = False
         logger.info(f"DisplayManager initialized with min refresh interval: {self.min_refresh_interval}s")
         logger.info(f"DisplayManager initialized with coordinates: {self.coordinates_lat}, {self.coordinates_lng}")
         logger.info(f"DisplayManager initialized with flight mode duration: {self.flight_mode_duration}s")
@@ -443,6 +600,23 @@ class DisplayManager:
         if self.ynab_client.enabled:
             logger.info("YNAB display enabled with views: %s", ", ".join(self.ynab_views))
 
+    @property
+    def current_display_mode(self):
+        return self._current_display_mode
+
+    @current_display_mode.setter
+    def current_display_mode(self, mode):
+        self._current_display_mode = mode
+        # Render paths set the mode right after drawing, which attributes the
+        # frame's changed-pixel metrics to the screen that produced it.
+        epd = getattr(self, "epd", None)
+        tracker = getattr(epd, "frame_changes", None)
+        if isinstance(tracker, FrameChangeTracker):
+            tracker.attribute(mode)
+        if isinstance(epd, PublicationDisplay):
+            arbiter = getattr(self, "screen_arbiter", None)
+            epd.attribute_frame(mode, arbiter.active_owner() if arbiter else None)
+
     def _calendar_rendered(self, owner):
         self._plugin_rendered(owner)
 
@@ -465,14 +639,14 @@ class DisplayManager:
                 return self._ynab_fallback_mode()
             return (
                 scheduled_mode
-                if self.ynab_client.get_snapshot()
+                if self.ynab_client.cached_snapshot()
                 else self._ynab_fallback_mode()
             )
         if scheduled_mode not in {"token", "token-always"}:
             return scheduled_mode
         if not self.token_usage_client.enabled:
             return self._token_fallback_mode()
-        snapshot = self.token_usage_client.get_snapshot()
+        snapshot = self.token_usage_client.cached_snapshot()
         if snapshot and not snapshot.stale and (
             scheduled_mode == "token-always"
             or snapshot.active
@@ -500,7 +674,7 @@ class DisplayManager:
         return mode if mode in {"auto", "transit", "weather"} else "transit"
 
     def _draw_token_usage(self, current_time, require_active=True):
-        snapshot = self.token_usage_client.get_snapshot()
+        snapshot = self.token_usage_client.cached_snapshot()
         reset_notice = getattr(snapshot, "reset_notice", None) if snapshot else None
         if not snapshot or snapshot.stale or (
             require_active and not snapshot.active and not reset_notice
@@ -521,7 +695,7 @@ class DisplayManager:
         return True
 
     def _draw_ynab(self, current_time):
-        snapshot = self.ynab_client.get_snapshot()
+        snapshot = self.ynab_client.cached_snapshot()
         if not snapshot:
             return False
         view = ynab_view_at(current_time, self.ynab_views)
@@ -674,8 +848,26 @@ class DisplayManager:
             "active_owner": self.screen_arbiter.active_owner(),
             "duration_seconds": self.override_duration_seconds,
             "modules": sorted(set(self._override_aliases().values())),
+            "frame_changes": self._frame_change_stats(),
+            "ghosting": budget.stats() if (budget := self._ghosting_budget()) else None,
+            "display_lock": self._display_lock_stats(),
+            "snapshots": {
+                worker.name: worker.stats()
+                for worker in getattr(self, "_snapshot_workers", ())
+            },
+            "runtime": runtime.stats()
+            if (runtime := getattr(self, "io_runtime", None))
+            else None,
         }
 
+    def _display_lock_stats(self):
+        display_lock = getattr(self, "_display_lock", None)
+        return display_lock.stats() if isinstance(display_lock, RenderLock) else {}
+
+    def _frame_change_stats(self):
+        tracker = getattr(getattr(self, "epd", None), "frame_changes", None)
+        return tracker.stats() if isinstance(tracker, FrameChangeTracker) else {}
+
     def _render_display_override(self, module=None, generation=None):
         with self._override_lock:
             if module is None:
@@ -803,17 +995,23 @@ class DisplayManager:
         
     def start(self):
         logger.info("Starting display manager components...")
+        # The first schedule decision and render need data; fetch it here,
+        # before any lock is taken, and keep it fresh in the background.
+        for worker in self._snapshot_workers:
+            worker.refresh()
+            worker.start(self.io_runtime)
         scheduled_mode = self._scheduled_mode(datetime.now())
         # Token views do not depend on weather. Warm it in the background so a
         # slow provider cannot delay the first scheduled token render.
         if self._is_token_mode(scheduled_mode):
             threading.Thread(
                 target=self.weather_manager.start,
+                args=(self.io_runtime,),
                 name="WeatherManagerStarter",
                 daemon=True,
             ).start()
         else:
-            self.weather_manager.start()
+            self.weather_manager.start(self.io_runtime)
         
         # Initialize flight monitoring if enabled
         if self.flights_enabled:
@@ -844,15 +1042,18 @@ class DisplayManager:
 
     def initialize_flight_monitoring(self):
         """Initialize flight monitoring with cooldown control"""
-        search_radius = FLIGHT_MAX_RADIUS * 2
-        self.flight_getter = gather_flights_within_radius(
-            COORDINATES_LAT, 
-            COORDINATES_LNG, 
-            search_radius, 
-            FLIGHT_MAX_RADIUS, 
-            flight_check_interval=flight_check_interval,
-            aeroapi_enabled=aeroapi_enabled
-        )
+        if self.shared:
+            self.flight_getter = self.shared.flight_getter()
+        else:
+            search_radius = FLIGHT_MAX_RADIUS * 2
+            self.flight_getter = gather_flights_within_radius(
+                COORDINATES_LAT, 
+                COORDINATES_LNG, 
+                search_radius, 
+                FLIGHT_MAX_RADIUS, 
+                flight_check_interval=flight_check_interval,
+                aeroapi_enabled=aeroapi_enabled
+            )
         self._flight_thread = threading.Thread(
             target=self._check_flights,
             name="FlightTracker",
@@ -888,6 +1089,7 @@ class DisplayManager:
                 self.iss_screen_priority,
                 self.iss_mode_max_seconds,
             )
+            self._scheduler.notify("iss-mode")
             
         def on_pass_end():
             self.in_iss_mode = False
@@ -931,6 +1133,8 @@ class DisplayManager:
 
     def _record_flight_observation(self, flight, observed_at):
         """Update flight histories without allowing statistics to block live views."""
+        if not getattr(self, "records_flight_history", True):
+            return
         self.recent_flights.record(flight, observed_at=observed_at)
         if self.flight_statistics is not None:
             try:
@@ -992,6 +1196,7 @@ class DisplayManager:
                                                 self.flight_screen_priority,
                                                 self.flight_mode_duration,
                                             )
+                                            self._scheduler.notify("flight-mode")
                                             logger.debug(f"Flight mode start time: {self.flight_mode_start}")
                                         else:
                                             logger.debug("Updating flight display while in flight mode")
@@ -1157,6 +1362,9 @@ class DisplayManager:
                             logger.info(f"Starting flight cooldown period of {self.flight_mode_cooldown} seconds")
 
                 active_owner = self.screen_arbiter.active_owner()
+                if active_owner is not None and self.needs_full_refresh():
+                    # Never interrupt a takeover screen with a full refresh.
+                    self._ghosting_budget().defer()
                 if (
                     active_owner == self.OVERRIDE_SCREEN_OWNER
                     and self._last_screen_owner != self.OVERRIDE_SCREEN_OWNER
@@ -1208,6 +1416,7 @@ class DisplayManager:
                             with self._prefetch_lock:
                                 self.prefetch_done = False
                             continue
+                        self.perform_full_refresh()
                         scheduled_mode = self._scheduled_mode(current_time)
                         if self._is_ynab_mode(scheduled_mode):
                             if self._draw_ynab(current_time):
@@ -1273,7 +1482,6 @@ class DisplayManager:
                                 )
                                 self.current_display_mode = "transit"
                             self.last_display_update = datetime.now()
-                            self.update_count += 1
                             logger.info("Bus display updated successfully")
                         elif weather_enabled and weather_data:
                             logger.info("Updating weather display...")
@@ -1300,46 +1508,112 @@ class DisplayManager:
                 logger.error(f"Error in display update checker: {e}")
                 logger.debug(traceback.format_exc())
 
-            # Sleep for a short time to prevent CPU spinning
-            time.sleep(1)
+            self._wait_for_next_deadline()
+
+    def _wait_for_next_deadline(self):
+        """Sleep until the update loop has something to do.
+
+        Posts the deadlines the loop acts on and returns when one is due, the
+        screen owner changes or the manager stops.
+        """
+        now = datetime.now()
+        scheduler = self._scheduler
+
+        def post(name, when):
+            seconds = (when - now).total_seconds()
+            scheduler.post(name, seconds if seconds > 0 else DISPLAY_LOOP_RETRY)
+
+        # While another screen owns the panel the update waits for it to go.
+        if self.next_update_time > now or self.screen_arbiter.can_render():
+            post("update", self.next_update_time)
+        else:
+            scheduler.cancel("update")
+        with self._prefetch_lock:
+            prefetch_pending = not self.prefetch_done
+        if (
+            transit_enabled
+            and prefetch_pending
+            and not self._is_token_mode(self._scheduled_mode(now))
+        ):
+            post("prefetch", self.next_prefetch_time)
+        else:
+            scheduler.cancel("prefetch")
+        with self._flight_lock:
+            flight_started = self.flight_mode_start if self.in_flight_mode else None
+        if flight_started:
+            post(
+                "flight-mode",
+                flight_started + timedelta(seconds=self.flight_mode_duration),
+            )
+        else:
+            scheduler.cancel("flight-mode")
+        iss_started = self.iss_mode_start_time if self.in_iss_mode else None
+        if iss_started:
+            post(
+                "iss-watchdog",
+                iss_started + timedelta(seconds=self.iss_mode_max_seconds),
+            )
+        else:
+            scheduler.cancel("iss-watchdog")
+        expiry = self.screen_arbiter.seconds_until_next_expiry()
+        if expiry is not None:
+            scheduler.post("claim-expiry", expiry)
+        else:
+            scheduler.cancel("claim-expiry")
+        woken = scheduler.wait(DISPLAY_LOOP_MAX_IDLE)
+        if woken:
+            logger.debug("Display loop woken by %s", ", ".join(sorted(woken)))
+
+    def _ghosting_budget(self):
+        budget = getattr(getattr(self, "epd", None), "ghosting", None)
+        return budget if isinstance(budget, GhostingBudget) else None
 
     def needs_full_refresh(self):
-        return self.update_count >= (DISPLAY_REFRESH_FULL_INTERVAL // DISPLAY_REFRESH_INTERVAL)
-        
+        budget = self._ghosting_budget()
+        return budget is not None and budget.due()
+
     def perform_full_refresh(self):
-        if self.needs_full_refresh():
-            logger.info("Performing hourly full refresh...")
-            display_full_refresh(self.epd)
-            self.update_count = 0
-            # Reinitialize partial mode if supported
-            if hasattr(self.epd, 'displayPartial'):
-                logger.info("Reinitializing partial mode after full refresh")
-                self.epd.init()
-                if hasattr(self.epd, 'displayPartBaseImage'):
-                    logger.debug("Setting base image for partial updates")
-                    # Create a blank base image
-                    if self.epd.is_bw_display:
-                        base_image = Image.new('1', (self.epd.height, self.epd.width), 1)
-                    else:
-                        base_image = Image.new('RGB', (self.epd.height, self.epd.width), 'white')
-                    base_image = base_image.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
-                    self.epd.displayPartBaseImage(self.epd.getbuffer(base_image))
+        """Run a due full refresh unless another screen has taken over the panel.
+
+        Called with the display lock held, right before a scheduled render, so
+        that render re-establishes the base image on the cleared panel.
+        """
+        if not self.needs_full_refresh():
+            return False
+        budget = self._ghosting_budget()
+        if self.screen_arbiter.active_owner() is not None:
+            budget.defer()
+            return False
+        logger.info("Performing full refresh: %s", budget.stats())
+        display_full_refresh(self.epd)
+        self.current_display_mode = None
+        self.in_weather_mode = False
+        return True
 
     def get_next_update_message(self, wait_time):
         if self.in_weather_mode:
             return f"weather update in {wait_time} seconds"
-        updates_until_refresh = (DISPLAY_REFRESH_FULL_INTERVAL // DISPLAY_REFRESH_INTERVAL) - self.update_count - 1
-        return f"public transport update in {wait_time} seconds ({updates_until_refresh} until full refresh)"
+        budget = self._ghosting_budget()
+        if budget is None:
+            return f"public transport update in {wait_time} seconds"
+        stats = budget.stats()
+        return (
+            f"public transport update in {wait_time} seconds "
+            f"({stats['ghosted_ratio']:.1%} of {stats['budget']:.1%} ghosting budget used)"
+        )
 
     def cleanup(self):
         logger.info("Starting display manager cleanup...")
         self._stop_event.set()
+        self._scheduler.stop()
         
         if self.iss_tracker:
             self.iss_tracker.stop()
 
         self.override_server.stop()
         self.plugin_registry.stop_all()
+        for worker in self._snapshot_workers:
+            worker.stop()
             
         for thread in [self._check_data_thread, self._flight_thread, self._iss_thread]:
             if thread:
@@ -1349,7 +1623,12 @@ class DisplayManager:
                 except TimeoutError:
                     logger.warning(f"{thread.name} did not stop cleanly")
         
-        self.weather_manager.stop()
+        if self.shared is None:
+            # Shared services outlive each profile's manager; the render
+            # server stops them once every manager has cleaned up.
+            self.weather_manager.stop()
+            if self.io_runtime is not None:
+                self.io_runtime.stop()
         logger.info("Display manager cleanup completed")
 
     def exit_flight_mode(self):
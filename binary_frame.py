@@ -0,0 +1,201 @@
+"""Framed binary transport for packed frames, with optional delta encoding.
+
+A binary frame is a fixed big-endian header followed by a payload::
+
+    magic "RPDF" | version | encoding | width | height | sequence |
+    base sequence | SHA-256 of the packed frame | payload length
+
+The payload is either the packed frame itself (``ENCODING_RAW``) or the XOR
+of the frame against a base frame the client already holds, stored as runs
+(``ENCODING_XOR_RLE``). Each run is a varint count of unchanged bytes to skip,
+a varint literal length and that many XOR bytes. Minute-countdown updates only
+touch a few digits, so their deltas are a few dozen bytes instead of a PNG.
+The digest always covers the reconstructed frame, so a wrong base or a
+corrupted payload can never reach the panel.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import re
+import struct
+from dataclasses import dataclass
+
+from packed_frame import PackedFrame
+
+BINARY_CONTENT_TYPE = "application/vnd.rpi-display.frame"
+MAGIC = b"RPDF"
+VERSION = 1
+ENCODING_RAW = 0
+ENCODING_XOR_RLE = 1
+
+_HEADER = struct.Struct(">4sBBHHQQ32sI")
+HEADER_SIZE = _HEADER.size
+# Changed bytes separated by one or two unchanged bytes stay in one literal;
+# a new run would cost at least as much as the zeros it skips.
+_CHANGED_SPAN = re.compile(rb"[^\x00]+(?:\x00{1,2}[^\x00]+)*")
+
+
+class FrameFormatError(ValueError):
+    """A binary frame is malformed or does not reconstruct to its digest."""
+
+
+@dataclass(frozen=True)
+class BinaryFrameHeader:
+    encoding: int
+    width: int
+    height: int
+    sequence: int
+    base_sequence: int
+    sha256: str
+
+
+def _xor(left: bytes, right: bytes) -> bytes:
+    return (int.from_bytes(left, "big") ^ int.from_bytes(right, "big")).to_bytes(
+        len(left), "big"
+    )
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _read_varint(payload: bytes, offset: int) -> tuple[int, int]:
+    value = 0
+    for shift in range(0, 35, 7):
+        if offset >= len(payload):
+            raise FrameFormatError("delta payload ends inside a run header")
+        byte = payload[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+    raise FrameFormatError("delta run length is too large")
+
+
+def encode_delta(frame: bytes, base: bytes) -> bytes:
+    """Return the XOR run encoding that turns ``base`` into ``frame``."""
+    if len(frame) != len(base):
+        raise ValueError("delta frames must have the same size")
+    runs = bytearray()
+    position = 0
+    for span in _CHANGED_SPAN.finditer(_xor(frame, base)):
+        runs += _varint(span.start() - position)
+        runs += _varint(span.end() - span.start())
+        runs += span.group()
+        position = span.end()
+    return bytes(runs)
+
+
+def apply_delta(base: bytes, payload: bytes) -> bytes:
+    """Rebuild a frame from ``base`` and an ``encode_delta`` payload."""
+    difference = bytearray(len(base))
+    position = 0
+    offset = 0
+    while offset < len(payload):
+        skip, offset = _read_varint(payload, offset)
+        length, offset = _read_varint(payload, offset)
+        position += skip
+        if position + length > len(base) or offset + length > len(payload):
+            raise FrameFormatError("delta run exceeds the frame")
+        difference[position : position + length] = payload[offset : offset + length]
+        position += length
+        offset += length
+    return _xor(base, bytes(difference))
+
+
+def encode_frame(
+    frame: PackedFrame,
+    sequence: int,
+    *,
+    base: PackedFrame | None = None,
+    base_sequence: int = 0,
+) -> bytes:
+    """Frame ``frame`` for the wire, as a delta when that is smaller."""
+    encoding, payload = ENCODING_RAW, frame.data
+    if base is not None and base.size == frame.size and base_sequence:
+        delta = encode_delta(frame.data, base.data)
+        if len(delta) < len(payload):
+            encoding, payload = ENCODING_XOR_RLE, delta
+    if encoding == ENCODING_RAW:
+        base_sequence = 0
+    return (
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            encoding,
+            frame.width,
+            frame.height,
+            sequence,
+            base_sequence,
+            hashlib.sha256(frame.data).digest(),
+            len(payload),
+        )
+        + payload
+    )
+
+
+def decode_header(content: bytes) -> BinaryFrameHeader:
+    if len(content) < HEADER_SIZE:
+        raise FrameFormatError("binary frame is shorter than its header")
+    (
+        magic,
+        version,
+        encoding,
+        width,
+        height,
+        sequence,
+        base_sequence,
+        digest,
+        length,
+    ) = _HEADER.unpack_from(content)
+    if magic != MAGIC or version != VERSION:
+        raise FrameFormatError("unsupported binary frame format")
+    if encoding not in (ENCODING_RAW, ENCODING_XOR_RLE):
+        raise FrameFormatError(f"unknown binary frame encoding {encoding}")
+    if length != len(content) - HEADER_SIZE:
+        raise FrameFormatError("binary frame payload length does not match")
+    return BinaryFrameHeader(
+        encoding, width, height, sequence, base_sequence, digest.hex()
+    )
+
+
+def decode_frame(
+    content: bytes, *, base: PackedFrame | None = None, base_sequence: int = 0
+) -> tuple[BinaryFrameHeader, PackedFrame]:
+    """Decode and verify a binary frame against the digest in its header.
+
+    Delta frames need ``base`` to be the frame the client holds as
+    ``base_sequence``; any other base is rejected rather than guessed at.
+    """
+    header = decode_header(content)
+    payload = content[HEADER_SIZE:]
+    try:
+        if header.encoding == ENCODING_RAW:
+            frame = PackedFrame(header.width, header.height, payload)
+        else:
+            if (
+                base is None
+                or header.base_sequence != base_sequence
+                or base.size != (header.width, header.height)
+            ):
+                raise FrameFormatError("delta frame does not match the held base")
+            frame = PackedFrame(
+                header.width, header.height, apply_delta(base.data, payload)
+            )
+    except FrameFormatError:
+        raise
+    except ValueError as exc:
+        raise FrameFormatError(str(exc)) from exc
+    if not hmac.compare_digest(hashlib.sha256(frame.data).hexdigest(), header.sha256):
+        raise FrameFormatError("reconstructed frame digest does not match")
+    return header, frame
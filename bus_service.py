@@ -2,15 +2,16 @@ from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime, timedelta
 import niquests as requests
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import os
 import dotenv
 from dithering import draw_dithered_box, draw_multicolor_dither_with_text
-from color_utils import find_optimal_colors
-from font_utils import get_font_paths
+from color_utils import lookup_optimal_colors
+from font_utils import get_font, get_font_paths
 import log_config
 import socket
 from display_adapter import DisplayAdapter, return_display_lock
+from panel_orientation import panel_frame
 from functools import lru_cache
 from threading import Event
 from backoff import ExponentialBackoff
@@ -136,7 +137,9 @@ def _parse_lines(lines_str: str) -> list:
             return []
 
 class BusService:
-    def __init__(self):
+    def __init__(self, stop_id=None, lines=None):
+        # Display profiles pass their own stop and lines; None keeps .env.
+        self.stop_id = stop_id or Stop
         self.base_url = self._resolve_base_url()
         self.schedule_url = self._resolve_schedule_url()
         self.provider = os.getenv("Provider", "stib")
@@ -144,9 +147,8 @@ class BusService:
         self.provider_config = self._load_provider_config()
         logger.debug(f"Bus provider: {self.provider}. Resolved Base URL: {self.base_url}")
         self._update_api_urls()
-        self.stop_id = Stop
         logger.debug(f"Stop ID: {self.stop_id}")
-        self.lines_of_interest = _parse_lines(Lines)
+        self.lines_of_interest = _parse_lines(Lines if lines is None else lines)
         logger.info(f"Monitoring bus lines: {self.lines_of_interest}")
         # Initialize separate backoffs for RT and fallback
         self._rt_backoff = ExponentialBackoff(initial_backoff=180, max_backoff=3600)
@@ -283,7 +285,7 @@ class BusService:
         base = self.schedule_url if self._get_provider_type(self.current_provider) == 'schedule' else self.base_url
         # Remove trailing slashes from base URL and ensure single slashes in path
         base = base.rstrip('/')
-        self.api_url = f"{base}/api/{self.current_provider}/waiting_times?stop_id={Stop}&download=true"
+        self.api_url = f"{base}/api/{self.current_provider}/waiting_times?stop_id={self.stop_id}&download=true"
         self.colors_url = f"{base}/api/{self.current_provider}/colors"
         logger.debug(f"Updated URLs - API: {self.api_url}, Colors: {self.colors_url}")
 
@@ -670,10 +672,10 @@ class BusService:
             font_paths = get_font_paths()
 
             try:
-                font_large = ImageFont.truetype(font_paths['dejavu_bold'], 28)
-                font_medium = ImageFont.truetype(font_paths['dejavu'], 16)
-                font_small = ImageFont.truetype(font_paths['dejavu'], 14)
-                font_tiny = ImageFont.truetype(font_paths['dejavu'], 10)
+                font_large = get_font("dejavu_bold", 28)
+                font_medium = get_font("dejavu", 16)
+                font_small = get_font("dejavu", 14)
+                font_tiny = get_font("dejavu", 10)
             except Exception as e:
                 logger.error(f"Error loading fonts: {e}")
                 font_large = font_medium = font_small = font_tiny = ImageFont.load_default()
@@ -698,7 +700,7 @@ class BusService:
                     y_pos += font_medium.getbbox(text)[3] + 5
 
             # Rotate the image
-            Himage = Himage.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+            Himage = panel_frame(epd, Himage, DISPLAY_SCREEN_ROTATION)
 
             return Himage
 
@@ -791,7 +793,7 @@ class BusService:
 
             # Convert hex to RGB
             target_rgb = self._hex_to_rgb(hex_color)
-            return find_optimal_colors(target_rgb, self.epd)
+            return lookup_optimal_colors(target_rgb, self.epd)
 
         except Exception as e:
             logger.error(f"Error getting line color for {line}: {e}")
@@ -817,7 +819,7 @@ def draw_weather_info(draw, Himage, weather_data: WeatherData, font_paths, epd,
         BLACK = 0 if epd.is_bw_display else epd.BLACK
         
         # Load fonts
-        font_medium = ImageFont.truetype(font_paths['dejavu'], 16)
+        font_medium = get_font("dejavu", 16)
         
         # Format temperature text with correct unit
         unit_symbol = "°F" if weather_data.current.unit == TemperatureUnit.FAHRENHEIT else "°K" if weather_data.current.unit == TemperatureUnit.KELVIN else "°C"
@@ -853,7 +855,7 @@ def draw_weather_info(draw, Himage, weather_data: WeatherData, font_paths, epd,
         logger.error(f"Error drawing weather info: {e}")
         traceback.print_exc()
 
-def select_lines_to_display(bus_data: List[Dict]) -> List[Dict]:
+def select_lines_to_display(bus_data: List[Dict], configured_lines: Optional[str] = None) -> List[Dict]:
     """
     Select which 2 lines to display based on earliest arrival times.
     In case of ties (same arrival time), sort by line number.
@@ -906,7 +908,8 @@ def select_lines_to_display(bus_data: List[Dict]) -> List[Dict]:
 
     # Create list of lines with their earliest times
     lines_with_times = []
-    configured_lines = os.getenv("Lines", "")
+    if configured_lines is None:
+        configured_lines = os.getenv("Lines", "")
     lines_of_interest = _parse_lines(configured_lines) if configured_lines else []
     
     for bus in bus_data:
@@ -971,20 +974,19 @@ def update_display(epd, weather_data: WeatherData = None, bus_data=None, error_m
     else:
         Himage = Image.new('RGB', (epd.height, epd.width), WHITE)
     draw = ImageDraw.Draw(Himage)
-    font_paths = get_font_paths()
     try:
-        font_large = ImageFont.truetype(font_paths['dejavu_bold'], 32)
-        font_medium = ImageFont.truetype(font_paths['dejavu'], 24)
-        font_small = ImageFont.truetype(font_paths['dejavu'], 16)
-        font_tiny = ImageFont.truetype(font_paths['dejavu'], 12)
+        font_large = get_font("dejavu_bold", 32)
+        font_medium = get_font("dejavu", 24)
+        font_small = get_font("dejavu", 16)
+        font_tiny = get_font("dejavu", 12)
         # logger.info(f"Found DejaVu fonts: {font_large}, {font_medium}, {font_small}")
     except:
         font_large = ImageFont.load_default()
         font_medium = font_small = font_large
         logger.warning(f"No DejaVu fonts found, using default: {font_large}, {font_medium}, {font_small}. Install DeJaVu fonts with \n sudo apt install fonts-dejavu\n")
     try:
-        emoji_font = ImageFont.truetype(font_paths['emoji'], 16)
-        emoji_font_medium = ImageFont.truetype(font_paths['emoji'], 20)
+        emoji_font = get_font("emoji", 16)
+        emoji_font_medium = get_font("emoji", 20)
     except:
         emoji_font = font_small
         emoji_font_medium = font_medium
@@ -1032,7 +1034,8 @@ def update_display(epd, weather_data: WeatherData = None, bus_data=None, error_m
           
 
     stop_name_height = 0
-    stop_name = os.getenv("Stop_name_override", stop_name)
+    profile = getattr(epd, "display_profile", None)
+    stop_name = (profile.stop_name if profile else None) or os.getenv("Stop_name_override", stop_name)
     if stop_name:
         stop_name_height, lines = _layout_stop_name(
             draw=draw,
@@ -1066,7 +1069,7 @@ def update_display(epd, weather_data: WeatherData = None, bus_data=None, error_m
 
     # Select which lines to display if we have more than 2
     if bus_data and len(bus_data) > 2:
-        bus_data = select_lines_to_display(bus_data)
+        bus_data = select_lines_to_display(bus_data, profile.lines if profile else None)
 
     # Adjust spacing based on number of bus lines
     if len(bus_data) == 1:
@@ -1318,7 +1321,7 @@ def update_display(epd, weather_data: WeatherData = None, bus_data=None, error_m
     draw.rectangle([(0, 0), (Himage.width-1, Himage.height-1)], outline=border_color)
 
     # Rotate the image 90 degrees
-    Himage = Himage.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    Himage = panel_frame(epd, Himage, DISPLAY_SCREEN_ROTATION)
     with display_lock:
         # Convert image to buffer
         buffer = epd.getbuffer(Himage)
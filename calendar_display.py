@@ -12,8 +12,9 @@ from PIL import Image, ImageDraw, ImageFont
 
 from calendar_service import CalendarEvent
 from display_adapter import return_display_lock
-from font_utils import get_font_paths
-from text_layout import fit_wrapped_text
+from font_utils import get_font, get_font_paths
+from panel_orientation import panel_frame
+from text_layout import ellipsize, fit_wrapped_text, text_width
 
 display_lock = return_display_lock()
 DISPLAY_SCREEN_ROTATION = int(os.getenv("screen_rotation", 90))
@@ -21,13 +22,12 @@ DISPLAY_SCREEN_ROTATION = int(os.getenv("screen_rotation", 90))
 
 @lru_cache(maxsize=1)
 def _fonts():
-    paths = get_font_paths()
     try:
         return (
-            ImageFont.truetype(paths["dejavu_bold"], 13),
-            ImageFont.truetype(paths["dejavu_bold"], 15),
-            ImageFont.truetype(paths["dejavu"], 10),
-            ImageFont.truetype(paths["dejavu_bold"], 27),
+            get_font("dejavu_bold", 13),
+            get_font("dejavu_bold", 15),
+            get_font("dejavu", 10),
+            get_font("dejavu_bold", 27),
         )
     except OSError:
         fallback = ImageFont.load_default()
@@ -46,7 +46,7 @@ def _canvas(epd):
 
 
 def _finish(epd, image, set_base_image: bool):
-    image = image.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    image = panel_frame(epd, image, DISPLAY_SCREEN_ROTATION)
     with display_lock:
         buffer = epd.getbuffer(image)
         if hasattr(epd, "displayPartial"):
@@ -60,12 +60,7 @@ def _finish(epd, image, set_base_image: bool):
 
 
 def _ellipsize(draw, text: str, font, max_width: int) -> str:
-    text = " ".join(text.split())
-    if draw.textbbox((0, 0), text, font=font)[2] <= max_width:
-        return text
-    while text and draw.textbbox((0, 0), f"{text}…", font=font)[2] > max_width:
-        text = text[:-1]
-    return f"{text.rstrip()}…" if text else "…"
+    return ellipsize(draw, text, font, max_width)
 
 
 def _wrap_two_lines(draw, text: str, font, max_width: int):
@@ -75,11 +70,11 @@ def _wrap_two_lines(draw, text: str, font, max_width: int):
         current = ""
         while words:
             candidate = f"{current} {words[0]}".strip()
-            if current and draw.textbbox((0, 0), candidate, font=font)[2] > max_width:
+            if current and text_width(draw, candidate, font) > max_width:
                 break
             current = candidate
             words.pop(0)
-            if draw.textbbox((0, 0), current, font=font)[2] > max_width:
+            if text_width(draw, current, font) > max_width:
                 current = _ellipsize(draw, current, font, max_width)
                 break
         if len(lines) == 1 and words:
@@ -84,8 +84,16 @@ class CalendarPlugin:
         self._agenda_render_key = None
         self._event_was_selected = False
         self._agenda_was_selected = False
+        # A runtime job sleeps until the next tick can change anything; see
+        # ``_seconds_until_due``. New events only appear when the client
+        # refreshes.
+        self.refresh_seconds = max(
+            self.poll_seconds, getattr(self.client, "refresh_interval", 300)
+        )
+        self._next_tick_seconds = float(self.poll_seconds)
         self._stop_event = threading.Event()
         self._thread = None
+        self._task = None
 
     @property
     def override_capabilities(self):
@@ -106,17 +114,31 @@ class CalendarPlugin:
     def start(self):
         if not self.enabled or (self._thread and self._thread.is_alive()):
             return
+        if self._task is not None and self._task.running():
+            return
         self._stop_event.clear()
-        self._thread = threading.Thread(
-            target=self._run,
-            name="CalendarPlugin",
-            daemon=True,
-        )
-        self._thread.start()
+        if self.context.runtime is not None:
+            self._task = self.context.runtime.every(
+                "CalendarPlugin",
+                self._fetch,
+                lambda: self._next_tick_seconds,
+                render=self._update,
+                on_error=self._failed,
+            )
+        else:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="CalendarPlugin",
+                daemon=True,
+            )
+            self._thread.start()
         logger.info("Calendar display plugin started")
 
     def stop(self):
         self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
         if self._thread:
             self._thread.join(timeout=1.0)
             if not self._thread.is_alive():
@@ -127,23 +149,35 @@ class CalendarPlugin:
     def _run(self):
         while not self._stop_event.is_set():
             try:
-                now = datetime.now(self.client.timezone)
-                events = self.client.get_events(now)
+                fetched = self._fetch()
                 if self._stop_event.is_set():
                     break
-                self.tick(now, events)
+                self._update(fetched)
             except Exception as exc:
-                logger.error("Calendar plugin update failed (%s)", type(exc).__name__)
-                self.arbiter.release(self.EVENT_OWNER)
-                self.arbiter.release(self.AGENDA_OWNER)
+                self._failed(exc)
             self._stop_event.wait(self.poll_seconds)
 
+    def _fetch(self):
+        now = datetime.now(self.client.timezone)
+        return now, self.client.get_events(now)
+
+    def _update(self, fetched):
+        if not self._stop_event.is_set():
+            self.tick(*fetched)
+
+    def _failed(self, exc):
+        logger.error("Calendar plugin update failed (%s)", type(exc).__name__)
+        self._next_tick_seconds = float(self.poll_seconds)
+        self.arbiter.release(self.EVENT_OWNER)
+        self.arbiter.release(self.AGENDA_OWNER)
+
     def tick(self, now: datetime, events: Iterable[CalendarEvent]):
         events = sorted(events, key=lambda event: (event.start, event.summary))
         next_event = next(
             (event for event in events if not event.all_day and event.start > now),
             None,
         )
+        self._next_tick_seconds = self._seconds_until_due(now, events, next_event)
         if next_event:
             seconds_until = (next_event.start - now).total_seconds()
             if seconds_until <= self.lead_minutes * 60:
@@ -240,6 +274,33 @@ class CalendarPlugin:
         if self.on_render:
             self.on_render(self.AGENDA_OWNER)
 
+    def _seconds_until_due(self, now, events, next_event) -> float:
+        """Seconds until a tick after ``now`` could claim, redraw or release.
+
+        While an event or agenda is on screen its claim is refreshed every
+        poll. Otherwise nothing changes before the next event enters its lead
+        window, the next agenda glance opens, the schedule's minute turns over
+        (for the default agenda) or the client refreshes its events.
+        """
+        lead_seconds = self.lead_minutes * 60
+        if next_event and (next_event.start - now).total_seconds() <= lead_seconds:
+            return float(self.poll_seconds)
+        if events and (self._default_is_due(now) or self._agenda_is_due(now)):
+            return float(self.poll_seconds)
+        seconds_since_midnight = now.hour * 3600 + now.minute * 60 + now.second
+        deadlines = [self.refresh_seconds, 86400 - seconds_since_midnight]
+        if next_event:
+            deadlines.append(
+                (next_event.start - now).total_seconds() - lead_seconds
+            )
+        if self.agenda_interval and self.agenda_duration:
+            deadlines.append(
+                self.agenda_interval - seconds_since_midnight % self.agenda_interval
+            )
+        if self.default_enabled and self.base_mode_at:
+            deadlines.append(60 - now.second)
+        return float(max(self.poll_seconds, min(deadlines)))
+
     def _agenda_is_due(self, now):
         if not self.agenda_interval or not self.agenda_duration:
             return False
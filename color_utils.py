@@ -1,3 +1,6 @@
+import functools
+
+
 def _find_optimal_colors(pixel_rgb, epd):
     """Find optimal combination of available colors to represent an RGB value"""
     r, g, b = pixel_rgb[:3]
@@ -127,3 +130,28 @@ def find_optimal_colors(pixel_rgb, epd):
         (color, ratio / total_ratio)
         for color, ratio in colors_with_ratios
     ]
+
+
+class _Capability:
+    """Stand-in display exposing only the color attributes the mixer checks."""
+
+    def __init__(self, has_red, has_yellow):
+        if has_red:
+            self.RED = True
+        if has_yellow:
+            self.YELLOW = True
+
+
+@functools.lru_cache(maxsize=4096)
+def _exact_mix(has_red, has_yellow, r, g, b):
+    return tuple(find_optimal_colors((r, g, b), _Capability(has_red, has_yellow)))
+
+
+def lookup_optimal_colors(pixel_rgb, epd):
+    """Return find_optimal_colors(pixel_rgb, epd), mixing each colour only once.
+
+    Mixes are remembered per display capability (red and/or yellow), so line
+    badges and repeated icon block colours skip the mixer after the first use.
+    """
+    r, g, b = pixel_rgb[:3]
+    return list(_exact_mix(hasattr(epd, 'RED'), hasattr(epd, 'YELLOW'), r, g, b))
@@ -0,0 +1,107 @@
+"""Sleep until the next posted deadline or event instead of polling on a tick."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+
+class DeadlineScheduler:
+    """A timer heap of named deadlines plus wake-up events, on one condition.
+
+    Components ``post`` a deadline under a name (posting the name again moves
+    it) and ``notify`` events such as a screen ownership change. ``wait``
+    blocks until a deadline is due, an event arrives or the scheduler stops,
+    and returns what woke it, so a loop that waits on it runs only when there
+    is something to do.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._condition = threading.Condition()
+        # (due, entry, name); an entry that is no longer the name's current one
+        # in _deadlines is stale and skipped when it reaches the top.
+        self._heap: list[tuple[float, int, str]] = []
+        self._deadlines: dict[str, int] = {}
+        self._entries = itertools.count()
+        self._events: set[str] = set()
+        self._stopped = False
+        self.wakeups = 0
+
+    def post(self, name: str, delay_seconds: float) -> None:
+        """Make ``name`` due ``delay_seconds`` from now, replacing any earlier post."""
+        with self._condition:
+            entry = next(self._entries)
+            self._deadlines[name] = entry
+            heapq.heappush(
+                self._heap, (self._clock() + max(0.0, delay_seconds), entry, name)
+            )
+            self._condition.notify_all()
+
+    def cancel(self, name: str) -> None:
+        with self._condition:
+            self._deadlines.pop(name, None)
+
+    def notify(self, event: str) -> None:
+        with self._condition:
+            self._events.add(event)
+            self._condition.notify_all()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def _discard_stale_locked(self) -> None:
+        while self._heap:
+            _, entry, name = self._heap[0]
+            if self._deadlines.get(name) == entry:
+                return
+            heapq.heappop(self._heap)
+
+    def next_due_in(self) -> float | None:
+        """Seconds until the earliest deadline; None when nothing is posted."""
+        with self._condition:
+            self._discard_stale_locked()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self._clock())
+
+    def wait(self, max_seconds: float | None = None) -> set[str]:
+        """Block until something is due and return the due names and events.
+
+        Returns an empty set when ``max_seconds`` passes first or the
+        scheduler is stopped.
+        """
+        with self._condition:
+            give_up = None if max_seconds is None else self._clock() + max_seconds
+            while not self._stopped:
+                now = self._clock()
+                woken = self._events
+                self._events = set()
+                self._discard_stale_locked()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, name = heapq.heappop(self._heap)
+                    del self._deadlines[name]
+                    woken.add(name)
+                    self._discard_stale_locked()
+                if woken:
+                    self.wakeups += 1
+                    return woken
+                timeout = self._heap[0][0] - now if self._heap else None
+                if give_up is not None:
+                    if now >= give_up:
+                        self.wakeups += 1
+                        return set()
+                    timeout = give_up - now if timeout is None else min(
+                        timeout, give_up - now
+                    )
+                self._condition.wait(timeout)
+            return set()
@@ -8,6 +8,11 @@ import inspect
 import traceback
 import time
 from pathlib import Path
+from frame_diff import install_frame_tracker
+from frame_gate import install_frame_gate
+from ghosting import GhostingBudget, full_refresh_max_interval, install_ghosting_budget
+from packed_frame import PackedFrame, install_packed_framebuffer, packed_framebuffer_enabled
+from panel_orientation import rotate_frame
 logger = logging.getLogger(__name__)
 import dotenv
 import os
@@ -18,6 +23,9 @@ DISPLAY_SCREEN_ROTATION = int(os.getenv('screen_rotation', 90))
 
 class MockDisplay:
     """Mock display class for development without hardware"""
+    # Renderers hand over landscape frames; the debug PNG is saved as drawn.
+    accepts_logical_frames = True
+
     def __init__(self):
         logger.warning("Using mock display - no actual hardware will be updated!")
         # Standard dimensions for 2.13inch display
@@ -42,6 +50,8 @@ class MockDisplay:
         
         # Set display type flag
         self.is_bw_display = self.mock_display_type == 'bw'
+        # Mirror hardware: packed 1-bit frames are opt-in and B&W only.
+        self.accepts_packed_frames = self.is_bw_display and packed_framebuffer_enabled()
         
         # Add mock epdconfig
         self.epdconfig = self.MockEPDConfig()
@@ -66,19 +76,29 @@ class MockDisplay:
     def sleep(self):
         logger.debug("Mock: sleep() called")
     
+    def decode_buffer(self, buffer):
+        """Return the logical image for a buffer passed to the mock.
+
+        Packed frames are in panel orientation and are rotated back; images
+        are returned unchanged.
+        """
+        if isinstance(buffer, PackedFrame):
+            return rotate_frame(buffer.to_image(), -DISPLAY_SCREEN_ROTATION)
+        return buffer
+
     def getbuffer(self, image):
         logger.debug("Mock: getbuffer() called")
         # Save the image for debugging
-        DisplayAdapter.save_debug_image(image)
+        DisplayAdapter.save_debug_image(self.decode_buffer(image))
         return image
 
     def displayPartial(self, image):
         logger.debug("Mock: displayPartial() called")
-        DisplayAdapter.save_debug_image(image)
+        DisplayAdapter.save_debug_image(self.decode_buffer(image))
 
     def displayPartBaseImage(self, image):
         logger.debug("Mock: displayPartBaseImage() called")
-        DisplayAdapter.save_debug_image(image)
+        DisplayAdapter.save_debug_image(self.decode_buffer(image))
 
 class DisplayAdapter:
     _debug_image_lock = Lock()
@@ -126,9 +146,9 @@ class DisplayAdapter:
                         # Never fall back to a persistent checkout write, and do
                         # not emit one error per frame before that setup exists.
                         return
-                    # Serialize rotation and write so concurrent wrappers cannot
-                    # publish a partial/corrupt PNG at the shared path.
-                    image = image.rotate(-DISPLAY_SCREEN_ROTATION, expand=True)
+                    # Serialize writes so concurrent wrappers cannot publish a
+                    # partial/corrupt PNG at the shared path. Frames arrive in
+                    # logical orientation, so they are saved without rotation.
                     debug_path.parent.mkdir(parents=True, exist_ok=True)
                     image.save(debug_path)
                     DisplayAdapter._last_debug_image_save = now
@@ -162,8 +182,14 @@ class DisplayAdapter:
         return colors
 
     @staticmethod
-    def get_display():
-        """Get the appropriate display instance based on environment"""
+    def get_display(track_frames=True):
+        """Get the appropriate display instance based on environment
+
+        With ``track_frames`` the driver's writes are diffed and charged to a
+        ghosting budget (``epd.frame_changes``, ``epd.ghosting``). Callers
+        that diff frames themselves before writing, like the display client,
+        pass False so each frame is not diffed and copied twice.
+        """
         dotenv.load_dotenv(override=True)
         display_model = os.getenv('display_model')
         
@@ -194,12 +220,21 @@ class DisplayAdapter:
             # Initialize color support and detect display type
             DisplayAdapter._get_available_colors(epd)
             
-            # Wrap getbuffer method to handle different image formats
+            # B&W panels can take PackedFrame buffers without the driver's
+            # per-frame conversion; this wraps the driver getbuffer directly.
+            if epd.is_bw_display and packed_framebuffer_enabled():
+                install_packed_framebuffer(epd)
+
+            # Renderers hand over logical (landscape) frames; turn them into
+            # panel orientation here, the only rotation on the way to the panel.
             original_getbuffer = epd.getbuffer
             def getbuffer_wrapper(image):
                 DisplayAdapter.save_debug_image(image)
+                if isinstance(image, Image.Image):
+                    image = rotate_frame(image, DISPLAY_SCREEN_ROTATION)
                 return original_getbuffer(image)
             epd.getbuffer = getbuffer_wrapper
+            epd.accepts_logical_frames = True
             
             # Add wrapper for init method to handle different signatures
             original_init = epd.init
@@ -295,7 +330,7 @@ class DisplayAdapter:
                         DisplayAdapter.save_debug_image(image)
                         # Waveshare drivers may return list, bytes, or bytearray
                         # buffers. Only PIL images still need conversion.
-                        if not isinstance(image, Image.Image):
+                        if not isinstance(image, (Image.Image, PackedFrame)):
                             return original_displayPartial(image)
                         # Otherwise convert to buffer
                         return original_displayPartial(epd.getbuffer(image))
@@ -314,7 +349,7 @@ class DisplayAdapter:
                             DisplayAdapter.save_debug_image(image)
                             # Waveshare drivers may return list, bytes, or
                             # bytearray buffers. Only PIL images need conversion.
-                            if not isinstance(image, Image.Image):
+                            if not isinstance(image, (Image.Image, PackedFrame)):
                                 return original_displayPartBaseImage(image)
                             # Otherwise convert to buffer
                             return original_displayPartBaseImage(epd.getbuffer(image))
@@ -322,6 +357,17 @@ class DisplayAdapter:
                             logger.error(f"Error in displayPartBaseImage: {str(e)}\n{traceback.format_exc()}")
                             raise
                     epd.displayPartBaseImage = displayPartBaseImage_wrapper
+
+            # Track changed areas per frame, charge partial updates to the
+            # ghosting budget, and skip SPI writes and refreshes for frames
+            # already on the panel.
+            if track_frames:
+                install_ghosting_budget(
+                    epd,
+                    install_frame_tracker(epd),
+                    GhostingBudget(max_interval_seconds=full_refresh_max_interval()),
+                )
+            install_frame_gate(epd)
             
             return epd
             
@@ -344,12 +390,12 @@ def display_full_refresh(epd):
         epd.init_Fast()
 
 
-def initialize_display():
+def initialize_display(track_frames=True):
     epd = None
     with display_lock:
                 # Initialize display using adapter
         logger.debug("About to initialize display")
-        epd = DisplayAdapter.get_display()
+        epd = DisplayAdapter.get_display(track_frames)
 
         # Add debug logs before EPD commands
         logger.debug("About to call epd.init()")
@@ -15,16 +15,36 @@ import time
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlencode
 
 import dotenv
 import requests
 from PIL import Image, ImageDraw, ImageFont
 
+from binary_frame import BINARY_CONTENT_TYPE, FrameFormatError, decode_frame
 from display_adapter import initialize_display, return_display_lock
 from display_protocol import MAX_FRAME_BYTES, parse_utc, utc_now, validate_frame_bytes
+from frame_diff import FrameChangeTracker
+from ghosting import GhostingBudget
+from packed_frame import PACKED_CONTENT_TYPE, PackedFrame, format_geometry, pack_for_panel
+from panel_orientation import pad_frame, rotate_frame
 
 logger = logging.getLogger(__name__)
 
+# Pause between consecutive long polls, so a server that answers long polls
+# immediately cannot turn the client into a busy loop.
+LONG_POLL_MIN_GAP = 0.1
+# Consecutive rejected binary frames after which the client stays on PNG.
+BINARY_FAILURE_LIMIT = 3
+
+
+def binary_frame_url(url: str) -> str | None:
+    """Return the frame.bin endpoint next to a frame.png URL, if there is one."""
+    path, separator, query = url.partition("?")
+    if not path.endswith("/frame.png"):
+        return None
+    return f"{path[: -len('frame.png')]}frame.bin{separator}{query}"
+
 
 @dataclass(frozen=True)
 class PollResult:
@@ -33,6 +53,97 @@ class PollResult:
     frame_source_created_at: str | None = None
 
 
+class PanelWriter:
+    """Writes frames to the panel on its own thread, keeping only the newest.
+
+    ``submit`` replaces a frame that is still waiting, so while the panel is
+    busy with a slow base-image refresh the intermediate frames are dropped
+    rather than queued. A failed write is kept until ``take_error``.
+    """
+
+    def __init__(self, write, *, monotonic=time.monotonic) -> None:
+        self._write = write
+        self._monotonic = monotonic
+        self._condition = threading.Condition()
+        self._pending: tuple | None = None
+        self._busy_since: float | None = None
+        self._error: BaseException | None = None
+        self._stopping = False
+        self.written = 0
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._run, name="panel-writer", daemon=True
+        )
+
+    def start(self) -> "PanelWriter":
+        self._thread.start()
+        return self
+
+    def submit(self, *job) -> None:
+        with self._condition:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = job
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending is not None or self._stopping
+                )
+                if self._stopping:
+                    return
+                job, self._pending = self._pending, None
+                self._busy_since = self._monotonic()
+            error = None
+            try:
+                self._write(*job)
+            except Exception as exc:
+                logger.warning("Panel write failed: %s", exc)
+                error = exc
+            with self._condition:
+                self._busy_since = None
+                if error is None:
+                    self.written += 1
+                else:
+                    self._error = error
+                self._condition.notify_all()
+
+    def busy_seconds(self) -> float:
+        """How long the current panel write has been running; 0 when idle."""
+        busy_since = self._busy_since
+        return 0.0 if busy_since is None else self._monotonic() - busy_since
+
+    def take_error(self) -> BaseException | None:
+        with self._condition:
+            error, self._error = self._error, None
+            return error
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and self._busy_since is None,
+                timeout=timeout,
+            )
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "busy_seconds": round(self.busy_seconds(), 3),
+                "written": self.written,
+                "dropped": self.dropped,
+            }
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Finish the write in progress and drop any frame still waiting."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+
 @dataclass(frozen=True)
 class DiagnosticView:
     """Sanitized local-only content for a prolonged render-server outage."""
@@ -80,6 +191,8 @@ class ClientHealth:
     frame_source_created_at: str | None
     server_generated_at: str | None = None
     server_received_at: str | None = None
+    ghosting: dict | None = None
+    panel: dict | None = None
 
 
 class HealthReporter:
@@ -133,9 +246,14 @@ class FrameClient:
         timeout_seconds: float = 5.0,
         session=None,
         clock=utc_now,
+        long_poll_seconds: float = 0.0,
     ) -> None:
         self.epd = epd
         self.url = url
+        # Ask the server to hold each request until the next frame; only used
+        # once a response advertises X-Display-Long-Poll.
+        self.long_poll_seconds = max(0.0, long_poll_seconds)
+        self.long_poll_supported = False
         self.token = token
         self.max_frame_age_seconds = max(1, max_frame_age_seconds)
         self.timeout_seconds = max(0.1, timeout_seconds)
@@ -145,31 +263,142 @@ class FrameClient:
         self.last_sequence = 0
         self.last_frame_created_at: str | None = None
         self.rotation = int(os.getenv("screen_rotation", "90"))
+        # Optional hard ceiling on top of the ghosting budget; 0 disables it.
         self.full_refresh_every = max(
-            1, int(os.getenv("display_client_full_refresh_every", "40"))
+            0, int(os.getenv("display_client_full_refresh_every", "40"))
+        )
+        # Frames that redraw most of the panel look cleaner as a base-image
+        # refresh than as a partial update over the previous content.
+        self.base_refresh_change_ratio = min(
+            1.0,
+            max(
+                0.0,
+                float(os.getenv("display_client_base_refresh_change_ratio", "0.6")),
+            ),
+        )
+        self.frame_changes = FrameChangeTracker()
+        self.ghosting = GhostingBudget(
+            max_partial_updates=(
+                self.full_refresh_every - 1 if self.full_refresh_every else None
+            )
         )
         self.displayed_updates = 0
         self._has_displayed_anything = False
-        self.last_verified_frame: Image.Image | None = None
+        self.last_verified_frame: Image.Image | PackedFrame | None = None
+        # Panels whose getbuffer takes packed 1-bit frames ask the server for
+        # them and never decode a PNG or run the driver conversion.
+        self.packed_frames = bool(getattr(epd, "accepts_packed_frames", False))
+        # Packed panels prefer the binary endpoint, which can send deltas
+        # against the held frame; any rejected binary frame falls back to PNG.
+        self.binary_url = binary_frame_url(url) if self.packed_frames else None
+        self.binary_failures = 0
+        self.delta_frames = 0
         self.diagnostic_displayed = False
         self.display_lock = return_display_lock()
+        # With a PanelWriter, verified frames are handed to its thread and
+        # the next poll does not wait for the panel.
+        self.panel_writer: PanelWriter | None = None
 
-    def _headers(self) -> dict[str, str]:
+    def _panel_geometry(self) -> str:
+        return format_geometry(self.epd.width, self.epd.height, self.rotation)
+
+    def _headers(self, *, binary: bool = False) -> dict[str, str]:
         headers = {"Accept": "image/png"}
+        if binary:
+            headers["Accept"] = BINARY_CONTENT_TYPE
+            headers["X-Panel-Geometry"] = self._panel_geometry()
+        elif self.packed_frames:
+            headers["Accept"] = f"{PACKED_CONTENT_TYPE}, image/png;q=0.5"
+            headers["X-Panel-Geometry"] = self._panel_geometry()
         if self.etag:
             headers["If-None-Match"] = self.etag
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
 
+    @property
+    def long_polling(self) -> bool:
+        return bool(self.long_poll_seconds and self.long_poll_supported)
+
+    @property
+    def binary_frames(self) -> bool:
+        return (
+            self.binary_url is not None
+            and self.binary_failures < BINARY_FAILURE_LIMIT
+        )
+
+    def _request(
+        self, url: str | None = None, params: dict | None = None
+    ) -> tuple[str, float]:
+        """Return the frame URL and read timeout for the next poll."""
+        url = url or self.url
+        params = dict(params or {})
+        timeout = self.timeout_seconds
+        if self.long_polling and self.last_sequence:
+            params["after"] = self.last_sequence
+            params["wait"] = f"{self.long_poll_seconds:g}"
+            timeout += self.long_poll_seconds
+        if not params:
+            return url, timeout
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}{urlencode(params)}", timeout
+
+    def start_panel_writer(self) -> PanelWriter:
+        self.panel_writer = PanelWriter(self._write_panel).start()
+        return self.panel_writer
+
+    def _raise_panel_error(self) -> None:
+        error = self.panel_writer.take_error() if self.panel_writer else None
+        if error is None:
+            return
+        # The panel content is unknown after a failed write; repaint the held
+        # frame rather than waiting for the server to change it.
+        if self.last_verified_frame is not None and not self.diagnostic_displayed:
+            self._display(self.last_verified_frame)
+        raise error
+
     def poll_once(self) -> PollResult:
+        self._raise_panel_error()
+        if self.binary_frames:
+            try:
+                result = self._poll(binary=True)
+            except FrameFormatError as exc:
+                self.binary_failures += 1
+                logger.warning("Binary frame rejected (%s); falling back to PNG", exc)
+            else:
+                self.binary_failures = 0
+                return result
+        return self._poll()
+
+    def _poll(self, *, binary: bool = False) -> PollResult:
+        params = None
+        # A held packed frame lets the server answer with a delta against it.
+        base = (
+            self.last_verified_frame
+            if binary and isinstance(self.last_verified_frame, PackedFrame)
+            else None
+        )
+        if base is not None and self.last_sequence:
+            params = {"base": self.last_sequence}
+        url, timeout = self._request(self.binary_url if binary else self.url, params)
         response = self.session.get(
-            self.url,
-            headers=self._headers(),
-            timeout=self.timeout_seconds,
+            url,
+            headers=self._headers(binary=binary),
+            timeout=timeout,
             stream=True,
         )
         try:
+            if binary and response.status_code in (404, 406):
+                self.binary_url = None
+                raise FrameFormatError("server does not serve binary frames")
+            if binary and response.status_code == 422:
+                raise FrameFormatError("server cannot pack frames for this panel")
+            if response.status_code in (200, 304):
+                try:
+                    advertised = float(response.headers.get("X-Display-Long-Poll", 0))
+                except ValueError:
+                    advertised = 0.0
+                self.long_poll_supported = advertised > 0
             if response.status_code == 304:
                 if not self.etag or self.last_sequence == 0:
                     raise ValueError("not-modified response arrived before a frame")
@@ -190,7 +419,14 @@ class FrameClient:
                 return PollResult(status, self.last_sequence or None, created_at)
             response.raise_for_status()
             content_type = response.headers.get("Content-Type", "").split(";", 1)[0]
-            if content_type != "image/png":
+            accepted = (
+                {BINARY_CONTENT_TYPE}
+                if binary
+                else {"image/png", PACKED_CONTENT_TYPE}
+                if self.packed_frames
+                else {"image/png"}
+            )
+            if content_type not in accepted:
                 raise ValueError(
                     f"unexpected content type: {content_type or 'missing'}"
                 )
@@ -214,21 +450,64 @@ class FrameClient:
             if expected_length is not None and int(expected_length) != len(content):
                 raise ValueError("frame content length does not match response")
             expected_digest = response.headers.get("X-Display-SHA256")
-            if not expected_digest or not hmac_digest_equal(
-                hashlib.sha256(content).hexdigest(), expected_digest
-            ):
-                raise ValueError("frame digest does not match response")
-            frame = validate_frame_bytes(content)
+            if binary:
+                frame = self._decode_binary(content, sequence, expected_digest, base)
+            else:
+                if not expected_digest or not hmac_digest_equal(
+                    hashlib.sha256(content).hexdigest(), expected_digest
+                ):
+                    raise ValueError("frame digest does not match response")
+                if content_type == PACKED_CONTENT_TYPE:
+                    if (
+                        response.headers.get("X-Panel-Geometry")
+                        != self._panel_geometry()
+                    ):
+                        raise ValueError(
+                            "packed frame geometry does not match the panel"
+                        )
+                    frame = PackedFrame(self.epd.width, self.epd.height, content)
+                else:
+                    frame = validate_frame_bytes(content)
+                    if self.packed_frames:
+                        # Keep the packed form as the next delta base.
+                        frame = pack_for_panel(
+                            frame, self.epd.width, self.epd.height, self.rotation
+                        )
             self._display(frame)
-            self.last_verified_frame = frame.copy()
+            self.last_verified_frame = (
+                frame if isinstance(frame, PackedFrame) else frame.copy()
+            )
             self.diagnostic_displayed = False
             self.last_sequence = sequence
             self.etag = response.headers.get("ETag")
             self.last_frame_created_at = created_at
-            return PollResult("displayed", sequence, created_at)
+            return PollResult(
+                "queued" if self.panel_writer else "displayed", sequence, created_at
+            )
         finally:
             response.close()
 
+    def _decode_binary(
+        self,
+        content: bytes,
+        sequence: int,
+        expected_digest: str | None,
+        base: PackedFrame | None,
+    ) -> PackedFrame:
+        """Rebuild and verify a binary frame; every mismatch is a FrameFormatError."""
+        header, frame = decode_frame(
+            content, base=base, base_sequence=self.last_sequence
+        )
+        if header.sequence != sequence:
+            raise FrameFormatError("binary frame sequence does not match response")
+        if frame.size != (self.epd.width, self.epd.height):
+            raise FrameFormatError("binary frame geometry does not match the panel")
+        if not expected_digest or not hmac_digest_equal(header.sha256, expected_digest):
+            raise FrameFormatError("binary frame digest does not match response")
+        if header.base_sequence:
+            self.delta_frames += 1
+        return frame
+
     @staticmethod
     def _read_bounded(response) -> bytes:
         chunks = []
@@ -255,61 +534,80 @@ class FrameClient:
         self._display(frame, count_server_update=False)
         self.diagnostic_displayed = True
 
-    def _display(self, frame: Image.Image, *, count_server_update: bool = True) -> None:
-        image = frame.rotate(self.rotation, expand=True)
+    def _panel_image(self, frame: Image.Image) -> Image.Image:
+        """Return ``frame`` sized and oriented for ``epd.getbuffer``.
+
+        Displays that accept logical frames rotate inside ``getbuffer``, so the
+        frame is only padded (if at all) in landscape orientation here.
+        """
         target_width = getattr(self.epd, "width", None)
         target_height = getattr(self.epd, "height", None)
-        if (
-            target_width
-            and target_height
-            and image.size
-            != (
-                target_width,
-                target_height,
-            )
-        ):
-            if image.width > target_width or image.height > target_height:
-                raise ValueError(
-                    "frame does not fit the hardware buffer "
-                    f"({image.width}x{image.height} > "
-                    f"{target_width}x{target_height})"
-                )
-            bands = image.getbands()
-            white = (
-                1
-                if image.mode == "1"
-                else (255 if len(bands) == 1 else tuple(255 for _ in bands))
-            )
-            padded = Image.new(
-                image.mode,
-                (target_width, target_height),
-                white,
-            )
-            padded.paste(
-                image,
-                (
-                    (target_width - image.width) // 2,
-                    (target_height - image.height) // 2,
-                ),
+        if getattr(self.epd, "accepts_logical_frames", False):
+            image = frame
+            target_width, target_height = target_height, target_width
+        else:
+            image = rotate_frame(frame, self.rotation)
+        if target_width and target_height:
+            image = pad_frame(image, target_width, target_height)
+        return image
+
+    def _display(
+        self, frame: Image.Image | PackedFrame, *, count_server_update: bool = True
+    ) -> None:
+        if self.packed_frames and isinstance(frame, Image.Image):
+            frame = pack_for_panel(
+                frame, self.epd.width, self.epd.height, self.rotation
             )
-            image = padded
+        if isinstance(frame, PackedFrame):
+            # Diffs are taken in panel orientation for every frame of a
+            # packed client, including local diagnostics.
+            image, observed = frame, frame.to_image()
+        else:
+            image, observed = self._panel_image(frame), frame
+        if self.panel_writer is not None:
+            self.panel_writer.submit(image, observed, count_server_update)
+        else:
+            self._write_panel(image, observed, count_server_update)
+
+    def _write_panel(
+        self,
+        image: Image.Image | PackedFrame,
+        observed: Image.Image,
+        count_server_update: bool,
+    ) -> None:
         with self.display_lock:
+            diff = self.frame_changes.observe(observed)
             use_base = not self._has_displayed_anything or (
                 count_server_update
-                and self.displayed_updates % self.full_refresh_every == 0
+                and (
+                    self.ghosting.due()
+                    or diff.changed_ratio >= self.base_refresh_change_ratio
+                )
             )
+            if diff.unchanged and not use_base:
+                logger.debug("Frame unchanged; skipping panel update")
+                return
             if use_base and self._has_displayed_anything:
                 self.epd.init()
                 self.epd.Clear()
                 self.epd.init_Fast()
-            buffer = self.epd.getbuffer(image)
-            if hasattr(self.epd, "displayPartial"):
-                if use_base and hasattr(self.epd, "displayPartBaseImage"):
-                    self.epd.displayPartBaseImage(buffer)
+            try:
+                buffer = self.epd.getbuffer(image)
+                if hasattr(self.epd, "displayPartial"):
+                    if use_base and hasattr(self.epd, "displayPartBaseImage"):
+                        self.epd.displayPartBaseImage(buffer)
+                    else:
+                        self.epd.displayPartial(buffer)
                 else:
-                    self.epd.displayPartial(buffer)
+                    self.epd.display(buffer)
+            except Exception:
+                # The panel content is unknown; never skip the next frame.
+                self.frame_changes.reset()
+                raise
+            if use_base or not hasattr(self.epd, "displayPartial"):
+                self.ghosting.record_full()
             else:
-                self.epd.display(buffer)
+                self.ghosting.record_partial(diff)
             self._has_displayed_anything = True
             if count_server_update:
                 self.displayed_updates += 1
@@ -540,14 +838,31 @@ def main() -> int:
         logger.error("display_client_url must point to /api/v1/frame.png")
         return 2
     interval = max(1.0, float(os.getenv("display_client_poll_interval", "5")))
-    epd = initialize_display()
+    # Stay below the service's WatchdogSec=45 together with the HTTP timeout.
+    long_poll = min(30.0, max(0.0, float(os.getenv("display_client_long_poll", "20"))))
+    # The client diffs frames and keeps the ghosting budget itself.
+    epd = initialize_display(track_frames=False)
     client = FrameClient(
         epd,
         url=url,
         token=os.getenv("display_client_token") or None,
         max_frame_age_seconds=int(os.getenv("display_client_max_frame_age", "300")),
         timeout_seconds=float(os.getenv("display_client_timeout", "5")),
+        long_poll_seconds=long_poll,
+    )
+    # Panel writes run on their own thread so polls, health and the watchdog
+    # keep going during slow refreshes. A write stuck for longer than this
+    # withholds the watchdog so systemd still restarts a hung panel.
+    panel_write_limit = bounded_env_seconds(
+        "display_client_panel_write_timeout", 30, minimum=5, maximum=40
     )
+    if os.getenv("display_client_pipeline", "true").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }:
+        client.start_panel_writer()
     notifier = SystemdNotifier()
     health_reporter = HealthReporter(
         os.getenv(
@@ -597,6 +912,14 @@ def main() -> int:
         while not shutdown_event.is_set():
             started = time.monotonic()
             last_attempt_at = utc_now().isoformat()
+            panel_busy = (
+                client.panel_writer.busy_seconds() if client.panel_writer else 0.0
+            )
+            watchdog = ("WATCHDOG=1",) if panel_busy <= panel_write_limit else ()
+            if not watchdog:
+                logger.error(
+                    "Panel write running for %.0fs; withholding watchdog", panel_busy
+                )
             try:
                 result = client.poll_once()
                 logger.debug("Frame poll result: %s", result.status)
@@ -604,7 +927,7 @@ def main() -> int:
                 last_success_at = utc_now().isoformat()
                 last_error = None
                 notifier.notify(
-                    "WATCHDOG=1",
+                    *watchdog,
                     f"STATUS=Fresh frame sequence {result.sequence} ({result.status})",
                 )
                 state = "healthy"
@@ -625,7 +948,7 @@ def main() -> int:
                     else "retaining last verified pixels"
                 )
                 notifier.notify(
-                    "WATCHDOG=1",
+                    *watchdog,
                     f"STATUS=Frame poll failed ({category}); {fallback}",
                 )
                 if diagnostic_updated:
@@ -647,13 +970,24 @@ def main() -> int:
                     frame_source_created_at=client.last_frame_created_at,
                     server_generated_at=client.last_frame_created_at,
                     server_received_at=last_success_at,
+                    ghosting=client.ghosting.stats(),
+                    panel=client.panel_writer.stats() if client.panel_writer else None,
                 )
             )
-            remaining = interval - (time.monotonic() - started)
+            # A long poll already waited on the server; only failures and
+            # servers without long polling fall back to the fixed interval.
+            pause = (
+                LONG_POLL_MIN_GAP
+                if state == "healthy" and client.long_polling
+                else interval
+            )
+            remaining = pause - (time.monotonic() - started)
             if remaining > 0:
                 shutdown_event.wait(remaining)
     finally:
         notifier.notify("STOPPING=1", "STATUS=Stopping display client")
+        if client.panel_writer:
+            client.panel_writer.stop(timeout=panel_write_limit)
         client_display_cleanup(epd)
     return 0
 
@@ -0,0 +1,112 @@
+"""Per-panel display profiles for a render server that drives several panels.
+
+``display_server_profiles`` names a JSON file such as::
+
+    {"displays": [
+        {"id": "hall", "stop": "8122", "lines": "71,N10", "colour": "bw"},
+        {"id": "kitchen", "stop": "5403", "colour": "bwr",
+         "plugins": ["calendar", "home_assistant"]}
+    ]}
+
+Every profile renders into its own frame channel. Keys that are left out keep
+the value from the environment, and ``plugins`` (when given) limits which of
+the configured plugins run on that panel. ``colour`` sets the palette frames
+are drawn with: ``bw``, or black and white plus red (``bwr``) or yellow
+(``bwy``). Frames are published in logical orientation, so each panel's
+rotation stays with its display client (``screen_rotation``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from display_protocol import validate_channel_id
+
+PLUGIN_NAMES = frozenset({"breaking_news", "calendar", "home_assistant", "rss", "ynab"})
+_PROFILE_KEYS = {
+    "id",
+    "stop",
+    "lines",
+    "stop_name",
+    "colour",
+    "plugins",
+}
+
+
+@dataclass(frozen=True)
+class DisplayProfile:
+    display_id: str
+    stop: str | None = None
+    lines: str | None = None
+    stop_name: str | None = None
+    colour: str | None = None
+    plugins: frozenset[str] | None = None
+
+    @property
+    def is_bw(self) -> bool:
+        colour = self.colour or os.getenv("mock_display_type", "bw")
+        return colour.lower() == "bw"
+
+    def allows_plugin(self, name: str) -> bool:
+        return self.plugins is None or name in self.plugins
+
+
+def _optional_str(entry: dict, key: str) -> str | None:
+    value = entry.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, (str, int)) or isinstance(value, bool):
+        raise ValueError(f"display profile {key} must be a string, got {value!r}")
+    return str(value).strip() or None
+
+
+def _profile(entry) -> DisplayProfile:
+    if not isinstance(entry, dict):
+        raise ValueError(f"display profiles must be objects, got {entry!r}")
+    unknown = set(entry) - _PROFILE_KEYS
+    if unknown:
+        raise ValueError(f"unknown display profile keys: {', '.join(sorted(unknown))}")
+    display_id = validate_channel_id(entry.get("id"))
+    colour = _optional_str(entry, "colour")
+    if colour is not None and colour.lower() not in {"bw", "bwr", "bwy"}:
+        raise ValueError(f"display {display_id} colour must be bw, bwr or bwy")
+    plugins = entry.get("plugins")
+    if plugins is not None:
+        if not isinstance(plugins, list) or not all(
+            isinstance(name, str) for name in plugins
+        ):
+            raise ValueError(f"display {display_id} plugins must be a list of names")
+        unknown_plugins = set(plugins) - PLUGIN_NAMES
+        if unknown_plugins:
+            raise ValueError(
+                f"display {display_id} has unknown plugins: "
+                f"{', '.join(sorted(unknown_plugins))}"
+            )
+        plugins = frozenset(plugins)
+    return DisplayProfile(
+        display_id=display_id,
+        stop=_optional_str(entry, "stop"),
+        lines=_optional_str(entry, "lines"),
+        stop_name=_optional_str(entry, "stop_name"),
+        colour=colour.lower() if colour else None,
+        plugins=plugins,
+    )
+
+
+def load_display_profiles(path: str | os.PathLike[str]) -> tuple[DisplayProfile, ...]:
+    """Load and validate a profile file; raises ValueError for any mistake."""
+    try:
+        document = json.loads(Path(path).read_text())
+    except OSError as exc:
+        raise ValueError(f"cannot read display profiles from {path}: {exc}") from exc
+    displays = document.get("displays") if isinstance(document, dict) else None
+    if not isinstance(displays, list) or not displays:
+        raise ValueError("display profiles need a non-empty 'displays' list")
+    profiles = tuple(_profile(entry) for entry in displays)
+    ids = [profile.display_id for profile in profiles]
+    if len(set(ids)) != len(ids):
+        raise ValueError("display profile ids must be unique")
+    return profiles
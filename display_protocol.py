@@ -5,20 +5,36 @@ from __future__ import annotations
 import hashlib
 import io
 import json
+import logging
 import os
+import re
+import struct
 import tempfile
 import threading
-from dataclasses import asdict, dataclass
+import time
+import zlib
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable
 
 from PIL import Image
 
+from frame_gate import frame_fingerprint
+from frame_history import DEFAULT_HISTORY_BYTES, FrameHistory, FrameRecord
+
+logger = logging.getLogger(__name__)
+
 FRAME_WIDTH = 250
 FRAME_HEIGHT = 120
 PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_CHUNK = struct.Struct(">I4s")
+_PNG_HEADER = struct.Struct(">IIBBBBB")
+_PNG_MAX_CHUNK = 2**31 - 1
 MAX_FRAME_BYTES = 2 * 1024 * 1024
+# The channel of single-display deployments, served at /api/v1/frame.png.
+DEFAULT_CHANNEL = "default"
+_CHANNEL_ID = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
 
 
 def utc_now() -> datetime:
@@ -32,27 +48,62 @@ def parse_utc(value: str) -> datetime:
     return parsed.astimezone(timezone.utc)
 
 
+def _check_png_structure(content: bytes) -> None:
+    """Check the PNG chunk structure in one pass, without decompressing.
+
+    The signature, every chunk length and CRC, an IHDR of exactly the frame
+    size first, at least one IDAT, and IEND as the final bytes are required.
+    """
+    view = memoryview(content)
+    offset = len(PNG_SIGNATURE)
+    seen_image_data = False
+    while True:
+        if offset + 12 > len(content):
+            raise ValueError("PNG content is invalid")
+        length, kind = _PNG_CHUNK.unpack_from(content, offset)
+        data_end = offset + 8 + length
+        if length > _PNG_MAX_CHUNK or data_end + 4 > len(content):
+            raise ValueError("PNG content is invalid")
+        if zlib.crc32(view[offset + 4 : data_end]) != int.from_bytes(
+            view[data_end : data_end + 4], "big"
+        ):
+            raise ValueError("PNG content is invalid")
+        if offset == len(PNG_SIGNATURE):
+            if kind != b"IHDR" or length != _PNG_HEADER.size:
+                raise ValueError("PNG content is invalid")
+            width, height, *_ = _PNG_HEADER.unpack_from(content, offset + 8)
+            if (width, height) != (FRAME_WIDTH, FRAME_HEIGHT):
+                raise ValueError(
+                    f"frame must be {FRAME_WIDTH}x{FRAME_HEIGHT}, got {width}x{height}"
+                )
+        elif kind == b"IHDR":
+            raise ValueError("PNG content is invalid")
+        seen_image_data = seen_image_data or kind == b"IDAT"
+        offset = data_end + 4
+        if kind == b"IEND":
+            break
+    if not seen_image_data or offset != len(content):
+        raise ValueError("PNG content is invalid")
+
+
 def validate_frame_bytes(content: bytes) -> Image.Image:
-    """Validate a bounded, exact-size PNG and return a detached image."""
+    """Validate a bounded, exact-size PNG and return a detached image.
+
+    The chunk structure is checked first, so the pixels are only decoded (once)
+    for a well-formed PNG of the right size.
+    """
     if not content.startswith(PNG_SIGNATURE):
         raise ValueError("response is not a PNG")
-    if not content or len(content) > MAX_FRAME_BYTES:
+    if len(content) > MAX_FRAME_BYTES:
         raise ValueError("PNG size is outside the accepted range")
+    _check_png_structure(content)
     try:
-        with Image.open(io.BytesIO(content)) as image:
-            image.verify()
-        with Image.open(io.BytesIO(content)) as image:
+        with Image.open(io.BytesIO(content), formats=("PNG",)) as image:
             image.load()
-            if image.format != "PNG":
-                raise ValueError("response is not a PNG")
-            if image.size != (FRAME_WIDTH, FRAME_HEIGHT):
-                actual = f"{image.size[0]}x{image.size[1]}"
-                raise ValueError(
-                    f"frame must be {FRAME_WIDTH}x{FRAME_HEIGHT}, got {actual}"
-                )
-            return image.copy()
-    except (OSError, SyntaxError) as exc:
+    except (OSError, SyntaxError, zlib.error) as exc:
         raise ValueError("PNG content is invalid") from exc
+    # The decoded pixels live in memory; leaving the block closed the buffer.
+    return image
 
 
 @dataclass(frozen=True)
@@ -77,34 +128,72 @@ class FrameSnapshot:
 
 
 class FramePublisher:
-    """Publishes latest.png and metadata with atomic replacements."""
+    """Publishes latest.png and metadata with atomic replacements.
+
+    A frame whose pixels match the current snapshot keeps its sequence and
+    ETag; only ``published_at`` moves forward, so clients keep getting cheap
+    304s while the frame stays fresh. With ``flush_interval_seconds`` set,
+    snapshots are served from memory at once and written to disk at most that
+    often, coalescing everything published in between into one write.
+    ``history_frames`` keeps that many recent frames in a ``FrameHistory``.
+    """
 
     def __init__(
         self,
         directory: str | os.PathLike[str],
         *,
         clock: Callable[[], datetime] = utc_now,
+        flush_interval_seconds: float = 0.0,
+        monotonic: Callable[[], float] = time.monotonic,
+        history_frames: int = 0,
+        history_max_bytes: int = DEFAULT_HISTORY_BYTES,
     ) -> None:
         self.directory = Path(directory)
         self.frame_path = self.directory / "latest.png"
         self.metadata_path = self.directory / "latest.json"
         self._clock = clock
+        self._monotonic = monotonic
+        self.flush_interval_seconds = max(0.0, flush_interval_seconds)
         self._lock = threading.RLock()
+        # Long-polling requests wait here until the next publish.
+        self._published = threading.Condition(self._lock)
         self._snapshot: FrameSnapshot | None = None
+        self._fingerprint: bytes | None = None
+        # Disk writes run one at a time, outside the snapshot lock when
+        # flushes are coalesced.
+        self._flush_lock = threading.Lock()
+        self._flushed: FrameSnapshot | None = None
+        self._last_flush: float | None = None
+        self._flush_timer: threading.Timer | None = None
+        self._stats = {
+            "published": 0,
+            "unchanged": 0,
+            "flushes": 0,
+            "bytes_written": 0,
+        }
+        self.history = (
+            FrameHistory(history_frames, history_max_bytes)
+            if history_frames > 0
+            else None
+        )
         self.directory.mkdir(parents=True, exist_ok=True)
         self._load_existing()
+        self._flushed = self._snapshot
+        if self._snapshot is not None:
+            self._record_history(self._snapshot)
 
     def _load_existing(self) -> None:
         try:
             metadata = FrameMetadata(**json.loads(self.metadata_path.read_text()))
             content = self.frame_path.read_bytes()
-            validate_frame_bytes(content)
+            image = validate_frame_bytes(content)
             if len(content) != metadata.content_length:
                 raise ValueError("stored frame length does not match metadata")
             if hashlib.sha256(content).hexdigest() != metadata.sha256:
                 raise ValueError("stored frame digest does not match metadata")
             parse_utc(metadata.published_at)
             self._snapshot = FrameSnapshot(metadata, content)
+            self._fingerprint = frame_fingerprint(image)
         except FileNotFoundError:
             return
         except (KeyError, TypeError, ValueError, json.JSONDecodeError):
@@ -130,34 +219,241 @@ class FramePublisher:
                 pass
             raise
 
-    def publish(self, image: Image.Image) -> FrameSnapshot:
+    def _write_snapshot(self, snapshot: FrameSnapshot) -> None:
+        """Write ``snapshot`` to disk; the PNG only when its pixels changed."""
+        metadata = (
+            json.dumps(asdict(snapshot.metadata), sort_keys=True) + "\n"
+        ).encode()
+        written = len(metadata)
+        # The image is replaced first and the commit marker (metadata)
+        # second, so a crash in between never pairs metadata with another
+        # frame's image.
+        if self._flushed is None or self._flushed.content is not snapshot.content:
+            self._atomic_write(self.frame_path, snapshot.content)
+            written += len(snapshot.content)
+        self._atomic_write(self.metadata_path, metadata)
+        self._flushed = snapshot
+        self._stats["flushes"] += 1
+        self._stats["bytes_written"] += written
+
+    def _record_history(
+        self,
+        snapshot: FrameSnapshot,
+        screen: str | None = None,
+        render_seconds: float | None = None,
+    ) -> None:
+        if self.history is None:
+            return
+        metadata = snapshot.metadata
+        self.history.add(
+            FrameRecord(
+                sequence=metadata.sequence,
+                published_at=metadata.published_at,
+                sha256=metadata.sha256,
+                content_length=metadata.content_length,
+                screen=screen,
+                render_seconds=(
+                    round(render_seconds, 3) if render_seconds is not None else None
+                ),
+            ),
+            snapshot.content,
+        )
+
+    def publish(
+        self,
+        image: Image.Image,
+        *,
+        screen: str | None = None,
+        render_seconds: float | None = None,
+    ) -> FrameSnapshot:
+        """Publish ``image``; ``screen`` and ``render_seconds`` go to the history."""
         if image.size != (FRAME_WIDTH, FRAME_HEIGHT):
             raise ValueError(
                 f"published frame must be {FRAME_WIDTH}x{FRAME_HEIGHT}, got {image.size}"
             )
+        fingerprint = frame_fingerprint(image)
+        with self._lock:
+            current = self._snapshot
+            unchanged = current is not None and fingerprint == self._fingerprint
+        content = None if unchanged else self._encode(image)
+
+        with self._lock:
+            published_at = self._clock().astimezone(timezone.utc).isoformat()
+            # Only a frame compared against the snapshot that is still current
+            # may reuse its sequence.
+            unchanged = unchanged and self._snapshot is current
+            if unchanged:
+                snapshot = FrameSnapshot(
+                    replace(current.metadata, published_at=published_at),
+                    current.content,
+                )
+            else:
+                if content is None:
+                    content = self._encode(image)
+                sequence = (
+                    self._snapshot.metadata.sequence + 1 if self._snapshot else 1
+                )
+                snapshot = FrameSnapshot(
+                    FrameMetadata(
+                        sequence=sequence,
+                        published_at=published_at,
+                        sha256=hashlib.sha256(content).hexdigest(),
+                        content_length=len(content),
+                    ),
+                    content,
+                )
+            if not self.flush_interval_seconds:
+                # Write-through: readers only see the snapshot once it is on
+                # disk, and the snapshot lock serializes the writes.
+                self._write_snapshot(snapshot)
+            self._snapshot = snapshot
+            self._fingerprint = fingerprint
+            self._stats["unchanged" if unchanged else "published"] += 1
+            if not unchanged:
+                self._record_history(snapshot, screen, render_seconds)
+                self._published.notify_all()
+        if self.flush_interval_seconds:
+            self._schedule_flush()
+        return snapshot
+
+    @staticmethod
+    def _encode(image: Image.Image) -> bytes:
         output = io.BytesIO()
         image.save(output, format="PNG", optimize=False)
         content = output.getvalue()
         validate_frame_bytes(content)
+        return content
 
+    def _schedule_flush(self) -> None:
         with self._lock:
-            sequence = self._snapshot.metadata.sequence + 1 if self._snapshot else 1
-            metadata = FrameMetadata(
-                sequence=sequence,
-                published_at=self._clock().astimezone(timezone.utc).isoformat(),
-                sha256=hashlib.sha256(content).hexdigest(),
-                content_length=len(content),
-            )
-            # The image is replaced first and the commit marker (metadata)
-            # second. In-process readers only see the snapshot after both land.
-            self._atomic_write(self.frame_path, content)
-            self._atomic_write(
-                self.metadata_path,
-                (json.dumps(asdict(metadata), sort_keys=True) + "\n").encode(),
+            now = self._monotonic()
+            if (
+                self._last_flush is not None
+                and now - self._last_flush < self.flush_interval_seconds
+            ):
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(
+                        self.flush_interval_seconds - (now - self._last_flush),
+                        self.flush,
+                    )
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write the latest snapshot to disk unless it is already there."""
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                snapshot = self._snapshot
+                if snapshot is None or snapshot is self._flushed:
+                    return
+                self._last_flush = self._monotonic()
+            try:
+                self._write_snapshot(snapshot)
+            except OSError as exc:
+                logger.warning(
+                    "Could not persist frame %s: %s", snapshot.metadata.sequence, exc
+                )
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(
+                self._stats, flush_interval_seconds=self.flush_interval_seconds
             )
-            self._snapshot = FrameSnapshot(metadata, content)
-            return self._snapshot
+        if self.history is not None:
+            stats["history"] = self.history.stats()
+        return stats
 
     def snapshot(self) -> FrameSnapshot | None:
         with self._lock:
             return self._snapshot
+
+    def wait_for_sequence(self, after: int, timeout: float) -> FrameSnapshot | None:
+        """Return the snapshot once its sequence differs from ``after``.
+
+        Waits at most ``timeout`` seconds and then returns the current
+        snapshot, which may still be sequence ``after``. A sequence other than
+        ``after`` (including a lower one after a server restart) returns
+        immediately.
+        """
+        with self._published:
+            self._published.wait_for(
+                lambda: self._snapshot is not None
+                and self._snapshot.metadata.sequence != after,
+                timeout=max(0.0, timeout),
+            )
+            return self._snapshot
+
+
+def validate_channel_id(display_id: str) -> str:
+    if not isinstance(display_id, str) or not _CHANNEL_ID.match(display_id):
+        raise ValueError(
+            "display ids must be 1-32 lowercase letters, digits, '-' or '_', "
+            f"got {display_id!r}"
+        )
+    return display_id
+
+
+class FrameChannels:
+    """One ``FramePublisher`` per display channel below a frame directory.
+
+    The default channel publishes to the directory itself, so single-display
+    deployments keep their files; other channels live in ``displays/<id>/``.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        display_ids: tuple[str, ...] | list[str] = (DEFAULT_CHANNEL,),
+        *,
+        clock: Callable[[], datetime] = utc_now,
+        flush_interval_seconds: float = 0.0,
+        history_frames: int = 0,
+        history_max_bytes: int = DEFAULT_HISTORY_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self._publishers: dict[str, FramePublisher] = {}
+        for display_id in display_ids:
+            if validate_channel_id(display_id) in self._publishers:
+                continue
+            self._publishers[display_id] = FramePublisher(
+                self.directory
+                if display_id == DEFAULT_CHANNEL
+                else self.directory / "displays" / display_id,
+                clock=clock,
+                flush_interval_seconds=flush_interval_seconds,
+                history_frames=history_frames,
+                history_max_bytes=history_max_bytes,
+            )
+        if not self._publishers:
+            raise ValueError("at least one display channel is required")
+
+    @classmethod
+    def single(cls, publisher: FramePublisher) -> "FrameChannels":
+        channels = cls.__new__(cls)
+        channels.directory = publisher.directory
+        channels._publishers = {DEFAULT_CHANNEL: publisher}
+        return channels
+
+    def get(self, display_id: str) -> FramePublisher | None:
+        return self._publishers.get(display_id)
+
+    def items(self):
+        return self._publishers.items()
+
+    def __iter__(self):
+        return iter(self._publishers)
+
+    def __len__(self) -> int:
+        return len(self._publishers)
+
+    def close(self) -> None:
+        for publisher in self._publishers.values():
+            publisher.close()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import hmac
 import io
 import logging
@@ -9,18 +10,41 @@ import os
 import signal
 import sys
 import threading
+from collections import OrderedDict
+from dataclasses import asdict
 from datetime import timezone
+from functools import lru_cache
 
 import dotenv
 from flask import Flask, Response, jsonify, request, send_file
 from werkzeug.serving import make_server
 
-from display_protocol import FramePublisher, parse_utc, utc_now
+from binary_frame import BINARY_CONTENT_TYPE, encode_frame
+from display_protocol import (
+    DEFAULT_CHANNEL,
+    FrameChannels,
+    FramePublisher,
+    parse_utc,
+    utc_now,
+    validate_frame_bytes,
+)
+from display_profiles import load_display_profiles
+from frame_history import DEFAULT_HISTORY_BYTES, DEFAULT_HISTORY_FRAMES
+from packed_frame import (
+    PACKED_CONTENT_TYPE,
+    PackedFrame,
+    format_geometry,
+    pack_for_panel,
+    parse_geometry,
+)
 from publication_display import PublicationDisplay
 from version import __version__
 
 logger = logging.getLogger(__name__)
 
+# Recently served packed frames per panel geometry, kept as delta bases.
+DELTA_BASE_FRAMES = 8
+
 
 def _as_bool(name: str, default: bool = False) -> bool:
     return os.getenv(name, str(default)).strip().lower() in {"1", "true", "yes", "on"}
@@ -36,13 +60,74 @@ def _authorized(expected_token: str | None) -> bool:
     )
 
 
+def _requested_panel_geometry() -> tuple[int, int, int] | None:
+    """Return the client's panel geometry when it prefers packed frames."""
+    preferred = request.accept_mimetypes.best_match(
+        [PACKED_CONTENT_TYPE, "image/png"], default="image/png"
+    )
+    if preferred != PACKED_CONTENT_TYPE:
+        return None
+    return parse_geometry(request.headers.get("X-Panel-Geometry"))
+
+
+@lru_cache(maxsize=8)
+def _packed_frame(
+    content: bytes, width: int, height: int, rotation: int
+) -> tuple[PackedFrame, str]:
+    """Pack a published PNG for one panel geometry, once per frame."""
+    packed = pack_for_panel(validate_frame_bytes(content), width, height, rotation)
+    return packed, hashlib.sha256(packed.data).hexdigest()
+
+
 def create_app(
-    publisher: FramePublisher,
+    publisher: FramePublisher | FrameChannels,
     *,
     token: str | None = None,
     ready_max_age_seconds: int = 300,
+    long_poll_max_seconds: float = 30.0,
 ) -> Flask:
+    """Serve every channel at /api/v1/displays/<id>/; the default channel is
+    also served at the original /api/v1/ frame and status paths."""
     app = Flask(__name__)
+    channels = (
+        publisher
+        if isinstance(publisher, FrameChannels)
+        else FrameChannels.single(publisher)
+    )
+    delta_bases: OrderedDict[tuple, PackedFrame] = OrderedDict()
+    delta_bases_lock = threading.Lock()
+
+    def remember_delta_base(display_id, sequence, geometry, packed):
+        key = (display_id, sequence, geometry)
+        with delta_bases_lock:
+            delta_bases[key] = packed
+            delta_bases.move_to_end(key)
+            while len(delta_bases) > DELTA_BASE_FRAMES * len(channels):
+                delta_bases.popitem(last=False)
+
+    def delta_base(display_id, sequence, geometry):
+        with delta_bases_lock:
+            return delta_bases.get((display_id, sequence, geometry))
+
+    def requested_snapshot(publisher):
+        # ?after=<sequence>&wait=<seconds> holds the request until a frame
+        # other than <sequence> is published, or the wait runs out.
+        after = request.args.get("after", type=int)
+        wait = min(request.args.get("wait", 0.0, type=float), long_poll_max_seconds)
+        if after is not None and wait > 0:
+            return publisher.wait_for_sequence(after, wait)
+        return publisher.snapshot()
+
+    def frame_headers(snapshot):
+        return {
+            "Cache-Control": "private, no-cache, must-revalidate",
+            "ETag": snapshot.etag,
+            "Vary": "Accept, X-Panel-Geometry",
+            "X-Display-Long-Poll": f"{long_poll_max_seconds:g}",
+            "X-Display-Sequence": str(snapshot.metadata.sequence),
+            "X-Display-Published-At": snapshot.metadata.published_at,
+            "X-Display-SHA256": snapshot.metadata.sha256,
+        }
 
     @app.after_request
     def secure_headers(response):
@@ -50,8 +135,15 @@ def create_app(
         response.headers["Referrer-Policy"] = "no-referrer"
         return response
 
+    def channel_or_404(display_id):
+        publisher = channels.get(display_id)
+        if publisher is None:
+            return None, (jsonify(error="unknown display"), 404)
+        return publisher, None
+
     @app.get("/healthz")
     def health():
+        publisher = channels.get(DEFAULT_CHANNEL) or channels.get(next(iter(channels)))
         snapshot = publisher.snapshot()
         return jsonify(
             status="ok",
@@ -59,19 +151,31 @@ def create_app(
             version=__version__,
             sequence=snapshot.metadata.sequence if snapshot else None,
             generated_at=snapshot.metadata.published_at if snapshot else None,
+            displays=list(channels),
         )
 
     @app.get("/readyz")
     def readiness():
-        snapshot = publisher.snapshot()
-        if snapshot is None:
-            return jsonify(status="not-ready", reason="no-frame"), 503
-        age = (utc_now() - parse_utc(snapshot.metadata.published_at)).total_seconds()
+        # Ready only while every channel has a fresh frame; the first channel
+        # that is not ready is reported.
+        for display_id, publisher in channels.items():
+            snapshot = publisher.snapshot()
+            if snapshot is None:
+                return (
+                    jsonify(status="not-ready", reason="no-frame", display=display_id),
+                    503,
+                )
+            age = (
+                utc_now() - parse_utc(snapshot.metadata.published_at)
+            ).total_seconds()
+            if age > ready_max_age_seconds:
+                break
         status = 200 if age <= ready_max_age_seconds else 503
         return (
             jsonify(
                 status="ready" if status == 200 else "not-ready",
                 reason=None if status == 200 else "stale-frame",
+                display=display_id,
                 sequence=snapshot.metadata.sequence,
                 published_at=snapshot.metadata.published_at,
                 age_seconds=max(0, round(age, 3)),
@@ -80,30 +184,57 @@ def create_app(
         )
 
     @app.get("/api/v1/status")
-    def status():
+    @app.get("/api/v1/displays/<display_id>/status")
+    def status(display_id=DEFAULT_CHANNEL):
         if not _authorized(token):
             return Response(status=401, headers={"WWW-Authenticate": "Bearer"})
+        publisher, missing = channel_or_404(display_id)
+        if missing:
+            return missing
         snapshot = publisher.snapshot()
         if snapshot is None:
             return jsonify(status="not-ready", frame=None), 503
-        return jsonify(status="ready", frame=snapshot.metadata.__dict__)
+        return jsonify(
+            status="ready",
+            frame=snapshot.metadata.__dict__,
+            publisher=publisher.stats(),
+        )
 
     @app.get("/api/v1/frame.png")
-    def frame():
+    @app.get("/api/v1/displays/<display_id>/frame.png")
+    def frame(display_id=DEFAULT_CHANNEL):
         if not _authorized(token):
             return Response(status=401, headers={"WWW-Authenticate": "Bearer"})
-        snapshot = publisher.snapshot()
+        publisher, missing = channel_or_404(display_id)
+        if missing:
+            return missing
+        snapshot = requested_snapshot(publisher)
         if snapshot is None:
             return jsonify(error="frame not available"), 503
-        common_headers = {
-            "Cache-Control": "private, no-cache, must-revalidate",
-            "ETag": snapshot.etag,
-            "X-Display-Sequence": str(snapshot.metadata.sequence),
-            "X-Display-Published-At": snapshot.metadata.published_at,
-            "X-Display-SHA256": snapshot.metadata.sha256,
-        }
-        if request.headers.get("If-None-Match") == snapshot.etag:
+        packed = None
+        geometry = _requested_panel_geometry()
+        if geometry is not None:
+            try:
+                packed, packed_digest = _packed_frame(snapshot.content, *geometry)
+            except ValueError as exc:
+                logger.warning("Serving PNG; cannot pack frame for %s: %s", geometry, exc)
+        common_headers = frame_headers(snapshot)
+        if packed is not None:
+            remember_delta_base(
+                display_id, snapshot.metadata.sequence, geometry, packed
+            )
+            common_headers["ETag"] = f'"{snapshot.metadata.sequence}-{packed_digest}"'
+            common_headers["X-Display-SHA256"] = packed_digest
+            common_headers["X-Panel-Geometry"] = format_geometry(*geometry)
+        if request.headers.get("If-None-Match") == common_headers["ETag"]:
             return Response(status=304, headers=common_headers)
+        if packed is not None:
+            return Response(
+                packed.data,
+                status=200,
+                headers=common_headers,
+                mimetype=PACKED_CONTENT_TYPE,
+            )
         return (
             send_file(
                 io.BytesIO(snapshot.content),
@@ -120,6 +251,100 @@ def create_app(
             common_headers,
         )
 
+    @app.get("/api/v1/frame.bin")
+    @app.get("/api/v1/displays/<display_id>/frame.bin")
+    def binary_frame(display_id=DEFAULT_CHANNEL):
+        """Serve the frame packed for the client's panel, as a delta if possible.
+
+        ``?base=<sequence>`` names the frame the client holds; the response is
+        an XOR delta against it when the server still has that frame packed
+        for the same geometry and the delta is smaller than the full frame.
+        """
+        if not _authorized(token):
+            return Response(status=401, headers={"WWW-Authenticate": "Bearer"})
+        publisher, missing = channel_or_404(display_id)
+        if missing:
+            return missing
+        if request.accept_mimetypes.quality(BINARY_CONTENT_TYPE) <= 0:
+            return jsonify(error=f"only {BINARY_CONTENT_TYPE} is served here"), 406
+        geometry = parse_geometry(request.headers.get("X-Panel-Geometry"))
+        if geometry is None:
+            return jsonify(error="X-Panel-Geometry is missing or invalid"), 400
+        snapshot = requested_snapshot(publisher)
+        if snapshot is None:
+            return jsonify(error="frame not available"), 503
+        try:
+            packed, packed_digest = _packed_frame(snapshot.content, *geometry)
+        except ValueError as exc:
+            return jsonify(error=f"cannot pack frame: {exc}"), 422
+        sequence = snapshot.metadata.sequence
+        remember_delta_base(display_id, sequence, geometry, packed)
+        headers = frame_headers(snapshot)
+        headers.update(
+            {
+                "ETag": f'"{sequence}-{packed_digest}"',
+                "X-Display-SHA256": packed_digest,
+                "X-Panel-Geometry": format_geometry(*geometry),
+            }
+        )
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            return Response(status=304, headers=headers)
+        base_sequence = request.args.get("base", 0, type=int)
+        base = (
+            delta_base(display_id, base_sequence, geometry)
+            if base_sequence and base_sequence != sequence
+            else None
+        )
+        return Response(
+            encode_frame(packed, sequence, base=base, base_sequence=base_sequence),
+            status=200,
+            headers=headers,
+            mimetype=BINARY_CONTENT_TYPE,
+        )
+
+    @app.get("/api/v1/frames")
+    @app.get("/api/v1/displays/<display_id>/frames")
+    def frame_history(display_id=DEFAULT_CHANNEL):
+        """List the remembered frames newer than ``?since=<sequence>``."""
+        if not _authorized(token):
+            return Response(status=401, headers={"WWW-Authenticate": "Bearer"})
+        publisher, missing = channel_or_404(display_id)
+        if missing:
+            return missing
+        if publisher.history is None:
+            return jsonify(error="frame history is disabled"), 404
+        since = request.args.get("since", 0, type=int)
+        return jsonify(
+            frames=[
+                dict(asdict(record), url=f"{request.path}/{record.sequence}.png")
+                for record in publisher.history.since(since)
+            ],
+            history=publisher.history.stats(),
+        )
+
+    @app.get("/api/v1/frames/<int:sequence>.png")
+    @app.get("/api/v1/displays/<display_id>/frames/<int:sequence>.png")
+    def historical_frame(sequence, display_id=DEFAULT_CHANNEL):
+        if not _authorized(token):
+            return Response(status=401, headers={"WWW-Authenticate": "Bearer"})
+        publisher, missing = channel_or_404(display_id)
+        if missing:
+            return missing
+        remembered = publisher.history.get(sequence) if publisher.history else None
+        if remembered is None:
+            return jsonify(error="frame is not in the history"), 404
+        record, content = remembered
+        headers = {
+            "Cache-Control": "private, no-cache",
+            "ETag": f'"{record.sequence}-{record.sha256}"',
+            "X-Display-Sequence": str(record.sequence),
+            "X-Display-Published-At": record.published_at,
+            "X-Display-SHA256": record.sha256,
+        }
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            return Response(status=304, headers=headers)
+        return Response(content, status=200, headers=headers, mimetype="image/png")
+
     return app
 
 
@@ -136,24 +361,54 @@ def _validate_bind_security(host: str, token: str | None) -> None:
 def main() -> int:
     dotenv.load_dotenv(override=True)
     import log_config  # noqa: F401 - configures application logging
-    from basic import DisplayManager
+    from basic import DisplayManager, SharedDataServices
 
     host = os.getenv("display_server_host", "127.0.0.1")
     port = int(os.getenv("display_server_port", "8787"))
     token = os.getenv("display_server_token") or None
     _validate_bind_security(host, token)
-    publisher = FramePublisher(
-        os.getenv("display_server_frame_dir", "/run/rpi-waiting-time-display/frames")
+    profiles_path = os.getenv("display_server_profiles")
+    profiles = load_display_profiles(profiles_path) if profiles_path else ()
+    channels = FrameChannels(
+        os.getenv("display_server_frame_dir", "/run/rpi-waiting-time-display/frames"),
+        [profile.display_id for profile in profiles] or [DEFAULT_CHANNEL],
+        flush_interval_seconds=max(
+            0.0, float(os.getenv("display_server_flush_interval", "30"))
+        ),
+        history_frames=max(
+            0,
+            int(
+                os.getenv("display_server_history_frames", str(DEFAULT_HISTORY_FRAMES))
+            ),
+        ),
+        history_max_bytes=max(
+            0,
+            int(os.getenv("display_server_history_bytes", str(DEFAULT_HISTORY_BYTES))),
+        ),
     )
     app = create_app(
-        publisher,
+        channels,
         token=token,
         ready_max_age_seconds=max(
             1, int(os.getenv("display_server_ready_max_age", "300"))
         ),
+        long_poll_max_seconds=max(
+            0.0, float(os.getenv("display_server_long_poll_max", "30"))
+        ),
     )
-    display = PublicationDisplay(publisher)
-    manager = DisplayManager(display)
+    shared = None
+    if profiles:
+        shared = SharedDataServices()
+        managers = [
+            DisplayManager(
+                PublicationDisplay(channels.get(profile.display_id), profile),
+                profile=profile,
+                shared=shared,
+            )
+            for profile in profiles
+        ]
+    else:
+        managers = [DisplayManager(PublicationDisplay(channels.get(DEFAULT_CHANNEL)))]
     server = make_server(host, port, app, threaded=True)
 
     def stop(_signum=None, _frame=None):
@@ -163,11 +418,21 @@ def main() -> int:
     signal.signal(signal.SIGTERM, stop)
     signal.signal(signal.SIGINT, stop)
     try:
-        manager.start()
-        logger.info("Display render server listening on %s:%s", host, port)
+        for manager in managers:
+            manager.start()
+        logger.info(
+            "Display render server listening on %s:%s for displays %s",
+            host,
+            port,
+            ", ".join(channels),
+        )
         server.serve_forever()
     finally:
-        manager.cleanup()
+        for manager in managers:
+            manager.cleanup()
+        if shared is not None:
+            shared.stop()
+        channels.close()
     return 0
 
 
@@ -1,8 +1,14 @@
-from typing import Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import NamedTuple, Tuple
 import logging
+import os
 
 from PIL import Image, ImageDraw
-from color_utils import find_optimal_colors
+from color_utils import lookup_optimal_colors
 import log_config
 logger = logging.getLogger(__name__)
 
@@ -19,6 +25,240 @@ def calculate_brightness(rgb_or_value):
         return rgb_or_value / 255 if rgb_or_value > 0 else 0
 
 
+# Dither patterns are built as 'L' masks (0x00/0xff per pixel) one row slice at
+# a time and painted with ImageDraw.bitmap, instead of one draw.point per pixel.
+_MASK_ON = b"\xff"
+# The multicolor pattern repeats every lcm(4, 7) pixels in both directions:
+# the checkerboard phase cycles mod 4 and the noise term cycles mod 7.
+_MULTICOLOR_PERIOD = 28
+# Rough per-mask bookkeeping cost of a PIL image on top of its pixel bytes.
+_MASK_OVERHEAD_BYTES = 256
+
+
+def _selection_value(i, j):
+    """Position of pixel (i, j) in the multicolor cumulative-ratio scale."""
+    # Offset every other row by one pixel
+    offset = (j % 2) * 1
+    pattern_value = ((i + offset + j) % 4) / 4.0
+
+    # Add some controlled randomness to break up patterns while maintaining ratio
+    noise = ((i * 37 + j * 17) % 7) / 28.0  # Pseudo-random noise between 0 and 0.25
+    return (pattern_value + noise) % 1.0
+
+
+_SELECTION_VALUES = sorted({
+    _selection_value(i, j)
+    for i in range(_MULTICOLOR_PERIOD)
+    for j in range(_MULTICOLOR_PERIOD)
+})
+_SELECTION_RANKS = tuple(
+    tuple(
+        bisect_left(_SELECTION_VALUES, _selection_value(i, j))
+        for i in range(_MULTICOLOR_PERIOD)
+    )
+    for j in range(_MULTICOLOR_PERIOD)
+)
+
+
+@lru_cache(maxsize=None)
+def _index_mask_table(index):
+    """Translation table turning color indices into the mask of one index."""
+    return bytes(0xff if value == index else 0x00 for value in range(256))
+
+
+def _checkerboard_threshold(width, height, ratio):
+    """Smallest diagonal index i + j at which (i + j) / span < ratio stops holding.
+
+    Every ratio with the same threshold produces the same pattern, so the
+    threshold doubles as the exact ratio bucket for the tile cache.
+    """
+    span = width + height
+    if span <= 0:
+        return 0
+    # Found with the same float comparison the pattern is defined by.
+    threshold = max(0, min(span, int(ratio * span)))
+    while threshold > 0 and (threshold - 1) / span >= ratio:
+        threshold -= 1
+    while threshold < span and threshold / span < ratio:
+        threshold += 1
+    return threshold
+
+
+def _checkerboard_mask(width, height, threshold):
+    """Return the primary-color mask of the offset checkerboard as bytes."""
+    if width <= 0 or height <= 0:
+        return b""
+    stripes = b"\xff\x00" * (width // 2 + 2)
+    rows = []
+    for j in range(height):
+        # Offset every other row by one pixel
+        phase = (j + (j % 2)) % 2
+        # Before the diagonal the primary color takes the even cells, after it
+        # the odd ones.
+        before = stripes[phase:phase + width]
+        after = stripes[1 - phase:1 - phase + width]
+        cut = max(0, min(width, threshold - j))
+        rows.append(before[:cut] + after[cut:])
+    return b"".join(rows)
+
+
+def _multicolor_buckets(cumulative_ratios):
+    """Map cumulative ratios to the number of selection values each one covers.
+
+    Mixes with equal buckets select exactly the same pixels.
+    """
+    return tuple(
+        bisect_right(_SELECTION_VALUES, cumulative_ratio)
+        for cumulative_ratio in cumulative_ratios
+    )
+
+
+@lru_cache(maxsize=64)
+def _multicolor_period(buckets):
+    """Return one period of the multicolor pattern as rows of color indices."""
+    last_index = len(buckets) - 1
+    rows = []
+    for rank_row in _SELECTION_RANKS:
+        row = bytearray(_MULTICOLOR_PERIOD)
+        for i, rank in enumerate(rank_row):
+            # Select color based on cumulative ratios, defaulting to the last color
+            chosen = last_index
+            for index, bucket in enumerate(buckets):
+                if rank < bucket:
+                    chosen = index
+                    break
+            row[i] = chosen
+        rows.append(bytes(row))
+    return tuple(rows)
+
+
+def _multicolor_indices(width, height, buckets):
+    """Return the color index of every pixel of a width x height block."""
+    if width <= 0 or height <= 0:
+        return b""
+    period = _multicolor_period(buckets)
+    repeats = width // _MULTICOLOR_PERIOD + 1
+    wide_rows = [(row * repeats)[:width] for row in period[:height]]
+    return b"".join(wide_rows[j % _MULTICOLOR_PERIOD] for j in range(height))
+
+
+class DitherTile(NamedTuple):
+    """A finished dither pattern: one (fill, mask) pair per painted color."""
+    width: int
+    height: int
+    masks: Tuple[Tuple[object, Image.Image], ...]
+    counts: Tuple[int, ...]
+    nbytes: int
+
+
+def _build_tile(width, height, fills_and_masks):
+    masks = []
+    counts = []
+    for fill, mask in fills_and_masks:
+        counts.append(mask.count(_MASK_ON))
+        if counts[-1]:
+            masks.append((fill, Image.frombytes('L', (width, height), mask)))
+    nbytes = sum(width * height + _MASK_OVERHEAD_BYTES for _ in masks)
+    return DitherTile(width, height, tuple(masks), tuple(counts), nbytes)
+
+
+class DitherTileCache:
+    """Bounded LRU of finished dither tiles with hit/miss counters.
+
+    The same line-color boxes are re-dithered on every transit refresh, so
+    tiles are kept by display capability, color mix, ratio bucket and size
+    until the byte budget is exhausted.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max(0, int(max_bytes))
+        self._tiles = OrderedDict()
+        self._lock = Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return tile
+            self.misses += 1
+
+        tile = build()
+        if tile.nbytes > self.max_bytes:
+            return tile
+        with self._lock:
+            if key not in self._tiles:
+                self._tiles[key] = tile
+                self._bytes += tile.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._tiles.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return tile
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._tiles),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# 2 MiB holds a few hundred line boxes; small enough for a 512 MB Pi Zero.
+DEFAULT_TILE_CACHE_BYTES = 2 * 1024 * 1024
+
+
+def _tile_cache_budget():
+    try:
+        return int(os.getenv('dither_tile_cache_bytes', DEFAULT_TILE_CACHE_BYTES))
+    except ValueError:
+        logger.warning("Invalid dither_tile_cache_bytes, using the default budget")
+        return DEFAULT_TILE_CACHE_BYTES
+
+
+tile_cache = DitherTileCache(_tile_cache_budget())
+
+
+def dither_tile_cache_stats():
+    """Return hit/miss/eviction counters and memory use of the tile cache."""
+    return tile_cache.stats()
+
+
+def _display_capability(epd):
+    """Colors the display can show, as part of every tile cache key."""
+    return (
+        bool(getattr(epd, 'is_bw_display', False)),
+        hasattr(epd, 'RED'),
+        hasattr(epd, 'YELLOW'),
+    )
+
+
+def _paint_tile(draw, x, y, background, tile):
+    """Fill a box with an optional background and paint each tile mask."""
+    if tile.width <= 0 or tile.height <= 0:
+        return
+    if background is not None:
+        draw.rectangle([x, y, x + tile.width - 1, y + tile.height - 1], fill=background)
+    for fill, mask in tile.masks:
+        draw.bitmap((x, y), mask, fill=fill)
+
 
 def draw_dithered_box(draw, epd, x, y, width, height, text, primary_color, secondary_color, ratio, font):
     """
@@ -42,23 +282,18 @@ def draw_dithered_box(draw, epd, x, y, width, height, text, primary_color, secon
     primary_epd, primary_rgb = available_colors[primary_color]
     secondary_epd, secondary_rgb = available_colors[secondary_color]
     
-    # Count actual pixels of each color for accurate brightness calculation
-    primary_pixel_count = 0
+    # Paint the whole offset checkerboard from a cached tile and take the
+    # primary pixel count from it for accurate brightness calculation
+    threshold = _checkerboard_threshold(width, height, ratio)
+    tile = tile_cache.get(
+        ('box', _display_capability(epd), primary_epd, threshold, width, height),
+        lambda: _build_tile(
+            width, height, [(primary_epd, _checkerboard_mask(width, height, threshold))]
+        ),
+    )
+    primary_pixel_count = tile.counts[0] if tile.counts else 0
     total_pixels = width * height
-    
-    # Create checkerboard pattern with offset rows to avoid diagonal lines
-    for i in range(width):
-        for j in range(height):
-            # Offset every other row by one pixel
-            offset = (j % 2) * 1
-            # Use the offset in the checkerboard calculation
-            use_primary = ((i + offset + j) % 2 == 0) if (i + j) / (width + height) < ratio else \
-                         ((i + offset + j) % 2 != 0)
-            
-            if use_primary:
-                primary_pixel_count += 1
-            pixel_color = primary_epd if use_primary else secondary_epd
-            draw.point((x + i, y + j), fill=pixel_color)
+    _paint_tile(draw, x, y, secondary_epd, tile)
     
     # Draw border in primary color
     draw.rectangle([x, y, x + width - 1, y + height - 1], outline=primary_epd)
@@ -226,8 +461,8 @@ def draw_dots_dither(draw, epd, x, y, width, height, text, primary_color, second
     draw.text((text_x, text_y), text, font=font, fill=text_color) 
 
 
-def draw_multicolor_dither(draw, epd, x, y, width, height, colors_with_ratios):
-    """Draw a block using multiple colors with specified ratios using a checkerboard pattern"""
+def _multicolor_palette(epd):
+    """Map color names the display supports to their (rgb, fill) pairs."""
     # Only include colors that the display supports
     epd_colors = {
         'white': ((255, 255, 255), epd.WHITE),
@@ -245,7 +480,11 @@ def draw_multicolor_dither(draw, epd, x, y, width, height, colors_with_ratios):
     if epd.is_bw_display:
         epd_colors['white'] = ((255, 255, 255), 1)
         epd_colors['black'] = ((0, 0, 0), 0)
+    return epd_colors
+
 
+def _supported_mix(epd_colors, colors_with_ratios):
+    """Drop colors the display lacks and renormalize the remaining ratios."""
     # Filter out any colors that aren't supported by the display
     valid_colors = [(color, ratio) for color, ratio in colors_with_ratios if color in epd_colors]
 
@@ -257,58 +496,51 @@ def draw_multicolor_dither(draw, epd, x, y, width, height, colors_with_ratios):
     total_ratio = sum(ratio for _, ratio in valid_colors)
     if total_ratio != 1.0:
         valid_colors = [(color, ratio/total_ratio) for color, ratio in valid_colors]
+    return valid_colors
 
-    # If only one color, fill the entire box with that color
-    if len(valid_colors) == 1:
-        color_name = valid_colors[0][0]
-        draw.rectangle([x, y, x + width - 1, y + height - 1], fill=epd_colors[color_name][1])
-        return
 
-    # Create cumulative ratios for easier color selection
+def _cumulative_buckets(valid_colors):
+    """Ratio buckets of a normalized mix, see _multicolor_buckets."""
     cumulative_ratios = []
     cumsum = 0
     for color, ratio in valid_colors:
         cumsum += ratio
-        cumulative_ratios.append((color, cumsum))
+        cumulative_ratios.append(cumsum)
+    return _multicolor_buckets(cumulative_ratios)
 
-    # Count actual pixels of each color for verification
-    color_counts = {color: 0 for color, _ in valid_colors}
-    total_pixels = width * height
 
-    # Create checkerboard pattern with offset rows
-    for i in range(width):
-        for j in range(height):
-            # Offset every other row by one pixel
-            offset = (j % 2) * 1
-            # Use the offset in the pattern calculation
-            pattern_value = ((i + offset + j) % 4) / 4.0
-
-            # Add some controlled randomness to break up patterns while maintaining ratio
-            noise = ((i * 37 + j * 17) % 7) / 28.0  # Pseudo-random noise between 0 and 0.25
-            selection_value = (pattern_value + noise) % 1.0
-
-            # Select color based on cumulative ratios
-            chosen_color = valid_colors[-1][0]  # default to last color
-            for color, cumulative_ratio in cumulative_ratios:
-                if selection_value <= cumulative_ratio:
-                    chosen_color = color
-                    break
+def draw_multicolor_dither(draw, epd, x, y, width, height, colors_with_ratios):
+    """Draw a block using multiple colors with specified ratios using a checkerboard pattern"""
+    epd_colors = _multicolor_palette(epd)
+    valid_colors = _supported_mix(epd_colors, colors_with_ratios)
+
+    # If only one color, fill the entire box with that color
+    if len(valid_colors) == 1:
+        color_name = valid_colors[0][0]
+        draw.rectangle([x, y, x + width - 1, y + height - 1], fill=epd_colors[color_name][1])
+        return
+
+    # Paint one mask per color from a cached tile of the whole block
+    buckets = _cumulative_buckets(valid_colors)
+    fills = tuple(epd_colors[color][1] for color, _ in valid_colors)
 
-            # Update pixel count
-            color_counts[chosen_color] += 1
-            
-            # Draw the pixel
-            draw.point((x + i, y + j), fill=epd_colors[chosen_color][1])
+    def build():
+        indices = _multicolor_indices(width, height, buckets)
+        return _build_tile(width, height, [
+            (fill, indices.translate(_index_mask_table(index)))
+            for index, fill in enumerate(fills)
+        ])
+
+    tile = tile_cache.get(
+        ('multicolor', _display_capability(epd), fills, buckets, width, height),
+        build,
+    )
+    _paint_tile(draw, x, y, None, tile)
 
     # Draw border in the dominant color
     primary_color = max(valid_colors, key=lambda x: x[1])[0]
     draw.rectangle([x, y, x + width - 1, y + height - 1], outline=epd_colors[primary_color][1])
 
-    # Log actual ratios achieved
-    for color, _ in valid_colors:
-        actual_ratio = color_counts[color] / total_pixels
-        #logging.debug(f"Color {color}: target ratio = {dict(valid_colors)[color]:.2f}, actual ratio = {actual_ratio:.2f}")
-
 def draw_multicolor_dither_with_text(draw, epd, x, y, width, height, text, colors_with_ratios, font):
     """Draw a block using multiple colors with specified ratios using a checkerboard pattern, and add text on top"""
     # Draw the dithered background
@@ -328,8 +560,71 @@ def draw_multicolor_dither_with_text(draw, epd, x, y, width, height, text, color
     draw.text((text_x, text_y), text, font=font, fill=text_color)
     return text_bbox
 
+def _opaque_block_averages(icon, block_size):
+    """Average color of the opaque pixels of every block, in one pass per band.
+
+    Returns rows of (r, g, b) tuples, or None for blocks without any pixel
+    whose alpha exceeds 128.
+    """
+    width, height = icon.size
+    red, green, blue, alpha = icon.split()
+    opaque = alpha.point(lambda value: 255 if value > 128 else 0)
+    transparent = Image.new('L', icon.size, 0)
+
+    # reduce() averages each block (edge blocks over the pixels they have) in
+    # float32, which is exact enough to recover the integer sums by rounding.
+    means = [
+        array('f', Image.composite(band, transparent, opaque).convert('F').reduce(block_size).tobytes())
+        for band in (red, green, blue, opaque)
+    ]
+    columns = (width + block_size - 1) // block_size
+    rows = (height + block_size - 1) // block_size
+
+    averages = []
+    for by in range(rows):
+        block_height = min(block_size, height - by * block_size)
+        row = []
+        for bx in range(columns):
+            pixels = min(block_size, width - bx * block_size) * block_height
+            index = by * columns + bx
+            valid_pixels = round(means[3][index] * pixels / 255)
+            if valid_pixels == 0:
+                row.append(None)
+                continue
+            row.append(tuple(
+                round(means[band][index] * pixels) // valid_pixels
+                for band in range(3)
+            ))
+        averages.append(row)
+    return averages
+
+
+def _block_tile(valid_colors, color_ids, width, height):
+    """Global color ids of one dithered icon block, including its border."""
+    ids = [color_ids[color] for color, _ in valid_colors]
+    if len(valid_colors) == 1:
+        return bytes([ids[0]]) * (width * height)
+
+    indices = _multicolor_indices(width, height, _cumulative_buckets(valid_colors))
+    tile = bytearray(indices.translate(bytes(ids) + bytes(256 - len(ids))))
+
+    # Draw border in the dominant color
+    dominant = color_ids[max(valid_colors, key=lambda x: x[1])[0]]
+    tile[:width] = bytes([dominant]) * width
+    tile[(height - 1) * width:] = bytes([dominant]) * width
+    for j in range(height):
+        tile[j * width] = dominant
+        tile[j * width + width - 1] = dominant
+    return bytes(tile)
+
+
 def process_icon_for_epd(icon, epd):
-    """Process icon using multi-color dithering"""
+    """Process icon using multi-color dithering
+
+    Block averages for the whole icon are computed at once, each distinct
+    average is mapped to a color mix once, and the dithered blocks are
+    assembled into a color-id plane that is painted with one mask per color.
+    """
     width, height = icon.size
 
     # Create a new image with white background
@@ -339,35 +634,51 @@ def process_icon_for_epd(icon, epd):
         processed = Image.new('RGB', icon.size, epd.WHITE)
     draw = ImageDraw.Draw(processed)
 
-    block_size = 4
-    for x in range(0, width, block_size):
-        for y in range(0, height, block_size):
-            block = icon.crop((x, y, min(x + block_size, width), min(y + block_size, height)))
-
-            # Calculate average color of non-transparent pixels
-            r, g, b, valid_pixels = 0, 0, 0, 0
-            for px in block.getdata():
-                if len(px) == 4 and px[3] > 128:
-                    r += px[0]
-                    g += px[1]
-                    b += px[2]
-                    valid_pixels += 1
+    # Only pixels with an alpha band count towards the block averages
+    if len(icon.getbands()) != 4 or width == 0 or height == 0:
+        return processed
 
-            if valid_pixels == 0:
+    block_size = 4
+    epd_colors = _multicolor_palette(epd)
+    color_ids = {color: index for index, color in enumerate(epd_colors)}
+    untouched = 0xff
+    plane = bytearray([untouched]) * (width * height)
+    mixes = {}
+    tiles = {}
+
+    for by, row in enumerate(_opaque_block_averages(icon, block_size)):
+        y = by * block_size
+        block_height = min(block_size, height - y)
+        for bx, avg_color in enumerate(row):
+            if avg_color is None:
                 continue
-
-            avg_color = (r//valid_pixels, g//valid_pixels, b//valid_pixels)
+            x = bx * block_size
+            block_width = min(block_size, width - x)
 
             # Get optimal color combination
-            colors_with_ratios = find_optimal_colors(avg_color, epd)
-
-            # Apply multi-color dithering
-            draw_multicolor_dither(
-                draw, epd,
-                x, y,
-                min(block_size, width - x),
-                min(block_size, height - y),
-                colors_with_ratios
+            valid_colors = mixes.get(avg_color)
+            if valid_colors is None:
+                valid_colors = tuple(_supported_mix(
+                    epd_colors, lookup_optimal_colors(avg_color, epd)
+                ))
+                mixes[avg_color] = valid_colors
+
+            tile_key = (valid_colors, block_width, block_height)
+            tile = tiles.get(tile_key)
+            if tile is None:
+                tile = _block_tile(valid_colors, color_ids, block_width, block_height)
+                tiles[tile_key] = tile
+
+            for j in range(block_height):
+                start = (y + j) * width + x
+                plane[start:start + block_width] = tile[j * block_width:(j + 1) * block_width]
+
+    plane = bytes(plane)
+    for color, index in color_ids.items():
+        mask = plane.translate(_index_mask_table(index))
+        if _MASK_ON in mask:
+            draw.bitmap(
+                (0, 0), Image.frombytes('L', icon.size, mask), fill=epd_colors[color][1]
             )
 
-    return processed
\ No newline at end of file
+    return processed
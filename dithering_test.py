@@ -4,6 +4,7 @@ import sys
 import os
 import logging
 from display_adapter import DisplayAdapter
+from panel_orientation import panel_frame
 from PIL import Image, ImageDraw, ImageFont
 from bus_service import BusService
 from dithering import (
@@ -85,7 +86,7 @@ def main():
         
         # Rotate and display
         logging.info("Displaying image...")
-        Himage = Himage.rotate(90, expand=True)
+        Himage = panel_frame(epd, Himage, 90)
         epd.display(epd.getbuffer(Himage))
         
         logging.info("Putting display to sleep...")
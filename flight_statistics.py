@@ -2,7 +2,6 @@
 
 from datetime import datetime, timedelta
 import logging
-import os
 from pathlib import Path
 import sqlite3
 from threading import Lock
@@ -10,7 +9,8 @@ from threading import Lock
 from PIL import Image, ImageDraw, ImageFont
 
 from display_adapter import return_display_lock
-from font_utils import get_font_paths
+from font_utils import get_font
+from panel_orientation import panel_frame
 
 logger = logging.getLogger(__name__)
 display_lock = return_display_lock()
@@ -414,12 +414,11 @@ class FlightStatisticsStore:
 
 
 def _fonts():
-    paths = get_font_paths()
     try:
         return (
-            ImageFont.truetype(paths["dejavu_bold"], 14),
-            ImageFont.truetype(paths["dejavu_bold"], 11),
-            ImageFont.truetype(paths["dejavu"], 10),
+            get_font("dejavu_bold", 14),
+            get_font("dejavu_bold", 11),
+            get_font("dejavu", 10),
         )
     except (IOError, KeyError):
         fallback = ImageFont.load_default()
@@ -434,7 +433,7 @@ def _canvas(epd):
 
 
 def _finish(epd, image, set_base_image):
-    image = image.rotate(int(os.getenv("screen_rotation", "90")), expand=True)
+    image = panel_frame(epd, image)
     with display_lock:
         buffer = epd.getbuffer(image)
         if hasattr(epd, "displayPartial"):
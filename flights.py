@@ -1,8 +1,9 @@
 from PIL import Image, ImageDraw, ImageFont
 import dotenv
 import logging
-from font_utils import get_font_paths
+from font_utils import get_font
 from display_adapter import return_display_lock
+from panel_orientation import panel_frame
 import log_config
 import os
 import requests
@@ -120,11 +121,10 @@ def update_display_with_recent_flights(epd, flights, set_base_image=False):
     background = 1 if epd.is_bw_display else "white"
     image = Image.new(mode, (width, height), background)
     draw = ImageDraw.Draw(image)
-    font_paths = get_font_paths()
     try:
-        header_font = ImageFont.truetype(font_paths["dejavu_bold"], 14)
-        primary_font = ImageFont.truetype(font_paths["dejavu_bold"], 12)
-        detail_font = ImageFont.truetype(font_paths["dejavu"], 10)
+        header_font = get_font("dejavu_bold", 14)
+        primary_font = get_font("dejavu_bold", 12)
+        detail_font = get_font("dejavu", 10)
     except (IOError, KeyError):
         header_font = primary_font = detail_font = ImageFont.load_default()
 
@@ -158,7 +158,7 @@ def update_display_with_recent_flights(epd, flights, set_base_image=False):
         route = " → ".join(part for part in (origin, destination) if part)
         draw.text((7, top + 12), route[:25], fill="black", font=detail_font)
 
-    image = image.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    image = panel_frame(epd, image, DISPLAY_SCREEN_ROTATION)
     with display_lock:
         buffer = epd.getbuffer(image)
         if hasattr(epd, "displayPartial"):
@@ -708,18 +708,16 @@ def update_display_with_flights(epd, flights, set_base_image=False):
         Himage = Image.new('RGB', (width, height), 'white')
     draw = ImageDraw.Draw(Himage)
 
-    # Get font paths based on the operating system
-    font_paths = get_font_paths()
     # Try to load fonts
     try:
-        font_tiny = ImageFont.truetype(font_paths['dejavu'], 10)
-        font_small = ImageFont.truetype(font_paths['dejavu'], 12)
-        font_medium = ImageFont.truetype(font_paths['dejavu_bold'], 15)
-        font_large = ImageFont.truetype(font_paths['dejavu_bold'], 24)
-        font_xl = ImageFont.truetype(font_paths['dejavu_bold'], 36)
-        emoji_font = ImageFont.truetype(font_paths['emoji'], 16)
-        emoji_font_large = ImageFont.truetype(font_paths['emoji'], 20)
-        logger.debug(f"Loaded fonts successfully from paths: {font_paths}")
+        font_tiny = get_font("dejavu", 10)
+        font_small = get_font("dejavu", 12)
+        font_medium = get_font("dejavu_bold", 15)
+        font_large = get_font("dejavu_bold", 24)
+        font_xl = get_font("dejavu_bold", 36)
+        emoji_font = get_font("emoji", 16)
+        emoji_font_large = get_font("emoji", 20)
+        logger.debug("Loaded fonts successfully")
     except IOError as e:
         logger.error(f"Failed to load fonts: {str(e)}")
         font_tiny = font_small = font_medium = font_large = font_xl = emoji_font = emoji_font_large = ImageFont.load_default()
@@ -838,7 +836,7 @@ def update_display_with_flights(epd, flights, set_base_image=False):
         draw.text((width - 60 - MARGIN, bottom_y - 3), alt_text, fill='black', font=font_small)
 
     # Rotate image for display
-    Himage = Himage.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    Himage = panel_frame(epd, Himage, DISPLAY_SCREEN_ROTATION)
 
     # Display the image
     with display_lock:
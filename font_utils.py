@@ -138,3 +138,23 @@ def get_font_paths():
             'dejavu_bold': '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
             'emoji': emoji
         }
+
+
+@lru_cache(maxsize=128)
+def load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Return a process-wide cached TrueType face for a font file and size.
+
+    Raises OSError like ImageFont.truetype when the file cannot be loaded;
+    failures are not cached so a font installed later is picked up.
+    """
+    return ImageFont.truetype(font_path, size)
+
+
+def get_font(role: str, size: int) -> ImageFont.FreeTypeFont:
+    """Return the cached face for a get_font_paths() role such as 'dejavu_bold'."""
+    return load_font(get_font_paths()[role], size)
+
+
+def font_cache_info():
+    """Hits, misses and size of the shared font registry."""
+    return load_font.cache_info()
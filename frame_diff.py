@@ -0,0 +1,209 @@
+"""Compare consecutive display frames and keep per-screen change metrics."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from threading import Lock
+
+from PIL import Image, ImageChops
+
+from packed_frame import PackedFrame
+
+logger = logging.getLogger(__name__)
+
+# Changed rows are grouped in bands this tall before boxes are merged; it keeps
+# the differ to a handful of crops per frame on 250x120 panels.
+BAND_HEIGHT = 8
+
+Box = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class FrameDiff:
+    """Changed regions between two frames, in the compared image's coordinates."""
+
+    boxes: tuple[Box, ...]
+    changed_pixels: int
+    total_pixels: int
+    # L mask, 255 where a pixel changed; None only for empty frames.
+    mask: Image.Image | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def unchanged(self) -> bool:
+        return self.changed_pixels == 0
+
+    @property
+    def changed_ratio(self) -> float:
+        return self.changed_pixels / self.total_pixels if self.total_pixels else 0.0
+
+    @property
+    def bbox(self) -> Box | None:
+        if not self.boxes:
+            return None
+        return (
+            min(box[0] for box in self.boxes),
+            min(box[1] for box in self.boxes),
+            max(box[2] for box in self.boxes),
+            max(box[3] for box in self.boxes),
+        )
+
+
+def _change_mask(previous: Image.Image, current: Image.Image) -> Image.Image:
+    """Return an L mask that is 255 wherever any band differs."""
+    if current.mode == "1":
+        previous, current = previous.convert("L"), current.convert("L")
+    difference = ImageChops.difference(previous, current)
+    if difference.mode != "L":
+        bands = difference.split()
+        difference = bands[0]
+        for band in bands[1:]:
+            difference = ImageChops.lighter(difference, band)
+    return difference.point(lambda value: 255 if value else 0)
+
+
+def diff_frames(
+    previous: Image.Image | None,
+    current: Image.Image,
+    *,
+    band_height: int = BAND_HEIGHT,
+) -> FrameDiff:
+    """Return changed boxes and pixel counts between two frames.
+
+    A missing previous frame, or one with a different size or mode, counts as
+    a full change because the panel content cannot be compared.
+    """
+    width, height = current.size
+    total = width * height
+    if previous is None or previous.size != current.size or previous.mode != current.mode:
+        if not total:
+            return FrameDiff((), 0, 0)
+        full = Image.new("L", current.size, 255)
+        return FrameDiff(((0, 0, width, height),), total, total, full)
+
+    mask = _change_mask(previous, current)
+    changed = mask.histogram()[255]
+    if not changed:
+        return FrameDiff((), 0, total, mask)
+
+    boxes: list[list[int]] = []
+    for top in range(0, height, band_height):
+        bounds = mask.crop((0, top, width, min(top + band_height, height))).getbbox()
+        if bounds is None:
+            continue
+        box = [bounds[0], top + bounds[1], bounds[2], top + bounds[3]]
+        last = boxes[-1] if boxes else None
+        # Merge with the band above when the changed rows are contiguous.
+        if last is not None and last[3] == top and bounds[1] == 0:
+            last[0] = min(last[0], box[0])
+            last[2] = max(last[2], box[2])
+            last[3] = box[3]
+        else:
+            boxes.append(box)
+    return FrameDiff(tuple(tuple(box) for box in boxes), changed, total, mask)
+
+
+@dataclass
+class ScreenChangeStats:
+    updates: int = 0
+    unchanged: int = 0
+    changed_pixels: int = 0
+    changed_ratio_total: float = 0.0
+    last_boxes: tuple[Box, ...] = ()
+
+    def record(self, diff: FrameDiff) -> None:
+        self.updates += 1
+        self.unchanged += diff.unchanged
+        self.changed_pixels += diff.changed_pixels
+        self.changed_ratio_total += diff.changed_ratio
+        self.last_boxes = diff.boxes
+
+    def as_dict(self) -> dict:
+        updates = max(1, self.updates)
+        return {
+            "updates": self.updates,
+            "unchanged": self.unchanged,
+            "pixels_changed_per_update": round(self.changed_pixels / updates, 1),
+            "mean_changed_ratio": round(self.changed_ratio_total / updates, 4),
+            "last_boxes": [list(box) for box in self.last_boxes],
+        }
+
+
+class FrameChangeTracker:
+    """Diff every shown frame against the previous one and aggregate per screen.
+
+    A diff is attributed to the screen passed to ``attribute`` after the
+    render, or, if none arrives before the next frame, to the screen that was
+    current when the frame was observed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._last: Image.Image | None = None
+        self._pending: FrameDiff | None = None
+        self.last_diff: FrameDiff | None = None
+        self.screen: str | None = None
+        self._screens: dict[str, ScreenChangeStats] = {}
+
+    def observe(self, image: Image.Image) -> FrameDiff:
+        with self._lock:
+            diff = diff_frames(self._last, image)
+            self._last = image.copy()
+            self._flush_locked(self.screen)
+            self._pending = diff
+            self.last_diff = diff
+        logger.debug(
+            "Frame changed %s pixels (%.1f%%) in %s",
+            diff.changed_pixels,
+            diff.changed_ratio * 100,
+            list(diff.boxes),
+        )
+        return diff
+
+    def attribute(self, screen: str | None) -> None:
+        with self._lock:
+            if screen is not None:
+                self.screen = str(screen)
+            self._flush_locked(self.screen)
+
+    def reset(self) -> None:
+        """Forget the last frame, e.g. after the panel was cleared."""
+        with self._lock:
+            self._last = None
+
+    def _flush_locked(self, screen: str | None) -> None:
+        if self._pending is None:
+            return
+        self._screens.setdefault(screen or "unknown", ScreenChangeStats()).record(
+            self._pending
+        )
+        self._pending = None
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._screens.items()}
+
+
+def install_frame_tracker(epd, tracker: FrameChangeTracker | None = None):
+    """Observe images and packed frames passed to ``epd.getbuffer``; reset on ``Clear``."""
+    tracker = tracker or FrameChangeTracker()
+    original_getbuffer = epd.getbuffer
+
+    def tracking_getbuffer(image, *args, **kwargs):
+        if isinstance(image, Image.Image):
+            tracker.observe(image)
+        elif isinstance(image, PackedFrame):
+            tracker.observe(image.to_image())
+        return original_getbuffer(image, *args, **kwargs)
+
+    epd.getbuffer = tracking_getbuffer
+    original_clear = getattr(epd, "Clear", None)
+    if original_clear is not None:
+
+        def tracking_clear(*args, **kwargs):
+            tracker.reset()
+            return original_clear(*args, **kwargs)
+
+        epd.Clear = tracking_clear
+    epd.frame_changes = tracker
+    return tracker
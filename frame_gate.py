@@ -0,0 +1,126 @@
+"""Skip panel writes whose frame is already on the display."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from threading import Lock
+from typing import Callable
+
+from PIL import Image
+
+from packed_frame import PackedFrame
+
+logger = logging.getLogger(__name__)
+
+
+def frame_fingerprint(*buffers) -> bytes:
+    """Hash renderer images or driver buffers (bytes, bytearray, int lists).
+
+    A ``PackedFrame`` hashes like the driver buffer it becomes.
+
+    Every positional buffer is included, so two-plane colour writes such as
+    ``display(black, red)`` only match when both planes match.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for buffer in buffers:
+        if isinstance(buffer, Image.Image):
+            digest.update(f"{buffer.mode}:{buffer.size[0]}x{buffer.size[1]}:".encode())
+            digest.update(buffer.tobytes())
+        elif isinstance(buffer, PackedFrame):
+            digest.update(f"bytes:{len(buffer.data)}:".encode())
+            digest.update(buffer.data)
+        elif buffer is None:
+            digest.update(b"none:")
+        else:
+            data = bytes(buffer)
+            digest.update(f"bytes:{len(data)}:".encode())
+            digest.update(data)
+    return digest.digest()
+
+
+class FrameGate:
+    """Remembers the fingerprint of the frame on the panel.
+
+    ``write`` calls the driver only when the buffers differ from the last
+    successful write. ``invalidate`` must be called whenever the panel content
+    becomes unknown: after ``init``, ``Clear`` or ``sleep``, or a failed write.
+    """
+
+    def __init__(self, name: str = "display") -> None:
+        self.name = name
+        self._lock = Lock()
+        self._fingerprint: bytes | None = None
+        self.writes = 0
+        self.skipped = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fingerprint = None
+
+    def write(self, write: Callable, *buffers, force: bool = False, **kwargs):
+        """Call ``write(*buffers, **kwargs)`` unless the frame is unchanged.
+
+        ``force`` writes even an unchanged frame, still remembering it.
+        """
+        fingerprint = frame_fingerprint(*buffers)
+        with self._lock:
+            if fingerprint == self._fingerprint and not force:
+                self.skipped += 1
+                skipped = self.skipped
+            else:
+                skipped = None
+        if skipped is not None:
+            logger.debug(
+                "Skipped identical %s frame (%s skipped so far)", self.name, skipped
+            )
+            return None
+        try:
+            result = write(*buffers, **kwargs)
+        except Exception:
+            self.invalidate()
+            raise
+        with self._lock:
+            self._fingerprint = fingerprint
+            self.writes += 1
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"writes": self.writes, "skipped": self.skipped}
+
+
+def install_frame_gate(epd, gate: FrameGate | None = None) -> FrameGate:
+    """Route a driver's frame writes through ``gate`` and reset it on init/Clear/sleep."""
+    gate = gate or FrameGate(type(epd).__name__)
+
+    # displayPartBaseImage also reloads the driver's base (old-image) RAM that
+    # later partials diff against, so it is never skipped, even for the frame
+    # just sent through displayPartial.
+    for name, force in (
+        ("display", False),
+        ("displayPartial", False),
+        ("displayPartBaseImage", True),
+    ):
+        original = getattr(epd, name, None)
+        if original is None:
+            continue
+
+        def gated(*buffers, _original=original, _force=force, **kwargs):
+            return gate.write(_original, *buffers, force=_force, **kwargs)
+
+        setattr(epd, name, gated)
+
+    for name in ("init", "init_Fast", "Clear", "sleep"):
+        original = getattr(epd, name, None)
+        if original is None:
+            continue
+
+        def invalidating(*args, _original=original, **kwargs):
+            gate.invalidate()
+            return _original(*args, **kwargs)
+
+        setattr(epd, name, invalidating)
+
+    epd.frame_gate = gate
+    return gate
@@ -0,0 +1,116 @@
+"""Bounded history of recently published frames for replaying what a panel showed."""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+
+DEFAULT_HISTORY_FRAMES = 120
+DEFAULT_HISTORY_BYTES = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FrameRecord:
+    sequence: int
+    published_at: str
+    sha256: str
+    content_length: int
+    # The screen that rendered the frame and the arbiter owner at the time.
+    screen: str | None = None
+    owner: str | None = None
+    # How long the renderer held the display lock before publishing.
+    render_seconds: float | None = None
+
+
+class FrameHistory:
+    """The last ``max_frames`` published frames within ``max_bytes`` of PNG data.
+
+    Frames are stored by digest, so identical frames (a countdown that comes
+    back round, alternating weather and transit screens) share one copy and
+    ``max_bytes`` counts it once. The oldest records are dropped first; the
+    newest frame is always kept, even when it alone exceeds ``max_bytes``.
+
+    Like ``FrameChangeTracker``, the screen reported by ``attribute`` after a
+    render replaces the one the frame was recorded with.
+    """
+
+    def __init__(
+        self,
+        max_frames: int = DEFAULT_HISTORY_FRAMES,
+        max_bytes: int = DEFAULT_HISTORY_BYTES,
+    ) -> None:
+        if max_frames < 1:
+            raise ValueError("frame history needs room for at least one frame")
+        self.max_frames = max_frames
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._records: OrderedDict[int, FrameRecord] = OrderedDict()
+        self._contents: dict[str, bytes] = {}
+        self._references: Counter[str] = Counter()
+        self._stored_bytes = 0
+        self._pending: int | None = None
+
+    def add(self, record: FrameRecord, content: bytes) -> None:
+        with self._lock:
+            if record.sequence in self._records:
+                self._forget_locked(record.sequence)
+            elif self._records and record.sequence < next(reversed(self._records)):
+                # The sequence went backwards, so older records no longer
+                # describe this publisher's frames.
+                while self._records:
+                    self._forget_locked(next(iter(self._records)))
+            if record.sha256 not in self._contents:
+                self._contents[record.sha256] = content
+                self._stored_bytes += len(content)
+            self._references[record.sha256] += 1
+            self._records[record.sequence] = record
+            self._pending = record.sequence
+            while len(self._records) > 1 and (
+                len(self._records) > self.max_frames
+                or self._stored_bytes > self.max_bytes
+            ):
+                self._forget_locked(next(iter(self._records)))
+
+    def _forget_locked(self, sequence: int) -> None:
+        record = self._records.pop(sequence)
+        self._references[record.sha256] -= 1
+        if not self._references[record.sha256]:
+            del self._references[record.sha256]
+            self._stored_bytes -= len(self._contents.pop(record.sha256))
+        if self._pending == sequence:
+            self._pending = None
+
+    def attribute(self, screen: str | None, owner: str | None = None) -> None:
+        """Attribute the latest frame, if not yet attributed, to ``screen``."""
+        with self._lock:
+            sequence, self._pending = self._pending, None
+            if sequence is None or screen is None:
+                return
+            self._records[sequence] = replace(
+                self._records[sequence], screen=str(screen), owner=owner
+            )
+
+    def since(self, sequence: int = 0) -> list[FrameRecord]:
+        """Records newer than ``sequence``, oldest first."""
+        with self._lock:
+            return [
+                record for number, record in self._records.items() if number > sequence
+            ]
+
+    def get(self, sequence: int) -> tuple[FrameRecord, bytes] | None:
+        with self._lock:
+            record = self._records.get(sequence)
+            if record is None:
+                return None
+            return record, self._contents[record.sha256]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "frames": len(self._records),
+                "distinct_frames": len(self._contents),
+                "stored_bytes": self._stored_bytes,
+                "max_frames": self.max_frames,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,184 @@
+"""Schedule full e-paper refreshes from accumulated partial-update wear."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from threading import Lock
+from typing import Callable
+
+from PIL import Image, ImageChops
+
+from frame_diff import FrameChangeTracker, FrameDiff
+
+logger = logging.getLogger(__name__)
+
+# A pixel flipped this many times by partial updates is counted as ghosted.
+DEFAULT_PIXEL_LIMIT = 24
+# Share of the panel allowed to be ghosted before a full refresh is due.
+DEFAULT_BUDGET = 0.01
+
+
+def full_refresh_max_interval() -> float | None:
+    """Seconds of accumulated wear after which a full refresh is forced.
+
+    ``refresh_full_interval`` keeps its meaning as the slowest full-refresh
+    cadence; 0 leaves the decision to the ghosting budget alone.
+    """
+    return max(0.0, float(os.getenv("refresh_full_interval", "3600"))) or None
+
+
+def _ones(value: int) -> int:
+    return 1 if value else 0
+
+
+class GhostingBudget:
+    """Accumulate per-pixel partial-update wear and report when it is spent.
+
+    Every partial update adds one to the wear of each pixel it changed; a full
+    or base-image refresh clears it. A full refresh is due once more than
+    ``budget`` of the panel has reached ``pixel_limit`` flips, or when one of
+    the optional ceilings (partial updates, seconds with wear) is reached.
+    """
+
+    def __init__(
+        self,
+        *,
+        pixel_limit: int | None = None,
+        budget: float | None = None,
+        max_partial_updates: int | None = None,
+        max_interval_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if pixel_limit is None:
+            pixel_limit = int(
+                os.getenv("refresh_ghosting_pixel_limit", str(DEFAULT_PIXEL_LIMIT))
+            )
+        if budget is None:
+            budget = float(os.getenv("refresh_ghosting_budget", str(DEFAULT_BUDGET)))
+        # Wear is an L image that saturates at 255 flips.
+        self.pixel_limit = min(255, max(1, pixel_limit))
+        self.budget = min(1.0, max(0.0, budget))
+        self.max_partial_updates = max_partial_updates
+        self.max_interval_seconds = max_interval_seconds or None
+        self._clock = clock
+        self._lock = Lock()
+        self._wear: Image.Image | None = None
+        self._worn_since: float | None = None
+        self.partial_updates = 0
+        self.full_refreshes = 0
+        self.deferred = 0
+        self._deferring = False
+        self.last_reason: str | None = None
+
+    def record_partial(self, diff: FrameDiff | None) -> None:
+        if diff is None or diff.unchanged or diff.mask is None:
+            return
+        increment = diff.mask.point(_ones)
+        with self._lock:
+            if self._wear is None or self._wear.size != increment.size:
+                self._wear = Image.new("L", increment.size, 0)
+            self._wear = ImageChops.add(self._wear, increment)
+            self.partial_updates += 1
+            if self._worn_since is None:
+                self._worn_since = self._clock()
+
+    def record_full(self) -> None:
+        with self._lock:
+            self._wear = None
+            self._worn_since = None
+            self.partial_updates = 0
+            self.full_refreshes += 1
+            self._deferring = False
+
+    def defer(self) -> None:
+        """Count a due refresh postponed because another screen owns the panel.
+
+        Repeated calls before the next full refresh count as one deferral.
+        """
+        with self._lock:
+            if not self._deferring:
+                self._deferring = True
+                self.deferred += 1
+
+    def _ghosted_pixels_locked(self) -> tuple[int, int]:
+        if self._wear is None:
+            return 0, 0
+        histogram = self._wear.histogram()
+        return sum(histogram[self.pixel_limit:]), self._wear.width * self._wear.height
+
+    def due_reason(self) -> str | None:
+        """Return why a full refresh is due ("budget", ...), or None."""
+        with self._lock:
+            ghosted, total = self._ghosted_pixels_locked()
+            if total and ghosted > self.budget * total:
+                return "budget"
+            if (
+                self.max_partial_updates is not None
+                and self.partial_updates >= self.max_partial_updates
+            ):
+                return "partial-updates"
+            if (
+                self.max_interval_seconds is not None
+                and self._worn_since is not None
+                and self._clock() - self._worn_since >= self.max_interval_seconds
+            ):
+                return "interval"
+            return None
+
+    def due(self) -> bool:
+        reason = self.due_reason()
+        if reason is not None and reason != self.last_reason:
+            logger.info("Full refresh due (%s): %s", reason, self.stats())
+        self.last_reason = reason
+        return reason is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            ghosted, total = self._ghosted_pixels_locked()
+            return {
+                "partial_updates": self.partial_updates,
+                "full_refreshes": self.full_refreshes,
+                "deferred": self.deferred,
+                "ghosted_pixels": ghosted,
+                "ghosted_ratio": round(ghosted / total, 4) if total else 0.0,
+                "max_wear": self._wear.getextrema()[1] if self._wear else 0,
+                "pixel_limit": self.pixel_limit,
+                "budget": self.budget,
+            }
+
+
+def install_ghosting_budget(
+    epd, tracker: FrameChangeTracker, budget: GhostingBudget | None = None
+) -> GhostingBudget:
+    """Charge ``displayPartial`` writes to ``budget``; full writes reset it.
+
+    Install inside the frame gate so skipped identical frames cost nothing.
+    """
+    budget = budget or GhostingBudget()
+
+    original_partial = getattr(epd, "displayPartial", None)
+    if original_partial is not None:
+
+        def charged_partial(*args, **kwargs):
+            result = original_partial(*args, **kwargs)
+            budget.record_partial(tracker.last_diff)
+            return result
+
+        epd.displayPartial = charged_partial
+
+    for name in ("display", "displayPartBaseImage", "Clear"):
+        original = getattr(epd, name, None)
+        if original is None:
+            continue
+
+        def resetting(*args, _original=original, **kwargs):
+            result = _original(*args, **kwargs)
+            budget.record_full()
+            return result
+
+        setattr(epd, name, resetting)
+
+    epd.ghosting = budget
+    return budget
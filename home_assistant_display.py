@@ -7,7 +7,9 @@ import os
 
 from PIL import Image, ImageDraw, ImageFont
 
-from font_utils import get_font_paths
+from font_utils import get_font
+from panel_orientation import panel_frame
+from text_layout import longest_fitting_prefix
 
 ROTATION = int(os.getenv("screen_rotation", 90))
 ACTIVE_STATES = {"on", "active", "detected", "true"}
@@ -15,11 +17,10 @@ ACTIVE_STATES = {"on", "active", "detected", "true"}
 
 def _fonts():
     try:
-        paths = get_font_paths()
         return (
-            ImageFont.truetype(paths["dejavu_bold"], 15),
-            ImageFont.truetype(paths["dejavu"], 12),
-            ImageFont.truetype(paths["dejavu_bold"], 24),
+            get_font("dejavu_bold", 15),
+            get_font("dejavu", 12),
+            get_font("dejavu_bold", 24),
         )
     except OSError:
         font = ImageFont.load_default()
@@ -28,8 +29,7 @@ def _fonts():
 
 def _text(draw, value, font, width):
     value = " ".join(str(value).split())
-    while value and draw.textbbox((0, 0), value, font=font)[2] > width:
-        value = value[:-1]
+    value = value[: longest_fitting_prefix(draw, value, font, width)]
     return value if value else "—"
 
 
@@ -160,7 +160,7 @@ def draw_home_assistant_screen(
             width = draw.textbbox((0, 0), rendered, font=heading)[2]
             draw.text((243 - width, y - 1), rendered, font=heading, fill=black)
 
-    image = image.rotate(ROTATION, expand=True)
+    image = panel_frame(epd, image, ROTATION)
     buffer = epd.getbuffer(image)
     if hasattr(epd, "displayPartial"):
         epd.displayPartial(buffer)
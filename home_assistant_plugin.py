@@ -78,7 +78,8 @@ class HomeAssistantPlugin:
         service.add_listener(self._state_changed)
 
     @classmethod
-    def from_env(cls, context):
+    def from_env(cls, context, *, service=None):
+        """Build the plugin from .env; ``service`` shares an existing connection."""
         enabled = os.getenv("home_assistant_enabled", "false").strip().lower() in {
             "1",
             "true",
@@ -95,9 +96,10 @@ class HomeAssistantPlugin:
             for entity_id in entity.source_entity_ids
         }
         ids.update(trigger.entity_id for trigger in config.triggers)
-        service = HomeAssistantService(
-            os.environ["home_assistant_url"], os.environ["home_assistant_token"], ids
-        )
+        if service is None:
+            service = HomeAssistantService(
+                os.environ["home_assistant_url"], os.environ["home_assistant_token"], ids
+            )
         return cls(context, config=config, service=service)
 
     @property
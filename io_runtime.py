@@ -0,0 +1,192 @@
+"""Optional shared runtime that runs the periodic fetchers on one asyncio loop.
+
+In the default threaded mode every fetcher owns a thread that sleeps between
+polls. With ``display_runtime=asyncio`` they become tasks on one event loop
+instead: blocking fetches (the clients use ``requests`` and ``urlopen``) run on
+a small shared I/O pool, and the renders that follow them run one at a time on
+a single render worker, so fetchers no longer compete with each other for the
+GIL while drawing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+RUNTIME_MODES = ("threads", "asyncio")
+
+Interval = Union[float, Callable[[], float]]
+
+
+def configured_runtime_mode() -> str:
+    mode = os.getenv("display_runtime", "threads").strip().lower()
+    if mode not in RUNTIME_MODES:
+        logger.warning("Unknown display_runtime %r; using threads", mode)
+        return "threads"
+    return mode
+
+
+class PeriodicTask:
+    """Handle for a job scheduled with ``IoRuntime.every``."""
+
+    def __init__(self, name: str, future: Future) -> None:
+        self.name = name
+        self._future = future
+
+    def cancel(self) -> None:
+        self._future.cancel()
+
+    def running(self) -> bool:
+        return not self._future.done()
+
+
+class IoRuntime:
+    """One event loop thread, a shared I/O pool and a single render worker."""
+
+    def __init__(self, *, io_workers: int = 2) -> None:
+        self.io_workers = max(1, io_workers)
+        self._loop = asyncio.new_event_loop()
+        self._io = ThreadPoolExecutor(
+            self.io_workers, thread_name_prefix="RuntimeIO"
+        )
+        self._render = ThreadPoolExecutor(1, thread_name_prefix="RuntimeRender")
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, PeriodicTask] = {}
+        self._runs: Dict[str, int] = {}
+        self._failures: Dict[str, int] = {}
+        self._stopped = False
+
+    def start(self) -> None:
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("the I/O runtime has been stopped")
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="IoRuntime", daemon=True
+            )
+            self._thread.start()
+
+    def every(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        interval_seconds: Interval,
+        *,
+        render: Optional[Callable[[Any], Any]] = None,
+        on_error: Optional[Callable[[Exception], Any]] = None,
+        initial_delay: float = 0.0,
+    ) -> PeriodicTask:
+        """Run ``fetch`` on the I/O pool every ``interval_seconds``.
+
+        ``render``, when given, receives each result on the render worker.
+        ``interval_seconds`` may be a callable, read before every sleep.
+        Exceptions go to ``on_error`` (or the log) and the job keeps running.
+
+        Jobs are independent: display profiles sharing the runtime each
+        schedule their own plugins, so a name still held by a running job is
+        suffixed (``name#2``) rather than replacing it. The returned task's
+        ``name`` is the one its stats are reported under.
+        """
+        self.start()
+        with self._lock:
+            key = name
+            suffix = 1
+            while key in self._tasks and self._tasks[key].running():
+                suffix += 1
+                key = f"{name}#{suffix}"
+            future = asyncio.run_coroutine_threadsafe(
+                self._periodic(
+                    key, fetch, interval_seconds, render, on_error, initial_delay
+                ),
+                self._loop,
+            )
+            task = PeriodicTask(key, future)
+            self._tasks[key] = task
+        return task
+
+    async def _periodic(
+        self, name, fetch, interval, render, on_error, initial_delay
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        if initial_delay > 0:
+            await asyncio.sleep(initial_delay)
+        while True:
+            try:
+                result = await loop.run_in_executor(self._io, fetch)
+                if render is not None:
+                    await loop.run_in_executor(self._render, render, result)
+            except Exception as exc:
+                self._count(self._failures, name)
+                if on_error is not None:
+                    await loop.run_in_executor(self._render, on_error, exc)
+                else:
+                    logger.warning("%s failed (%s)", name, type(exc).__name__)
+            self._count(self._runs, name)
+            seconds = interval() if callable(interval) else interval
+            await asyncio.sleep(max(0.0, seconds))
+
+    def _count(self, counter: Dict[str, int], name: str) -> None:
+        with self._lock:
+            counter[name] = counter.get(name, 0) + 1
+
+    def submit_render(self, func: Callable[..., Any], *args: Any) -> Future:
+        """Run CPU-bound drawing on the single render worker."""
+        return self._render.submit(func, *args)
+
+    def stop(self) -> None:
+        """Cancel every job and stop the loop; safe to call more than once."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._tasks.clear()
+            thread = self._thread
+        if thread and thread.is_alive():
+            shutdown = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+            try:
+                shutdown.result(timeout=1.0)
+            except Exception:
+                logger.warning("I/O runtime tasks did not stop cleanly")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            thread.join(timeout=1.0)
+        if not self._loop.is_running():
+            self._loop.close()
+        # A fetch stuck on a network timeout must not hold up shutdown.
+        self._io.shutdown(wait=False, cancel_futures=True)
+        self._render.shutdown(wait=False, cancel_futures=True)
+
+    async def _shutdown(self) -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "io_workers": self.io_workers,
+                "tasks": {
+                    name: {
+                        "runs": self._runs.get(name, 0),
+                        "failures": self._failures.get(name, 0),
+                        "running": task.running(),
+                    }
+                    for name, task in self._tasks.items()
+                },
+            }
+
+
+def configured_io_runtime() -> Optional[IoRuntime]:
+    """The shared runtime for ``display_runtime=asyncio``; None for threads."""
+    if configured_runtime_mode() != "asyncio":
+        return None
+    return IoRuntime(io_workers=int(os.getenv("display_runtime_io_workers", "2")))
@@ -16,7 +16,8 @@ import dotenv
 import requests
 from pathlib import Path
 from display_adapter import DisplayAdapter, return_display_lock, initialize_display
-from font_utils import get_font_paths
+from font_utils import get_font
+from panel_orientation import panel_frame
 import log_config
 import logging
 from PIL import Image, ImageDraw, ImageFont
@@ -409,12 +410,11 @@ def get_direction(azimuth):
 
 @lru_cache(maxsize=1)
 def _prediction_fonts():
-    font_paths = get_font_paths()
     try:
         return (
-            ImageFont.truetype(font_paths['dejavu_bold'], 21),
-            ImageFont.truetype(font_paths['dejavu_bold'], 15),
-            ImageFont.truetype(font_paths['dejavu'], 12),
+            get_font("dejavu_bold", 21),
+            get_font("dejavu_bold", 15),
+            get_font("dejavu", 12),
         )
     except OSError:
         fallback = ImageFont.load_default()
@@ -469,7 +469,7 @@ def display_next_iss_pass(epd, pass_info, now=None):
         for index, detail in enumerate(details[:3]):
             draw.text((8, 72 + index * 16), detail, font=detail_font, fill="black")
 
-    image = image.rotate(display_rotation, expand=True)
+    image = panel_frame(epd, image, display_rotation)
     with return_display_lock():
         buffer = epd.getbuffer(image)
         if hasattr(epd, 'displayPartial'):
@@ -500,10 +500,9 @@ def display_iss_info(epd, iss_info, satellite_name="ISS (ZARYA)"):
         Himage = Image.new('RGB', (width, height), 'white')
     draw = ImageDraw.Draw(Himage)
 
-    font_paths = get_font_paths()
-    font_medium = ImageFont.truetype(font_paths['dejavu_bold'], 12)
-    font_large = ImageFont.truetype(font_paths['dejavu_bold'], 16)
-    emoji_font = ImageFont.truetype(font_paths['emoji'], 50)
+    font_medium = get_font("dejavu_bold", 12)
+    font_large = get_font("dejavu_bold", 16)
+    emoji_font = get_font("emoji", 50)
 
     emoji_bbox = emoji_font.getbbox("🛰️")
     emoji_height = emoji_bbox[3] - emoji_bbox[1]
@@ -543,7 +542,7 @@ def display_iss_info(epd, iss_info, satellite_name="ISS (ZARYA)"):
 
     # Rotate and display the image
    
-    Himage = Himage.rotate(display_rotation, expand=True)
+    Himage = panel_frame(epd, Himage, display_rotation)
     with display_lock:
         buffer = epd.getbuffer(Himage)
         if hasattr(epd, 'displayPartial'):
@@ -0,0 +1,158 @@
+"""Packed 1-bit frames in a monochrome panel's native row layout.
+
+Waveshare black-and-white drivers turn PIL images into a buffer of rows of
+``ceil(width / 8)`` bytes, most significant bit first, with 1 meaning white.
+``PackedFrame`` holds a frame in exactly that layout so it can travel from the
+render server to the panel without a PNG decode or a driver ``getbuffer``
+conversion on the display Pi.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+from PIL import Image
+
+from panel_orientation import pad_frame, rotate_frame
+
+logger = logging.getLogger(__name__)
+
+PACKED_CONTENT_TYPE = "application/vnd.rpi-display.1bpp"
+_GEOMETRY = re.compile(r"^(\d{1,4})x(\d{1,4})@(0|90|180|270)$")
+
+
+def packed_framebuffer_enabled() -> bool:
+    return os.getenv("display_packed_framebuffer", "false").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+
+def format_geometry(width: int, height: int, rotation: int) -> str:
+    return f"{width}x{height}@{rotation % 360}"
+
+
+def parse_geometry(value: str | None) -> tuple[int, int, int] | None:
+    """Parse ``WIDTHxHEIGHT@ROTATION``; None for anything malformed."""
+    match = _GEOMETRY.match((value or "").strip())
+    if match is None:
+        return None
+    width, height, rotation = (int(group) for group in match.groups())
+    if not width or not height:
+        return None
+    return width, height, rotation
+
+
+@dataclass(frozen=True)
+class PackedFrame:
+    """A 1-bit frame in panel orientation, packed as the panel expects it."""
+
+    width: int
+    height: int
+    data: bytes
+
+    def __post_init__(self) -> None:
+        expected = self.stride * self.height
+        if self.width <= 0 or self.height <= 0 or len(self.data) != expected:
+            raise ValueError(
+                f"packed {self.width}x{self.height} frame needs {expected} bytes, "
+                f"got {len(self.data)}"
+            )
+
+    @property
+    def stride(self) -> int:
+        return (self.width + 7) // 8
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> "PackedFrame":
+        if image.mode != "1":
+            image = image.convert("1")
+        return cls(image.width, image.height, image.tobytes())
+
+    def to_image(self) -> Image.Image:
+        return Image.frombytes("1", self.size, self.data)
+
+
+def pack_for_panel(
+    image: Image.Image, width: int, height: int, rotation: int
+) -> PackedFrame:
+    """Rotate a logical frame into panel orientation, centre it and pack it.
+
+    The steps run in the order the driver path used (rotate, pad, then the
+    1-bit conversion), so dithered colour frames pack to the same pixels.
+    """
+    return PackedFrame.from_image(pad_frame(rotate_frame(image, rotation), width, height))
+
+
+def _probe_image(width: int, height: int) -> Image.Image:
+    stride = (width + 7) // 8
+    return Image.frombytes(
+        "1",
+        (width, height),
+        bytes((index * 37 + 11) % 256 for index in range(stride * height)),
+    )
+
+
+def _without_row_padding(data: bytes, width: int, stride: int) -> bytes:
+    """Clear the unused low bits at the end of every row."""
+    spare = stride * 8 - width
+    if not spare:
+        return data
+    mask = (0xFF << spare) & 0xFF
+    rows = bytearray(data)
+    for end in range(stride - 1, len(rows), stride):
+        rows[end] &= mask
+    return bytes(rows)
+
+
+def install_packed_framebuffer(epd) -> bool:
+    """Let ``epd.getbuffer`` pass ``PackedFrame`` buffers straight through.
+
+    Installed directly on the driver's ``getbuffer``, before any wrapper that
+    rotates images. The driver's own conversion of a probe image must match the
+    packed layout (ignoring unused bits at the end of each row), so panels with
+    another memory layout keep the driver conversion and report False.
+    """
+    width, height = getattr(epd, "width", 0), getattr(epd, "height", 0)
+    if not width or not height:
+        return False
+    original_getbuffer = epd.getbuffer
+    probe = _probe_image(width, height)
+    expected = PackedFrame.from_image(probe)
+    try:
+        actual = bytes(original_getbuffer(probe))
+    except Exception as exc:
+        logger.warning("Packed framebuffer disabled; driver probe failed: %s", exc)
+        return False
+    if len(actual) != len(expected.data) or _without_row_padding(
+        actual, width, expected.stride
+    ) != _without_row_padding(expected.data, width, expected.stride):
+        logger.warning(
+            "Packed framebuffer disabled; %s uses a different buffer layout",
+            type(epd).__name__,
+        )
+        return False
+
+    def packed_getbuffer(image, *args, **kwargs):
+        if isinstance(image, PackedFrame):
+            if image.size != (width, height):
+                raise ValueError(
+                    f"packed frame is {image.width}x{image.height}, "
+                    f"panel is {width}x{height}"
+                )
+            return bytearray(image.data)
+        return original_getbuffer(image, *args, **kwargs)
+
+    epd.getbuffer = packed_getbuffer
+    epd.accepts_packed_frames = True
+    logger.info("Packed 1-bit framebuffer enabled for %sx%s panel", width, height)
+    return True
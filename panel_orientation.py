@@ -0,0 +1,72 @@
+"""Hand renderer frames to displays in the orientation each display expects.
+
+Renderers draw in logical orientation: a landscape ``(epd.height, epd.width)``
+canvas. Displays created by this project (``MockDisplay``, hardware panels
+from ``DisplayAdapter.get_display`` and ``PublicationDisplay``) set
+``accepts_logical_frames`` and turn the frame into panel orientation at most
+once, where the frame leaves the process; other displays still receive the
+frame rotated by ``screen_rotation`` as before.
+"""
+
+from __future__ import annotations
+
+import os
+
+from PIL import Image
+
+# Image.rotate(angle, expand=True) for quarter turns, without the resampling
+# setup rotate() goes through first.
+_TRANSPOSES = {
+    90: Image.Transpose.ROTATE_90,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_270,
+}
+
+
+def screen_rotation() -> int:
+    return int(os.getenv("screen_rotation", "90"))
+
+
+def rotate_frame(image: Image.Image, rotation: int) -> Image.Image:
+    """Rotate ``image`` counter-clockwise by ``rotation`` degrees.
+
+    A rotation of 0 returns ``image`` itself rather than a copy.
+    """
+    rotation %= 360
+    if not rotation:
+        return image
+    transpose = _TRANSPOSES.get(rotation)
+    if transpose is None:
+        return image.rotate(rotation, expand=True)
+    return image.transpose(transpose)
+
+
+def panel_frame(epd, image: Image.Image, rotation: int | None = None) -> Image.Image:
+    """Return the logical ``image`` in the orientation ``epd.getbuffer`` expects."""
+    if getattr(epd, "accepts_logical_frames", False):
+        return image
+    return rotate_frame(image, screen_rotation() if rotation is None else rotation)
+
+
+def pad_frame(image: Image.Image, width: int, height: int) -> Image.Image:
+    """Centre ``image`` on a white ``width`` x ``height`` canvas of its mode.
+
+    Returns ``image`` itself when it already has that size, and raises
+    ValueError when it does not fit.
+    """
+    if image.size == (width, height):
+        return image
+    if image.width > width or image.height > height:
+        raise ValueError(
+            "frame does not fit the hardware buffer "
+            f"({image.width}x{image.height} > {width}x{height})"
+        )
+    bands = image.getbands()
+    white = (
+        1
+        if image.mode == "1"
+        else (255 if len(bands) == 1 else tuple(255 for _ in bands))
+    )
+    padded = Image.new(image.mode, (width, height), white)
+    padded.paste(image, ((width - image.width) // 2, (height - image.height) // 2))
+    return padded
@@ -16,6 +16,9 @@ class PluginContext:
     arbiter: ScreenArbiter
     display_lock: Any
     on_render: Optional[Callable[[str], None]] = None
+    # An ``IoRuntime`` when ``display_runtime=asyncio``; plugins that poll a
+    # data source schedule themselves on it instead of starting a thread.
+    runtime: Any = None
 
 
 def normalize_plugin_context(
@@ -83,6 +83,7 @@ class PeriodicRotatingScreen:
 
     def stop(self) -> None:
         self.stop_event.set()
+        self.context.arbiter.interrupt_waiters()
         if self._thread:
             self._thread.join(timeout=max(1.0, self.poll_seconds * 2))
             if not self._thread.is_alive():
@@ -95,13 +96,35 @@ class PeriodicRotatingScreen:
         self._was_selected = False
 
     def _run(self) -> None:
+        arbiter = self.context.arbiter
+        generation = arbiter.generation
         while not self.stop_event.is_set():
+            timeout = self.poll_seconds
             try:
                 self.tick()
+                timeout = self._seconds_until_due()
             except Exception:
                 logger.exception("Periodic rotating screen update failed")
                 self._release_current()
-            self.stop_event.wait(self.poll_seconds)
+            if self.stop_event.is_set():
+                break
+            generation = arbiter.wait_for_change(generation, timeout)
+
+    def _seconds_until_due(self) -> Optional[float]:
+        """How long ``_run`` may sleep when the screen owner does not change."""
+
+        now = self.clock()
+        if self._view_started_at is None and not self._pending:
+            return max(0.0, self._next_rotation_at - now)
+        if self._view_started_at is None:
+            # Waiting behind another owner: its release or expiry wakes us.
+            return None
+        view = self.views[self._index]
+        remaining = max(0.0, self._view_started_at + view.duration_seconds - now)
+        if view.render_key:
+            # Content that changes while shown is re-checked every poll.
+            return min(remaining, self.poll_seconds)
+        return remaining
 
     def tick(self, now: Optional[float] = None) -> bool:
         """Advance and render the rotation once; return whether it rendered."""
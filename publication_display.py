@@ -8,6 +8,9 @@ import os
 from PIL import Image
 
 from display_protocol import FRAME_HEIGHT, FRAME_WIDTH, FramePublisher
+from frame_diff import FrameChangeTracker
+from panel_orientation import rotate_frame
+from render_lock import RenderLock
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +29,30 @@ class PublicationDisplay:
             return None
 
     epdconfig = _Config()
+    # Renderers hand over landscape frames, which are published as drawn.
+    accepts_logical_frames = True
 
-    def __init__(self, publisher: FramePublisher) -> None:
+    def __init__(self, publisher: FramePublisher, profile=None) -> None:
         self.publisher = publisher
-        self.is_bw_display = os.getenv("mock_display_type", "bw").lower() == "bw"
+        # Renderers read per-panel settings (stop name, lines) from here.
+        self.display_profile = profile
+        self.is_bw_display = (
+            profile.is_bw
+            if profile is not None
+            else os.getenv("mock_display_type", "bw").lower() == "bw"
+        )
         if not self.is_bw_display:
-            self.RED = (255, 0, 0)
-            self.YELLOW = (255, 255, 0)
+            # Renderers mix only the colours the panel has; a profile names
+            # its third colour, the environment offers both.
+            colour = profile.colour if profile is not None else None
+            if colour != "bwy":
+                self.RED = (255, 0, 0)
+            if colour != "bwr":
+                self.YELLOW = (255, 255, 0)
         self.rotation = int(os.getenv("screen_rotation", "90"))
+        self.frame_changes = FrameChangeTracker()
+        # Set by the DisplayManager so published frames carry render times.
+        self.render_lock: RenderLock | None = None
 
     def init(self):
         return None
@@ -56,18 +75,47 @@ class PublicationDisplay:
     def _publish_render_buffer(self, image):
         if not isinstance(image, Image.Image):
             raise TypeError("server display buffers must be PIL images")
-        frame = image.rotate(-self.rotation, expand=True)
+        frame = image
+        if frame.size != (FRAME_WIDTH, FRAME_HEIGHT):
+            # Buffers from callers that still rotate into panel orientation.
+            frame = rotate_frame(image, -self.rotation)
         if frame.size != (FRAME_WIDTH, FRAME_HEIGHT):
             raise ValueError(
                 f"renderer produced {frame.size}, expected {(FRAME_WIDTH, FRAME_HEIGHT)}"
             )
-        snapshot = self.publisher.publish(frame)
+        diff = self.frame_changes.observe(frame)
+        try:
+            # Identical frames keep their sequence and only refresh the
+            # publication time, so clients see them as fresh 304s.
+            snapshot = self.publisher.publish(
+                frame,
+                screen=self.frame_changes.screen,
+                render_seconds=(
+                    self.render_lock.held_seconds() if self.render_lock else None
+                ),
+            )
+        except Exception:
+            self.frame_changes.reset()
+            raise
+        if diff.unchanged:
+            logger.debug(
+                "Refreshed unchanged display frame sequence=%s",
+                snapshot.metadata.sequence,
+            )
+            return
         logger.info(
-            "Published display frame sequence=%s sha256=%s",
+            "Published display frame sequence=%s sha256=%s changed=%.1f%% boxes=%s",
             snapshot.metadata.sequence,
             snapshot.metadata.sha256[:12],
+            diff.changed_ratio * 100,
+            list(diff.boxes),
         )
 
+    def attribute_frame(self, screen: str | None, owner: str | None = None) -> None:
+        """Record which screen and arbiter owner rendered the latest frame."""
+        if self.publisher.history is not None:
+            self.publisher.history.attribute(screen, owner)
+
     def display(self, image):
         self._publish_render_buffer(image)
 
@@ -0,0 +1,101 @@
+"""Display lock that records how long each holder keeps it."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class RenderLock:
+    """The display lock, remembering when its current holder acquired it.
+
+    Renders draw and publish while holding the lock, so the holder's time
+    under it is how long the frame being published took to render. Hold times
+    are recorded for ``stats``; a hold longer than ``warn_after_seconds`` is
+    logged with the holder's thread name, since it stalls every other
+    renderer and override.
+    """
+
+    RECENT_HOLDS = 256
+
+    def __init__(
+        self, clock=time.monotonic, warn_after_seconds: float | None = None
+    ) -> None:
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.warn_after_seconds = warn_after_seconds
+        self._holder: int | None = None
+        self._acquired_at: float | None = None
+        self._stats_lock = threading.Lock()
+        self._recent: deque[float] = deque(maxlen=self.RECENT_HOLDS)
+        self._acquisitions = 0
+        self._held_total = 0.0
+        self._held_max = 0.0
+        self._longest_holder: str | None = None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if not self._lock.acquire(blocking, timeout):
+            return False
+        self._holder = threading.get_ident()
+        self._acquired_at = self._clock()
+        return True
+
+    def release(self) -> None:
+        held = self._clock() - self._acquired_at
+        holder = threading.current_thread().name
+        with self._stats_lock:
+            self._acquisitions += 1
+            self._held_total += held
+            self._recent.append(held)
+            if held > self._held_max:
+                self._held_max = held
+                self._longest_holder = holder
+        self._holder = None
+        self._acquired_at = None
+        self._lock.release()
+        if self.warn_after_seconds is not None and held > self.warn_after_seconds:
+            logger.warning("%s held the display lock for %.2fs", holder, held)
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def held_seconds(self) -> float | None:
+        """Seconds the calling thread has held the lock; None if it does not."""
+        acquired_at = self._acquired_at
+        if self._holder != threading.get_ident() or acquired_at is None:
+            return None
+        return self._clock() - acquired_at
+
+    def stats(self) -> dict:
+        """Hold times in seconds; percentiles cover the most recent holds."""
+        with self._stats_lock:
+            recent = sorted(self._recent)
+            acquisitions = self._acquisitions
+            held_total = self._held_total
+            held_max = self._held_max
+            longest_holder = self._longest_holder
+
+        def percentile(fraction: float) -> float | None:
+            if not recent:
+                return None
+            index = max(0, min(len(recent) - 1, round(fraction * len(recent)) - 1))
+            return round(recent[index], 4)
+
+        return {
+            "acquisitions": acquisitions,
+            "held_seconds_total": round(held_total, 3),
+            "held_seconds_p50": percentile(0.50),
+            "held_seconds_p99": percentile(0.99),
+            "held_seconds_max": round(held_max, 4),
+            "longest_holder": longest_holder,
+        }
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
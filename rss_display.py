@@ -9,8 +9,9 @@ from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
 from display_adapter import return_display_lock
-from font_utils import get_font_paths
-from text_layout import fit_wrapped_text
+from font_utils import get_font, get_font_paths
+from panel_orientation import panel_frame
+from text_layout import ellipsize, fit_wrapped_text, text_width
 
 display_lock = return_display_lock()
 DISPLAY_SCREEN_ROTATION = int(os.getenv("screen_rotation", "90"))
@@ -18,13 +19,12 @@ DISPLAY_SCREEN_ROTATION = int(os.getenv("screen_rotation", "90"))
 
 @lru_cache(maxsize=1)
 def _fonts():
-    paths = get_font_paths()
     try:
         return (
-            ImageFont.truetype(paths["dejavu_bold"], 12),
-            ImageFont.truetype(paths["dejavu_bold"], 14),
-            ImageFont.truetype(paths["dejavu"], 11),
-            ImageFont.truetype(paths["dejavu"], 9),
+            get_font("dejavu_bold", 12),
+            get_font("dejavu_bold", 14),
+            get_font("dejavu", 11),
+            get_font("dejavu", 9),
         )
     except OSError:
         fallback = ImageFont.load_default()
@@ -32,12 +32,7 @@ def _fonts():
 
 
 def _ellipsize(draw, text, font, width):
-    text = " ".join(text.split())
-    if draw.textbbox((0, 0), text, font=font)[2] <= width:
-        return text
-    while text and draw.textbbox((0, 0), text + "…", font=font)[2] > width:
-        text = text[:-1]
-    return text.rstrip() + "…"
+    return ellipsize(draw, text, font, width)
 
 
 def _wrap(draw, text, font, width, lines):
@@ -47,7 +42,7 @@ def _wrap(draw, text, font, width, lines):
         line = ""
         while words:
             candidate = f"{line} {words[0]}".strip()
-            if line and draw.textbbox((0, 0), candidate, font=font)[2] > width:
+            if line and text_width(draw, candidate, font) > width:
                 break
             line = candidate
             words.pop(0)
@@ -59,7 +54,7 @@ def _wrap(draw, text, font, width, lines):
 
 
 def _finish(epd, image, set_base_image):
-    image = image.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    image = panel_frame(epd, image, DISPLAY_SCREEN_ROTATION)
     with display_lock:
         buffer = epd.getbuffer(image)
         if hasattr(epd, "displayPartial"):
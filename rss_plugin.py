@@ -65,6 +65,7 @@ class RSSPlugin:
 
     def stop(self):
         self._stop_event.set()
+        self.arbiter.interrupt_waiters()
         if self._thread:
             self._thread.join(timeout=1.0)
             if not self._thread.is_alive():
@@ -73,6 +74,7 @@ class RSSPlugin:
 
     def _run(self):
         next_poll = 0.0
+        generation = self.arbiter.generation
         while not self._stop_event.is_set():
             now = self.clock()
             if now >= next_poll:
@@ -81,9 +83,24 @@ class RSSPlugin:
                 except Exception as exc:
                     logger.warning("RSS watcher update failed (%s)", type(exc).__name__)
                 next_poll = now + self.poll_seconds
-            if not self._stop_event.is_set():
-                self.tick(now)
-            self._stop_event.wait(1.0)
+            if self._stop_event.is_set():
+                break
+            self.tick(now)
+            generation = self.arbiter.wait_for_change(
+                generation, self._seconds_until_due(next_poll)
+            )
+
+    def _seconds_until_due(self, next_poll):
+        """Sleep until the next feed poll or the end of the shown entry.
+
+        While the entry waits behind another owner, that owner's release or
+        expiry wakes the loop instead.
+        """
+        now = self.clock()
+        due = next_poll
+        if self._active_until is not None:
+            due = min(due, self._active_until)
+        return max(0.0, due - now)
 
     def add_entries(self, entries):
         known = {entry.key for entry in self._queue}
@@ -5,15 +5,21 @@ the screen for a bounded amount of time and may be pre-empted by a higher
 priority claim. An exclusive winning claim stays in control until it is
 released or expires, which gives urgent screens a safe lock without allowing a
 plugin failure to hold the display forever.
+
+Claims live in a priority heap and an expiry heap, so choosing the owner and
+pruning expired claims cost the same with five claimants as with five hundred.
+Plugin loops block in ``wait_for_change`` until ownership changes or a claim
+expires instead of polling ``active_owner`` on a timer.
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
 import threading
 import time
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +42,27 @@ class ScreenArbiter:
         self._current_owner: Optional[str] = None
         self._sequence = 0
         self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        # Both heaps are lazy: an entry that no longer matches its owner's
+        # claim is stale and dropped when it reaches the top.
+        self._by_priority: List[Tuple[int, int, str]] = []
+        self._expiries: List[Tuple[float, str]] = []
+        # Bumped on every ownership change and claim expiry.
+        self._generation = 0
+        self._interrupts = 0
+        self._listeners: List[Callable[[Optional[str], Optional[str]], None]] = []
+
+    def add_listener(
+        self, listener: Callable[[Optional[str], Optional[str]], None]
+    ) -> None:
+        """Call ``listener(previous, current)`` whenever ownership changes.
+
+        Listeners run on the thread that caused the change, with the arbiter
+        lock held, so they must be quick and must not block.
+        """
+
+        with self._lock:
+            self._listeners.append(listener)
 
     def claim(
         self,
@@ -61,13 +88,18 @@ class ScreenArbiter:
             else:
                 self._sequence += 1
                 sequence = self._sequence
-            self._claims[owner] = ScreenClaim(
+            claim = ScreenClaim(
                 owner=owner,
                 priority=int(priority),
                 expires_at=self._clock() + float(ttl_seconds),
                 exclusive=exclusive,
                 sequence=sequence,
             )
+            self._claims[owner] = claim
+            if existing is None or existing.priority != claim.priority:
+                heapq.heappush(self._by_priority, (-claim.priority, sequence, owner))
+            heapq.heappush(self._expiries, (claim.expires_at, owner))
+            self._compact()
             previous = self._current_owner
             self._select_owner()
             self._log_transition(previous)
@@ -81,6 +113,7 @@ class ScreenArbiter:
             was_active = self._current_owner == owner
             previous = self._current_owner
             self._claims.pop(owner, None)
+            self._compact()
             if was_active:
                 self._current_owner = None
             self._select_owner()
@@ -112,38 +145,139 @@ class ScreenArbiter:
             self._prune_expired()
             return self._claims.get(owner)
 
+    def seconds_until_next_expiry(self) -> Optional[float]:
+        """Return when the earliest claim lapses, or ``None`` without claims."""
+
+        with self._lock:
+            earliest = self._next_expiry()
+            if earliest is None:
+                return None
+            return max(0.0, earliest - self._clock())
+
+    @property
+    def generation(self) -> int:
+        """A counter that moves on every ownership change and claim expiry."""
+
+        with self._lock:
+            return self._generation
+
+    def wait_for_change(
+        self, generation: int, timeout: Optional[float] = None
+    ) -> int:
+        """Block until the arbiter moves past ``generation`` and return the new one.
+
+        Claim expiries are noticed on time without anyone calling into the
+        arbiter. Returns the unchanged generation when ``timeout`` passes or
+        ``interrupt_waiters`` is called. Both are measured on the arbiter's
+        clock, so a waiter only wakes on time if that clock keeps pace with
+        real seconds.
+        """
+
+        give_up = None if timeout is None else self._clock() + timeout
+        with self._lock:
+            interrupts = self._interrupts
+            while True:
+                previous = self._current_owner
+                self._prune_expired()
+                self._select_owner()
+                self._log_transition(previous)
+                if self._generation != generation or self._interrupts != interrupts:
+                    return self._generation
+                delays = []
+                if give_up is not None:
+                    delays.append(give_up - self._clock())
+                    if delays[-1] <= 0:
+                        return self._generation
+                earliest = self._next_expiry()
+                if earliest is not None:
+                    delays.append(max(0.001, earliest - self._clock()))
+                self._changed.wait(min(delays) if delays else None)
+
+    def interrupt_waiters(self) -> None:
+        """Return every pending ``wait_for_change``, e.g. so a plugin can stop."""
+
+        with self._lock:
+            self._interrupts += 1
+            self._changed.notify_all()
+
+    def _next_expiry(self) -> Optional[float]:
+        while self._expiries:
+            expires_at, owner = self._expiries[0]
+            claim = self._claims.get(owner)
+            if claim and claim.expires_at == expires_at:
+                return expires_at
+            heapq.heappop(self._expiries)
+        return None
+
     def _prune_expired(self) -> None:
         now = self._clock()
-        expired = [
-            owner for owner, claim in self._claims.items() if claim.expires_at <= now
-        ]
-        for owner in expired:
-            self._claims.pop(owner, None)
+        expired = False
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, owner = heapq.heappop(self._expiries)
+            claim = self._claims.get(owner)
+            if claim is None or claim.expires_at != expires_at:
+                continue
+            del self._claims[owner]
+            expired = True
             if self._current_owner == owner:
                 self._current_owner = None
+        if expired:
+            self._generation += 1
+            self._changed.notify_all()
+
+    def _compact(self) -> None:
+        # Refreshed claims leave stale entries behind; rebuild once they
+        # dominate so the heaps stay proportional to the live claims.
+        limit = 2 * len(self._claims) + 32
+        if len(self._expiries) > limit:
+            self._expiries = [
+                (claim.expires_at, owner) for owner, claim in self._claims.items()
+            ]
+            heapq.heapify(self._expiries)
+        if len(self._by_priority) > limit:
+            self._by_priority = [
+                (-claim.priority, claim.sequence, owner)
+                for owner, claim in self._claims.items()
+            ]
+            heapq.heapify(self._by_priority)
+
+    def _top_claim(self) -> Optional[ScreenClaim]:
+        while self._by_priority:
+            negative_priority, sequence, owner = self._by_priority[0]
+            claim = self._claims.get(owner)
+            if (
+                claim
+                and claim.priority == -negative_priority
+                and claim.sequence == sequence
+            ):
+                return claim
+            heapq.heappop(self._by_priority)
+        return None
 
     def _select_owner(self) -> None:
         current = self._claims.get(self._current_owner or "")
         if current and current.exclusive:
             return
-        if not self._claims:
+        # The older claim wins among the highest priority, preventing
+        # same-priority plugins from flickering, but existing ownership wins
+        # an equal-priority tie.
+        top = self._top_claim()
+        if top is None:
             self._current_owner = None
-            return
-        # Existing ownership wins an equal-priority tie. Otherwise the older
-        # claim wins, preventing same-priority plugins from flickering.
-        self._current_owner = min(
-            self._claims.values(),
-            key=lambda claim: (
-                -claim.priority,
-                0 if claim.owner == self._current_owner else 1,
-                claim.sequence,
-            ),
-        ).owner
+        elif not current or current.priority != top.priority:
+            self._current_owner = top.owner
 
     def _log_transition(self, previous: Optional[str]) -> None:
         if previous != self._current_owner:
+            self._generation += 1
+            self._changed.notify_all()
             logger.info(
                 "Screen ownership changed: %s -> %s",
                 previous or "base",
                 self._current_owner or "base",
             )
+            for listener in self._listeners:
+                try:
+                    listener(previous, self._current_owner)
+                except Exception:
+                    logger.exception("Screen ownership listener failed")
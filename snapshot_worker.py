@@ -0,0 +1,96 @@
+"""Refresh slow data sources in the background so renders never wait on them."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotWorker:
+    """Call a source's ``refresh`` on its own thread every ``interval_seconds``.
+
+    The source keeps the result (``TokenUsageClient`` and ``YnabBudgetClient``
+    remember their last snapshot), and render paths read it back with
+    ``cached_snapshot()`` under the display lock. A slow or unreachable
+    endpoint then only delays this thread, never a render or an override.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        refresh: Callable[[], Any],
+        *,
+        interval_seconds: float,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._refresh = refresh
+        self.interval_seconds = max(5.0, float(interval_seconds))
+        self._monotonic = monotonic
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_refresh_seconds: Optional[float] = None
+
+    def refresh(self) -> None:
+        """Refresh once on the calling thread; failures are logged, not raised."""
+        started = self._monotonic()
+        try:
+            self._refresh()
+        except Exception as exc:
+            self.failures += 1
+            logger.warning("%s refresh failed (%s)", self.name, type(exc).__name__)
+        finally:
+            self.refreshes += 1
+            self.last_refresh_seconds = self._monotonic() - started
+
+    def start(self, runtime=None) -> None:
+        """Refresh on a thread of its own, or as a task of an ``IoRuntime``."""
+        if runtime is not None:
+            if self._task is None or not self._task.running():
+                self._task = runtime.every(
+                    f"snapshot-{self.name}",
+                    self.refresh,
+                    self.interval_seconds,
+                    initial_delay=self.interval_seconds,
+                )
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"SnapshotWorker-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            if not self._thread.is_alive():
+                self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.refresh()
+
+    def stats(self) -> dict:
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_refresh_seconds": (
+                None
+                if self.last_refresh_seconds is None
+                else round(self.last_refresh_seconds, 3)
+            ),
+            "interval_seconds": self.interval_seconds,
+        }
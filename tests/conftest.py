@@ -8,8 +8,70 @@ import tempfile
 # Keep imports such as log_config and dotenv away from a developer's real home.
 TEST_HOME = Path(tempfile.mkdtemp(prefix="rpi-waiting-time-display-tests-"))
 os.environ["HOME"] = str(TEST_HOME)
+os.environ.setdefault("weather_icon_cache_dir", str(TEST_HOME / "icon-cache"))
 atexit.register(shutil.rmtree, TEST_HOME, ignore_errors=True)
 
+
+class FlaskResponse:
+    """A Flask test response dressed up as a streamed requests response."""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = response.data
+
+    def raise_for_status(self):
+        assert self.status_code < 400
+
+    def iter_content(self, chunk_size):
+        yield self.content
+
+    def close(self):
+        return None
+
+
+class FlaskSession:
+    """Routes FrameClient requests to a Flask test client and records the URLs.
+
+    ``tamper`` may rewrite the body of every binary frame the server sends.
+    """
+
+    def __init__(self, client, tamper=None):
+        self.client = client
+        self.tamper = tamper
+        self.urls = []
+
+    def get(self, url, headers, timeout, stream):
+        self.urls.append(url)
+        response = FlaskResponse(self.client.get(url, headers=headers))
+        if self.tamper and url.startswith("/api/v1/frame.bin"):
+            response.content = self.tamper(response.content)
+        return response
+
+
+class PackedPanel:
+    """A 122x250 B&W panel that takes packed frames and records each write."""
+
+    width = 122
+    height = 250
+    accepts_packed_frames = True
+
+    def __init__(self):
+        self.buffers = []
+
+    def getbuffer(self, frame):
+        from packed_frame import PackedFrame
+
+        assert isinstance(frame, PackedFrame)
+        return bytearray(frame.data)
+
+    def displayPartBaseImage(self, buffer):
+        self.buffers.append(bytes(buffer))
+
+    def displayPartial(self, buffer):
+        self.buffers.append(bytes(buffer))
+
+
 @pytest.fixture
 def mock_env_vars():
     """Provide test environment variables"""
@@ -39,3 +101,13 @@ def sample_bus_response():
         },
         'name': 'Test Stop'
     }
+
+@pytest.fixture
+def flask_session():
+    """Build FlaskSessions: ``flask_session(app.test_client(), tamper=None)``."""
+    return FlaskSession
+
+@pytest.fixture
+def packed_panel():
+    """Provide a panel that accepts packed frames"""
+    return PackedPanel()
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+
+import pytest
+from PIL import Image, ImageDraw
+
+from binary_frame import (
+    BINARY_CONTENT_TYPE,
+    ENCODING_RAW,
+    ENCODING_XOR_RLE,
+    HEADER_SIZE,
+    FrameFormatError,
+    decode_frame,
+    decode_header,
+    encode_frame,
+)
+from display_client import FrameClient
+from display_protocol import FramePublisher
+from display_server import create_app
+from packed_frame import pack_for_panel
+
+NOW = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _countdown(minutes):
+    image = Image.new("1", (250, 120), 1)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, 249, 22), fill=0)
+    draw.text((10, 40), "Line 12  Central", fill=0)
+    draw.text((200, 40), f"{minutes} min", fill=0)
+    return image
+
+
+def _packed(minutes):
+    return pack_for_panel(_countdown(minutes), 122, 250, 90)
+
+
+def test_delta_frames_are_small_and_rebuild_the_exact_frame():
+    base, frame = _packed(5), _packed(4)
+
+    raw = encode_frame(frame, 7)
+    delta = encode_frame(frame, 7, base=base, base_sequence=6)
+
+    assert decode_header(raw).encoding == ENCODING_RAW
+    assert decode_header(delta).encoding == ENCODING_XOR_RLE
+    assert len(delta) - HEADER_SIZE < len(frame.data) // 10
+    assert decode_frame(raw)[1] == frame
+    header, rebuilt = decode_frame(delta, base=base, base_sequence=6)
+    assert (header.sequence, header.base_sequence) == (7, 6)
+    assert rebuilt == frame
+    # An unchanged frame is an empty delta.
+    assert len(encode_frame(base, 8, base=base, base_sequence=6)) == HEADER_SIZE
+
+
+def test_corrupt_frames_and_foreign_bases_are_rejected():
+    base, frame = _packed(5), _packed(4)
+    delta = encode_frame(frame, 7, base=base, base_sequence=6)
+    flipped = bytearray(delta)
+    flipped[-1] ^= 0x01
+
+    rejected = [
+        (delta[:HEADER_SIZE - 1], {}, "shorter than its header"),
+        (b"XXXX" + delta[4:], {}, "unsupported"),
+        (delta[:-1], {"base": base, "base_sequence": 6}, "length"),
+        (bytes(flipped), {"base": base, "base_sequence": 6}, "digest"),
+        (delta, {"base": base, "base_sequence": 5}, "held base"),
+        (delta, {"base": _packed(3), "base_sequence": 6}, "digest"),
+        (delta, {}, "held base"),
+    ]
+    for content, kwargs, message in rejected:
+        with pytest.raises(FrameFormatError, match=message):
+            decode_frame(content, **kwargs)
+
+
+def _client(tmp_path, flask_session, panel, tamper=None):
+    publisher = FramePublisher(tmp_path, clock=lambda: NOW)
+    publisher.publish(_countdown(5))
+    session = flask_session(create_app(publisher).test_client(), tamper)
+    client = FrameClient(
+        panel, url="/api/v1/frame.png", session=session, clock=lambda: NOW
+    )
+    return publisher, session, panel, client
+
+
+def test_client_applies_server_deltas_against_the_frame_it_holds(
+    tmp_path, flask_session, packed_panel
+):
+    publisher, session, panel, client = _client(tmp_path, flask_session, packed_panel)
+
+    assert client.poll_once().status == "displayed"
+    publisher.publish(_countdown(4))
+    assert client.poll_once().status == "displayed"
+    assert client.poll_once().status == "not-modified"
+
+    assert session.urls == [
+        "/api/v1/frame.bin",
+        "/api/v1/frame.bin?base=1",
+        "/api/v1/frame.bin?base=2",
+    ]
+    assert client.delta_frames == 1
+    assert panel.buffers == [_packed(5).data, _packed(4).data]
+    unsupported = session.client.get(
+        "/api/v1/frame.bin", headers={"Accept": "image/png"}
+    )
+    assert unsupported.status_code == 406
+    assert BINARY_CONTENT_TYPE not in unsupported.content_type
+
+
+def test_client_falls_back_to_png_when_a_binary_frame_does_not_verify(
+    tmp_path, flask_session, packed_panel
+):
+    def corrupt(content):
+        tampered = bytearray(content)
+        tampered[-1] ^= 0x01
+        return bytes(tampered)
+
+    publisher, session, panel, client = _client(
+        tmp_path, flask_session, packed_panel, tamper=corrupt
+    )
+
+    assert client.poll_once().status == "displayed"
+    assert session.urls == ["/api/v1/frame.bin", "/api/v1/frame.png"]
+    assert panel.buffers == [_packed(5).data]
+    assert client.binary_failures == 1
+
+    for minutes in (4, 3):
+        publisher.publish(_countdown(minutes))
+        client.poll_once()
+    assert not client.binary_frames
+    publisher.publish(_countdown(2))
+    client.poll_once()
+    assert session.urls[-1] == "/api/v1/frame.png"
+    assert panel.buffers[-1] == _packed(2).data
@@ -318,3 +318,23 @@ def test_default_agenda_ignores_non_string_base_mode(monkeypatch):
     plugin.tick(now, [_event(now, 120)])
 
     assert plugin.arbiter.active_owner() is None
+
+
+def test_idle_runtime_ticks_wait_for_the_next_calendar_deadline(monkeypatch):
+    plugin = _plugin(monkeypatch, [])
+    now = datetime(2026, 7, 11, 8, 5, tzinfo=TIMEZONE)
+
+    plugin.tick(now, [_event(now, 120)])
+    assert plugin._next_tick_seconds == 300  # the client's next refresh
+
+    plugin.refresh_seconds = 7200
+    plugin.tick(now, [_event(now, 70)])
+    assert plugin._next_tick_seconds == 600  # the event's lead window opens
+
+    plugin.tick(now, [_event(now, 180)])
+    assert plugin._next_tick_seconds == 1500  # the 08:30 agenda glance
+
+    plugin.tick(now.replace(minute=30), [_event(now, 180)])
+    assert plugin._next_tick_seconds == 1
+    plugin.tick(now, [_event(now, 30)])
+    assert plugin._next_tick_seconds == 1
@@ -0,0 +1,51 @@
+import pytest
+
+import color_utils
+from color_utils import find_optimal_colors, lookup_optimal_colors
+
+
+class _Display:
+    def __init__(self, has_red=False, has_yellow=False):
+        if has_red:
+            self.RED = (255, 0, 0)
+        if has_yellow:
+            self.YELLOW = (255, 255, 0)
+
+
+@pytest.mark.parametrize("has_red,has_yellow", [
+    (False, False), (True, False), (False, True), (True, True),
+])
+def test_lookup_matches_mixer_around_every_threshold(has_red, has_yellow):
+    display = _Display(has_red, has_yellow)
+    # Colours either side of the mixer's thresholds (r > 200, b < 100, ...).
+    edges = [0, 4, 5, 6, 99, 100, 101, 199, 200, 201, 249, 250, 251, 255]
+    colours = [(r, g, b) for r in edges for g in edges for b in edges]
+    colours += [(228, 31, 24), (201, 50, 50), (250, 250, 250), (131, 117, 160)]
+
+    for rgb in colours:
+        assert lookup_optimal_colors(rgb, display) == find_optimal_colors(
+            rgb, display
+        ), rgb
+
+
+def test_each_colour_is_mixed_once_per_capability(monkeypatch):
+    color_utils._exact_mix.cache_clear()
+    calls = []
+    original = color_utils.find_optimal_colors
+
+    def counting(pixel_rgb, epd):
+        calls.append((tuple(pixel_rgb), hasattr(epd, "RED")))
+        return original(pixel_rgb, epd)
+
+    monkeypatch.setattr(color_utils, "find_optimal_colors", counting)
+
+    for _ in range(3):
+        lookup_optimal_colors((201, 50, 50), _Display(has_red=True))
+        lookup_optimal_colors((201, 50, 50), _Display())
+    mix = lookup_optimal_colors((201, 50, 50), _Display(has_red=True))
+    mix.append(("black", 1.0))
+
+    assert calls == [((201, 50, 50), True), ((201, 50, 50), False)]
+    assert lookup_optimal_colors((201, 50, 50), _Display(has_red=True)) == original(
+        (201, 50, 50), _Display(has_red=True)
+    )
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from deadline_scheduler import DeadlineScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def test_due_deadlines_are_returned_together_and_reposting_moves_them():
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(clock)
+    scheduler.post("update", 90)
+    scheduler.post("prefetch", 80)
+    scheduler.post("flight-mode", 5)
+    scheduler.post("flight-mode", 60)
+    scheduler.post("claim-expiry", 30)
+    scheduler.cancel("claim-expiry")
+
+    assert scheduler.next_due_in() == 60
+    assert scheduler.wait(0) == set()
+    clock.advance(85)
+    assert scheduler.wait(0) == {"flight-mode", "prefetch"}
+    assert scheduler.next_due_in() == 5
+    clock.advance(5)
+    assert scheduler.wait(0) == {"update"}
+    assert scheduler.next_due_in() is None
+
+
+def test_events_wake_a_waiting_loop_immediately():
+    scheduler = DeadlineScheduler()
+    scheduler.post("update", 60)
+    threading.Timer(0.05, scheduler.notify, args=("screen-owner",)).start()
+
+    started = time.monotonic()
+    assert scheduler.wait(30) == {"screen-owner"}
+    assert time.monotonic() - started < 5
+    assert scheduler.wakeups == 1
+
+
+def test_stop_releases_the_waiter():
+    scheduler = DeadlineScheduler()
+    threading.Timer(0.05, scheduler.stop).start()
+
+    assert scheduler.wait() == set()
+    assert scheduler.stopped
+    assert scheduler.wait(30) == set()
@@ -129,7 +129,7 @@ def test_partial_wrappers_accept_waveshare_list_buffers(mock_import, monkeypatch
 
         def getbuffer(self, image):
             assert isinstance(image, Image.Image)
-            return [0xFF]
+            return [0xFF if image.getpixel((0, 0)) else 0x00]
 
         def displayPartial(self, image):
             self.partial_images.append(image)
@@ -144,9 +144,134 @@ def test_partial_wrappers_accept_waveshare_list_buffers(mock_import, monkeypatch
     )
 
     display = DisplayAdapter.get_display()
-    buffer = display.getbuffer(Image.new('1', (122, 250), 1))
-    display.displayPartBaseImage(buffer)
-    display.displayPartial(buffer)
+    display.displayPartBaseImage(display.getbuffer(Image.new('1', (122, 250), 1)))
+    display.displayPartial(display.getbuffer(Image.new('1', (122, 250), 0)))
 
     assert display.base_images == [[0xFF]]
-    assert display.partial_images == [[0xFF]]
+    assert display.partial_images == [[0x00]]
+
+
+@patch('display_adapter.importlib.import_module')
+def test_hardware_display_skips_identical_frames_until_panel_state_resets(mock_import, monkeypatch):
+    class FakeEPD:
+        BLACK = 0x00
+        WHITE = 0xFF
+
+        def __init__(self):
+            self.frames = []
+
+        def init(self):
+            return None
+
+        def Clear(self):
+            return None
+
+        def getbuffer(self, image):
+            return bytearray(image.tobytes())
+
+        def display(self, black, red=None):
+            self.frames.append((bytes(black), red))
+
+    monkeypatch.setenv('display_model', 'fake')
+    mock_import.return_value = SimpleNamespace(
+        EPD=FakeEPD,
+        epdconfig=SimpleNamespace(module_exit=lambda cleanup=True: None),
+    )
+    display = DisplayAdapter.get_display()
+    frame = display.getbuffer(Image.new('1', (122, 250), 1))
+
+    display.display(frame)
+    display.display(bytearray(frame))
+    display.display(frame, b'\x00')
+    display.Clear()
+    display.display(frame, b'\x00')
+
+    assert len(display.frames) == 3
+    assert display.frame_gate.stats() == {'writes': 3, 'skipped': 1}
+
+
+def test_frame_gate_always_reloads_the_partial_base_image():
+    from frame_gate import install_frame_gate
+
+    writes = []
+    epd = SimpleNamespace(
+        displayPartial=lambda buffer: writes.append(('partial', buffer)),
+        displayPartBaseImage=lambda buffer: writes.append(('base', buffer)),
+    )
+    gate = install_frame_gate(epd)
+
+    epd.displayPartial(b'\x01')
+    # A ghosting-driven base refresh of the frame already on the panel must
+    # still reach the driver so its base RAM matches.
+    epd.displayPartBaseImage(b'\x01')
+    epd.displayPartial(b'\x01')
+
+    assert writes == [('partial', b'\x01'), ('base', b'\x01')]
+    assert gate.stats() == {'writes': 2, 'skipped': 1}
+
+
+@patch('display_adapter.importlib.import_module')
+def test_hardware_getbuffer_rotates_logical_frames_once(mock_import, monkeypatch):
+    from panel_orientation import panel_frame
+
+    class FakeEPD:
+        BLACK = 0x00
+        WHITE = 0xFF
+        width = 122
+        height = 250
+
+        def __init__(self):
+            self.sizes = []
+
+        def init(self):
+            return None
+
+        def getbuffer(self, image):
+            self.sizes.append(image.size)
+            return bytearray(image.tobytes())
+
+    monkeypatch.setenv('display_model', 'fake')
+    monkeypatch.setattr('display_adapter.DISPLAY_SCREEN_ROTATION', 90)
+    mock_import.return_value = SimpleNamespace(
+        EPD=FakeEPD,
+        epdconfig=SimpleNamespace(module_exit=lambda cleanup=True: None),
+    )
+    display = DisplayAdapter.get_display()
+    frame = Image.new('1', (display.height, display.width), 1)
+
+    assert panel_frame(display, frame) is frame
+    display.getbuffer(frame)
+
+    assert display.sizes == [(122, 250)]
+    assert panel_frame(SimpleNamespace(), frame, 90).size == (122, 250)
+
+
+@patch('display_adapter.importlib.import_module')
+def test_display_client_panels_skip_the_adapter_frame_tracker(mock_import, monkeypatch):
+    class FakeEPD:
+        BLACK = 0x00
+        WHITE = 0xFF
+
+        def init(self):
+            return None
+
+        def getbuffer(self, image):
+            return bytearray(image.tobytes())
+
+        def displayPartial(self, buffer):
+            return None
+
+    monkeypatch.setenv('display_model', 'fake')
+    mock_import.return_value = SimpleNamespace(
+        EPD=FakeEPD,
+        epdconfig=SimpleNamespace(module_exit=lambda cleanup=True: None),
+    )
+
+    tracked = DisplayAdapter.get_display()
+    untracked = DisplayAdapter.get_display(track_frames=False)
+
+    assert hasattr(tracked, 'frame_changes') and hasattr(tracked, 'ghosting')
+    assert not hasattr(untracked, 'frame_changes')
+    assert not hasattr(untracked, 'ghosting')
+    untracked.displayPartial(untracked.getbuffer(Image.new('1', (122, 250), 1)))
+    assert untracked.frame_gate.stats()['writes'] == 1
@@ -3,6 +3,7 @@ import io
 import json
 import socket
 import tempfile
+import threading
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -14,6 +15,7 @@ from display_client import (
     FrameClient,
     HealthReporter,
     OutageDiagnosticController,
+    PanelWriter,
     SystemdNotifier,
     bounded_env_seconds,
     build_diagnostic_view,
@@ -24,9 +26,12 @@ from display_client import (
 NOW = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
 
 
-def png_bytes():
+def png_bytes(marker=None):
     output = io.BytesIO()
-    Image.new("1", (250, 120), 1).save(output, "PNG")
+    image = Image.new("1", (250, 120), 1)
+    if marker is not None:
+        image.putpixel((marker, 0), 0)
+    image.save(output, "PNG")
     return output.getvalue()
 
 
@@ -161,6 +166,54 @@ def test_client_padding_preserves_multiband_image_mode():
     assert display.base[0].getpixel((121, 249)) == (255, 255, 255)
 
 
+def test_client_pads_logical_frame_for_displays_that_rotate_themselves():
+    display = FakeDisplay()
+    display.width = 122
+    display.height = 250
+    display.accepts_logical_frames = True
+    client = FrameClient(display, url="http://server/api/v1/frame.png")
+    frame = Image.new("1", (250, 120), 0)
+
+    client._display(frame)
+
+    assert display.base[0].size == (250, 122)
+    assert display.base[0].getpixel((0, 0)) == 1
+    assert display.base[0].getpixel((0, 1)) == 0
+    assert display.base[0].getpixel((249, 121)) == 1
+
+
+def test_client_long_polls_only_after_the_server_advertises_it():
+    advertised = frame_response(sequence=2, content=png_bytes(1))
+    advertised.headers["X-Display-Long-Poll"] = "30"
+    not_modified = FakeResponse(
+        status=304,
+        headers={"X-Display-Published-At": NOW.isoformat()},
+    )
+    session = FakeSession([frame_response(), advertised, not_modified])
+    client = FrameClient(
+        FakeDisplay(),
+        url="http://server/api/v1/frame.png",
+        session=session,
+        clock=lambda: NOW,
+        timeout_seconds=5,
+        long_poll_seconds=20,
+    )
+
+    client.poll_once()
+    assert not client.long_polling
+    client.poll_once()
+    assert client.long_polling
+    client.poll_once()
+
+    assert [call[0] for call in session.calls] == [
+        "http://server/api/v1/frame.png",
+        "http://server/api/v1/frame.png",
+        "http://server/api/v1/frame.png?after=2&wait=20",
+    ]
+    assert session.calls[2][2] == 25
+    assert not client.long_polling
+
+
 def test_client_rejects_not_modified_before_first_frame():
     response = FakeResponse(
         status=304,
@@ -228,7 +281,11 @@ def test_client_accepts_newer_frame_epoch_after_server_sequence_reset():
     session = FakeSession(
         [
             frame_response(sequence=10, created_at=NOW),
-            frame_response(sequence=1, created_at=NOW + timedelta(seconds=1)),
+            frame_response(
+                sequence=1,
+                created_at=NOW + timedelta(seconds=1),
+                content=png_bytes(1),
+            ),
         ]
     )
     client = FrameClient(
@@ -248,8 +305,16 @@ def test_client_periodically_uses_full_base_refresh(monkeypatch):
     session = FakeSession(
         [
             frame_response(sequence=1, created_at=NOW),
-            frame_response(sequence=2, created_at=NOW + timedelta(seconds=1)),
-            frame_response(sequence=3, created_at=NOW + timedelta(seconds=2)),
+            frame_response(
+                sequence=2,
+                created_at=NOW + timedelta(seconds=1),
+                content=png_bytes(2),
+            ),
+            frame_response(
+                sequence=3,
+                created_at=NOW + timedelta(seconds=2),
+                content=png_bytes(3),
+            ),
         ]
     )
     client = FrameClient(
@@ -333,7 +398,7 @@ def test_outage_diagnostic_hard_limits_category_changes_to_low_cadence():
         threshold_seconds=300,
         cadence_seconds=60,
         monotonic_clock=monotonic,
-        local_clock=lambda: NOW,
+        local_clock=lambda: NOW + timedelta(seconds=monotonic.value),
     )
 
     diagnostic.record_failure(requests.Timeout())
@@ -577,3 +642,166 @@ def test_systemd_notifier_writes_to_notify_socket():
             assert receiver.recv(1024) == b"READY=1\nWATCHDOG=1"
         finally:
             receiver.close()
+
+
+def test_client_skips_unchanged_frames_and_base_refreshes_large_changes(monkeypatch):
+    monkeypatch.setenv("display_client_base_refresh_change_ratio", "0.5")
+    inverted = io.BytesIO()
+    Image.new("1", (250, 120), 0).save(inverted, "PNG")
+    display = FakeDisplay()
+    session = FakeSession(
+        [
+            frame_response(sequence=1, created_at=NOW),
+            frame_response(sequence=2, created_at=NOW + timedelta(seconds=1)),
+            frame_response(
+                sequence=3,
+                created_at=NOW + timedelta(seconds=2),
+                content=png_bytes(5),
+            ),
+            frame_response(
+                sequence=4,
+                created_at=NOW + timedelta(seconds=3),
+                content=inverted.getvalue(),
+            ),
+        ]
+    )
+    client = FrameClient(
+        display,
+        url="http://server/frame.png",
+        session=session,
+        clock=lambda: NOW + timedelta(seconds=3),
+    )
+
+    for _ in range(4):
+        assert client.poll_once().status == "displayed"
+
+    assert len(display.base) == 2
+    assert len(display.partial) == 1
+    assert client.frame_changes.stats()["unknown"]["unchanged"] == 1
+
+
+def test_client_base_refreshes_when_ghosting_budget_is_spent(monkeypatch):
+    monkeypatch.setenv("display_client_full_refresh_every", "0")
+    monkeypatch.setenv("refresh_ghosting_pixel_limit", "2")
+    monkeypatch.setenv("refresh_ghosting_budget", "0")
+    display = FakeDisplay()
+    session = FakeSession(
+        [
+            frame_response(
+                sequence=sequence,
+                created_at=NOW + timedelta(seconds=sequence),
+                content=png_bytes(None if sequence % 2 else 0),
+            )
+            for sequence in range(1, 6)
+        ]
+    )
+    client = FrameClient(
+        display,
+        url="http://server/frame.png",
+        session=session,
+        clock=lambda: NOW + timedelta(seconds=5),
+    )
+
+    for _ in range(5):
+        client.poll_once()
+
+    # Two partial flips of the same pixel spend the budget; the next frame
+    # is written as a base image and the wear starts over.
+    assert len(display.base) == 2
+    assert len(display.partial) == 3
+    assert client.ghosting.stats()["full_refreshes"] == 2
+
+
+class SlowDisplay(FakeDisplay):
+    """A panel whose base-image writes block until the test releases them."""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+        self.fail_next = False
+
+    def displayPartBaseImage(self, image):
+        self.writing.set()
+        assert self.release.wait(5)
+        if self.fail_next:
+            self.fail_next = False
+            raise OSError("SPI write failed")
+        super().displayPartBaseImage(image)
+
+
+def test_panel_writer_drops_frames_that_wait_behind_a_slow_write():
+    written = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def write(frame):
+        started.set()
+        assert release.wait(5)
+        written.append(frame)
+
+    writer = PanelWriter(write).start()
+    writer.submit(1)
+    assert started.wait(5)
+    assert writer.busy_seconds() > 0
+    for frame in (2, 3, 4):
+        writer.submit(frame)
+    release.set()
+    assert writer.wait_idle(5)
+    writer.stop(5)
+
+    assert written == [1, 4]
+    assert writer.stats() == {"busy_seconds": 0.0, "written": 2, "dropped": 2}
+
+
+def test_pipelined_client_keeps_polling_while_the_panel_is_busy():
+    display = SlowDisplay()
+    session = FakeSession(
+        [
+            frame_response(sequence=1),
+            frame_response(sequence=2, content=png_bytes(3)),
+            frame_response(sequence=3, content=png_bytes(4)),
+        ]
+    )
+    client = FrameClient(
+        display, url="http://server/frame.png", session=session, clock=lambda: NOW
+    )
+    writer = client.start_panel_writer()
+    try:
+        assert client.poll_once().status == "queued"
+        assert display.writing.wait(5)
+        # Both polls complete while the first base-image write is still running.
+        assert [client.poll_once().sequence for _ in range(2)] == [2, 3]
+        assert client.etag == '"3-etag"'
+        display.release.set()
+        assert writer.wait_idle(5)
+        assert writer.stats()["dropped"] == 1
+        # Frame 2 never reached the panel; frame 3 followed the first frame.
+        assert len(display.base) == len(display.partial) == 1
+        expected = client._panel_image(Image.open(io.BytesIO(png_bytes(4))))
+        assert display.partial[0].tobytes() == expected.convert("1").tobytes()
+    finally:
+        writer.stop(5)
+
+
+def test_pipelined_client_repaints_after_a_failed_panel_write():
+    display = SlowDisplay()
+    display.fail_next = True
+    display.release.set()
+    session = FakeSession(
+        [frame_response(sequence=1), frame_response(sequence=2, content=png_bytes(3))]
+    )
+    client = FrameClient(
+        display, url="http://server/frame.png", session=session, clock=lambda: NOW
+    )
+    writer = client.start_panel_writer()
+    try:
+        client.poll_once()
+        assert writer.wait_idle(5)
+        with pytest.raises(OSError, match="SPI"):
+            client.poll_once()
+        assert writer.wait_idle(5)
+        assert len(display.base) == 1
+        assert client.poll_once().sequence == 2
+    finally:
+        writer.stop(5)
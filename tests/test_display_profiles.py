@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from display_profiles import load_display_profiles
+
+
+def _write(tmp_path, document):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps(document))
+    return path
+
+
+def test_profiles_keep_environment_defaults_for_omitted_keys(tmp_path, monkeypatch):
+    monkeypatch.setenv("mock_display_type", "bwr")
+    hall, kitchen = load_display_profiles(
+        _write(
+            tmp_path,
+            {
+                "displays": [
+                    {"id": "hall", "stop": 8122, "lines": "71,N10", "colour": "BW"},
+                    {"id": "kitchen", "plugins": ["calendar"]},
+                ]
+            },
+        )
+    )
+
+    assert (hall.display_id, hall.stop, hall.lines) == ("hall", "8122", "71,N10")
+    assert hall.is_bw and hall.allows_plugin("home_assistant")
+    assert kitchen.colour is None and kitchen.stop is None
+    assert not kitchen.is_bw
+    assert kitchen.allows_plugin("calendar") and not kitchen.allows_plugin("rss")
+
+
+@pytest.mark.parametrize(
+    "displays, message",
+    [
+        ([], "non-empty"),
+        ([{"id": "Hall"}], "display ids"),
+        ([{"id": "hall"}, {"id": "hall"}], "unique"),
+        ([{"id": "hall", "rotation": 270}], "unknown display profile keys"),
+        ([{"id": "hall", "colour": "rgb"}], "colour"),
+        ([{"id": "hall", "plugins": ["weather"]}], "unknown plugins"),
+        ([{"id": "hall", "screen": "x"}], "unknown display profile keys"),
+    ],
+)
+def test_invalid_profiles_are_rejected(tmp_path, displays, message):
+    with pytest.raises(ValueError, match=message):
+        load_display_profiles(_write(tmp_path, {"displays": displays}))
+
+
+@pytest.mark.parametrize(
+    "colour, red, yellow",
+    [("bw", False, False), ("bwr", True, False), ("bwy", False, True)],
+)
+def test_profile_colour_sets_the_published_palette(tmp_path, colour, red, yellow):
+    from publication_display import PublicationDisplay
+
+    (profile,) = load_display_profiles(
+        _write(tmp_path, {"displays": [{"id": "hall", "colour": colour}]})
+    )
+    display = PublicationDisplay(object(), profile)
+
+    assert display.is_bw_display == (colour == "bw")
+    assert (hasattr(display, "RED"), hasattr(display, "YELLOW")) == (red, yellow)
@@ -1,9 +1,13 @@
 import hashlib
+import io
 import json
-from datetime import datetime, timezone
+import random
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageDraw
 
 from display_protocol import FramePublisher, validate_frame_bytes
 from publication_display import PublicationDisplay
@@ -38,6 +42,91 @@ def test_publisher_refuses_wrong_dimensions_and_invalid_png(tmp_path):
         validate_frame_bytes(b"not-an-image")
 
 
+def _png(image):
+    output = io.BytesIO()
+    image.save(output, "PNG")
+    return output.getvalue()
+
+
+def _chunk(kind, data):
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def _chunks(content):
+    offset, chunks = 8, []
+    while offset < len(content):
+        (length,) = struct.unpack_from(">I", content, offset)
+        kind = content[offset + 4 : offset + 8]
+        chunks.append((kind, content[offset + 8 : offset + 8 + length]))
+        offset += length + 12
+    return chunks
+
+
+def _rebuild(chunks):
+    return b"\x89PNG\r\n\x1a\n" + b"".join(_chunk(kind, data) for kind, data in chunks)
+
+
+def test_validation_decodes_once_into_a_detached_exact_image():
+    image = Image.new("1", (250, 120), 1)
+    ImageDraw.Draw(image).text((10, 40), "12 min", fill=0)
+
+    frame = validate_frame_bytes(_png(image))
+
+    assert (frame.format, frame.mode, frame.size) == ("PNG", "1", (250, 120))
+    assert frame.tobytes() == image.tobytes()
+    assert getattr(frame, "fp", None) is None
+
+
+def test_structurally_broken_pngs_are_rejected_before_decoding():
+    valid = _png(Image.new("1", (250, 120), 1))
+    chunks = _chunks(valid)
+    header, data = chunks[0][1], chunks[1][1]
+    wrong_size = struct.pack(">II", 120, 250) + header[8:]
+    rejected = [
+        (_rebuild([(b"IHDR", wrong_size), *chunks[1:]]), "got 120x250"),
+        (_rebuild([(b"IHDR", header + b"\x00"), *chunks[1:]]), "invalid"),
+        (_rebuild([chunks[0], (b"IHDR", header), *chunks[1:]]), "invalid"),
+        (_rebuild([chunks[0], chunks[-1]]), "invalid"),
+        (_rebuild(chunks[:-1]), "invalid"),
+        (valid + b"trailing", "invalid"),
+        # Well-formed chunks whose image data does not decompress or is short.
+        (_rebuild([chunks[0], (b"IDAT", b"\x00" * len(data)), chunks[-1]]), "invalid"),
+        (
+            _rebuild([chunks[0], (b"IDAT", zlib.compress(b"\x00" * 10)), chunks[-1]]),
+            "invalid",
+        ),
+    ]
+    for content, message in rejected:
+        with pytest.raises(ValueError, match=message):
+            validate_frame_bytes(content)
+
+
+def test_every_single_byte_corruption_and_truncation_is_rejected():
+    image = Image.new("RGB", (250, 120), (255, 255, 255))
+    ImageDraw.Draw(image).text((10, 40), "Line 71  4 min", fill=(255, 0, 0))
+    valid = _png(image)
+    fuzz = random.Random(21)
+
+    corrupted = [valid[:length] for length in range(len(valid))]
+    for position in range(len(valid)):
+        mutated = bytearray(valid)
+        mutated[position] ^= 1 << fuzz.randrange(8)
+        corrupted.append(bytes(mutated))
+    for _ in range(200):
+        position = fuzz.randrange(8, len(valid))
+        inserted = bytes([fuzz.randrange(256)])
+        corrupted.append(valid[:position] + inserted + valid[position:])
+
+    for content in corrupted:
+        with pytest.raises(ValueError):
+            validate_frame_bytes(content)
+
+
 def test_publication_display_rotates_renderer_buffer_to_250x120(tmp_path, monkeypatch):
     monkeypatch.setenv("screen_rotation", "90")
     publisher = FramePublisher(tmp_path, clock=lambda: NOW)
@@ -51,3 +140,64 @@ def test_publication_display_rotates_renderer_buffer_to_250x120(tmp_path, monkey
     assert frame.size == (250, 120)
     assert display.height == 250
     assert display.width == 120
+
+
+def test_publication_display_publishes_logical_frames_without_rotation(tmp_path):
+    publisher = FramePublisher(tmp_path, clock=lambda: NOW)
+    display = PublicationDisplay(publisher)
+    frame = Image.new("1", (display.height, display.width), 1)
+    frame.putpixel((249, 0), 0)
+
+    assert display.accepts_logical_frames
+    display.displayPartial(display.getbuffer(frame))
+
+    published = validate_frame_bytes(publisher.snapshot().content)
+    assert published.size == (250, 120)
+    assert published.getpixel((249, 0)) == 0
+
+
+def test_publication_display_does_not_republish_identical_frames(tmp_path):
+    clock = [NOW]
+    publisher = FramePublisher(tmp_path, clock=lambda: clock[0])
+    display = PublicationDisplay(publisher)
+    renderer_buffer = Image.new("1", (120, 250), 1)
+
+    display.displayPartBaseImage(renderer_buffer)
+    first = publisher.snapshot()
+    display.Clear()
+    clock[0] = NOW + timedelta(seconds=90)
+    display.displayPartial(renderer_buffer.copy())
+    refreshed = publisher.snapshot()
+    renderer_buffer.putpixel((0, 0), 0)
+    display.displayPartial(renderer_buffer)
+
+    assert (refreshed.etag, refreshed.content) == (first.etag, first.content)
+    assert refreshed.metadata.published_at == clock[0].isoformat()
+    assert publisher.snapshot().metadata.sequence == 2
+    stats = publisher.stats()
+    assert (stats["published"], stats["unchanged"]) == (2, 1)
+
+
+def test_coalesced_flushes_write_the_latest_frame_once_per_interval(tmp_path):
+    monotonic = [0.0]
+    publisher = FramePublisher(
+        tmp_path,
+        clock=lambda: NOW,
+        flush_interval_seconds=60,
+        monotonic=lambda: monotonic[0],
+    )
+    frames = [Image.new("1", (250, 120), 1) for _ in range(3)]
+    for index, frame in enumerate(frames):
+        frame.putpixel((index, 0), 0)
+
+    publisher.publish(frames[0])
+    monotonic[0] = 10.0
+    publisher.publish(frames[1])
+    latest = publisher.publish(frames[2])
+
+    assert latest.metadata.sequence == 3
+    assert json.loads((tmp_path / "latest.json").read_text())["sequence"] == 1
+    publisher.close()
+    assert json.loads((tmp_path / "latest.json").read_text())["sequence"] == 3
+    assert publisher.stats()["flushes"] == 2
+    assert FramePublisher(tmp_path).snapshot().etag == latest.etag
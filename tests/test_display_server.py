@@ -3,7 +3,7 @@ from datetime import datetime, timedelta, timezone
 from PIL import Image
 
 import display_server
-from display_protocol import FramePublisher
+from display_protocol import FrameChannels, FramePublisher
 from display_server import _validate_bind_security, create_app
 
 NOW = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
@@ -67,3 +67,96 @@ def test_non_loopback_bind_requires_token(monkeypatch):
         assert "token is required" in str(exc)
     else:
         raise AssertionError("insecure non-loopback bind was accepted")
+
+
+def test_long_poll_returns_when_the_next_frame_is_published(tmp_path):
+    import threading
+    import time
+
+    publisher = FramePublisher(tmp_path, clock=lambda: NOW)
+    publisher.publish(Image.new("1", (250, 120), 1))
+    client = create_app(publisher, long_poll_max_seconds=5).test_client()
+    first = client.get("/api/v1/frame.png")
+    assert first.headers["X-Display-Long-Poll"] == "5"
+
+    timer = threading.Timer(0.2, publisher.publish, (Image.new("1", (250, 120), 0),))
+    started = time.monotonic()
+    timer.start()
+    pushed = client.get(
+        "/api/v1/frame.png?after=1&wait=5",
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    timer.join()
+
+    assert pushed.status_code == 200
+    assert pushed.headers["X-Display-Sequence"] == "2"
+    assert time.monotonic() - started < 4
+
+    unchanged = client.get(
+        "/api/v1/frame.png?after=2&wait=0.05",
+        headers={"If-None-Match": pushed.headers["ETag"]},
+    )
+    assert unchanged.status_code == 304
+    # A lower sequence (server restart) never waits.
+    assert client.get("/api/v1/frame.png?after=9&wait=5").status_code == 200
+
+
+def test_each_display_channel_is_served_separately(tmp_path, monkeypatch):
+    monkeypatch.setattr(display_server, "utc_now", lambda: NOW)
+    channels = FrameChannels(tmp_path, ["default", "hall"], clock=lambda: NOW)
+    client = create_app(channels).test_client()
+
+    channels.get("default").publish(Image.new("1", (250, 120), 1))
+    not_ready = client.get("/readyz")
+    assert not_ready.status_code == 503
+    assert not_ready.get_json()["display"] == "hall"
+    hall = channels.get("hall").publish(Image.new("1", (250, 120), 0))
+    assert client.get("/readyz").status_code == 200
+    assert client.get("/healthz").get_json()["displays"] == ["default", "hall"]
+
+    response = client.get("/api/v1/displays/hall/frame.png")
+    assert response.headers["X-Display-SHA256"] == hall.metadata.sha256
+    assert client.get("/api/v1/displays/default/frame.png").data == (
+        client.get("/api/v1/frame.png").data
+    )
+    assert client.get("/api/v1/displays/hall/status").get_json()["frame"][
+        "sha256"
+    ] == hall.metadata.sha256
+    assert client.get("/api/v1/displays/porch/frame.png").status_code == 404
+    assert (tmp_path / "latest.png").exists()
+    assert (tmp_path / "displays" / "hall" / "latest.png").exists()
+
+
+def test_frame_history_lists_and_replays_recent_frames(tmp_path):
+    channels = FrameChannels(
+        tmp_path, ["default", "hall"], clock=lambda: NOW, history_frames=2
+    )
+    client = create_app(channels, token="secret").test_client()
+    auth = {"Authorization": "Bearer secret"}
+    publisher = channels.get("hall")
+    published = [
+        publisher.publish(Image.new("1", (250, 120), fill), screen="transit")
+        for fill in (1, 0, 1)
+    ]
+
+    assert client.get("/api/v1/displays/hall/frames").status_code == 401
+    listing = client.get("/api/v1/displays/hall/frames?since=2", headers=auth)
+    frames = listing.get_json()["frames"]
+    assert [frame["sequence"] for frame in frames] == [3]
+    assert frames[0]["screen"] == "transit"
+    assert listing.get_json()["history"]["distinct_frames"] == 2
+
+    replay = client.get(frames[0]["url"], headers=auth)
+    assert frames[0]["url"] == "/api/v1/displays/hall/frames/3.png"
+    assert replay.content_type == "image/png"
+    assert replay.data == published[2].content
+    assert replay.headers["X-Display-SHA256"] == published[2].metadata.sha256
+    cached = client.get(
+        frames[0]["url"], headers={**auth, "If-None-Match": replay.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+    # Frame 1 fell out of the two-frame ring; the default channel has none yet.
+    evicted = client.get("/api/v1/displays/hall/frames/1.png", headers=auth)
+    assert evicted.status_code == 404
+    assert client.get("/api/v1/frames", headers=auth).get_json()["frames"] == []
+    assert client.get("/api/v1/displays/porch/frames", headers=auth).status_code == 404
@@ -224,7 +224,207 @@ def test_color_ratios():
         # All ratios should be between 0 and 1
         for _, ratio in colors_with_ratios:
             assert 0 <= ratio <= 1, f"Individual ratio should be between 0 and 1 for {hex_color}"
-    
+
+
+def _legacy_checkerboard(draw, x, y, width, height, primary, secondary, ratio):
+    """Per-pixel reference of the offset checkerboard used by draw_dithered_box."""
+    for i in range(width):
+        for j in range(height):
+            offset = (j % 2) * 1
+            use_primary = ((i + offset + j) % 2 == 0) if (i + j) / (width + height) < ratio else \
+                         ((i + offset + j) % 2 != 0)
+            draw.point((x + i, y + j), fill=primary if use_primary else secondary)
+
+
+def _legacy_multicolor(draw, x, y, width, height, fills_with_ratios):
+    """Per-pixel reference of the pattern used by draw_multicolor_dither."""
+    cumulative, cumsum = [], 0
+    for fill, ratio in fills_with_ratios:
+        cumsum += ratio
+        cumulative.append((fill, cumsum))
+    for i in range(width):
+        for j in range(height):
+            offset = (j % 2) * 1
+            pattern_value = ((i + offset + j) % 4) / 4.0
+            noise = ((i * 37 + j * 17) % 7) / 28.0
+            selection_value = (pattern_value + noise) % 1.0
+            chosen = fills_with_ratios[-1][0]
+            for fill, cumulative_ratio in cumulative:
+                if selection_value <= cumulative_ratio:
+                    chosen = fill
+                    break
+            draw.point((x + i, y + j), fill=chosen)
+
+
+class _IntegerBwDisplay:
+    BLACK = 0
+    WHITE = 255
+    is_bw_display = True
+
+
+@pytest.mark.parametrize("width,height,ratio", [
+    (1, 1, 0.5), (13, 7, 0.0), (13, 7, 1.0), (30, 20, 0.37), (31, 21, 0.62), (57, 3, 0.9),
+])
+def test_dithered_box_matches_per_pixel_pattern(width, height, ratio):
+    epd = _IntegerBwDisplay()
+    expected = Image.new('1', (70, 30), 1)
+    _legacy_checkerboard(ImageDraw.Draw(expected), 2, 3, width, height, 0, 255, ratio)
+    ImageDraw.Draw(expected).rectangle([2, 3, 2 + width - 1, 3 + height - 1], outline=0)
+
+    actual = Image.new('1', (70, 30), 1)
+    draw_dithered_box(ImageDraw.Draw(actual), epd, 2, 3, width, height, "", 'black', 'white', ratio, None)
+
+    assert actual.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("colors_with_ratios", [
+    [('black', 0.3), ('white', 0.7)],
+    [('red', 0.45), ('black', 0.35), ('white', 0.2)],
+    [('yellow', 0.3), ('red', 0.2), ('black', 0.3), ('white', 0.2)],
+])
+@pytest.mark.parametrize("width,height", [(4, 4), (29, 31), (61, 9)])
+def test_multicolor_dither_matches_per_pixel_pattern(colors_with_ratios, width, height):
+    os.environ['mock_display_type'] = "bwry"
+    display = MockDisplay()
+    fills = {'black': display.BLACK, 'white': display.WHITE, 'red': display.RED, 'yellow': display.YELLOW}
+    fills_with_ratios = [(fills[color], ratio) for color, ratio in colors_with_ratios]
+    dominant = max(fills_with_ratios, key=lambda item: item[1])[0]
+
+    expected = Image.new('RGB', (70, 40), display.WHITE)
+    _legacy_multicolor(ImageDraw.Draw(expected), 5, 1, width, height, fills_with_ratios)
+    ImageDraw.Draw(expected).rectangle([5, 1, 5 + width - 1, 1 + height - 1], outline=dominant)
+
+    actual = Image.new('RGB', (70, 40), display.WHITE)
+    draw_multicolor_dither(ImageDraw.Draw(actual), display, 5, 1, width, height, colors_with_ratios)
+
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_dithered_box_clips_at_image_edges():
+    epd = _IntegerBwDisplay()
+    expected = Image.new('1', (20, 10), 1)
+    _legacy_checkerboard(ImageDraw.Draw(expected), -4, 6, 30, 8, 0, 255, 0.4)
+    ImageDraw.Draw(expected).rectangle([-4, 6, 25, 13], outline=0)
+
+    actual = Image.new('1', (20, 10), 1)
+    draw_dithered_box(ImageDraw.Draw(actual), epd, -4, 6, 30, 8, "", 'black', 'white', 0.4, None)
+
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_repeated_boxes_are_served_from_the_tile_cache(monkeypatch):
+    from dithering import DitherTileCache
+    import dithering
+
+    monkeypatch.setattr(dithering, 'tile_cache', DitherTileCache(1024 * 1024))
+    os.environ['mock_display_type'] = "bwr"
+    display = MockDisplay()
+    colors_with_ratios = [('red', 0.55), ('black', 0.25), ('white', 0.2)]
+
+    first = Image.new('RGB', (60, 40), display.WHITE)
+    draw_multicolor_dither(ImageDraw.Draw(first), display, 2, 2, 50, 30, colors_with_ratios)
+    draw_dithered_box(ImageDraw.Draw(first), display, 0, 0, 20, 10, "", 'red', 'white', 0.4, None)
+    second = Image.new('RGB', (60, 40), display.WHITE)
+    draw_multicolor_dither(ImageDraw.Draw(second), display, 2, 2, 50, 30, colors_with_ratios)
+    # Ratios in the same bucket select exactly the same pixels
+    draw_dithered_box(ImageDraw.Draw(second), display, 0, 0, 20, 10, "", 'red', 'white', 0.39, None)
+
+    assert second.tobytes() == first.tobytes()
+    stats = dithering.dither_tile_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 2, 2)
+
+
+def test_tile_cache_evicts_least_recently_used_tiles_over_budget(monkeypatch):
+    from dithering import DitherTileCache
+    import dithering
+
+    monkeypatch.setattr(dithering, 'tile_cache', DitherTileCache(1500))
+    epd = _IntegerBwDisplay()
+    image = Image.new('1', (60, 40), 1)
+    for width in (30, 31, 32):
+        draw_dithered_box(ImageDraw.Draw(image), epd, 0, 0, width, 30, "", 'black', 'white', 0.5, None)
+
+    stats = dithering.dither_tile_cache_stats()
+    assert stats['bytes'] <= 1500
+    assert stats['evictions'] == 2
+    assert stats['entries'] == 1
+
+
+def _blockwise_process_icon(icon, epd):
+    """Reference of process_icon_for_epd: dither each 4x4 block on its own."""
+    width, height = icon.size
+    if epd.is_bw_display:
+        processed = Image.new('1', icon.size, 1)
+    else:
+        processed = Image.new('RGB', icon.size, epd.WHITE)
+    draw = ImageDraw.Draw(processed)
+    for x in range(0, width, 4):
+        for y in range(0, height, 4):
+            block = icon.crop((x, y, min(x + 4, width), min(y + 4, height)))
+            opaque = [
+                block.getpixel((i, j))
+                for j in range(block.height)
+                for i in range(block.width)
+                if block.getpixel((i, j))[3] > 128
+            ]
+            if not opaque:
+                continue
+            avg_color = tuple(sum(px[band] for px in opaque) // len(opaque) for band in range(3))
+            draw_multicolor_dither(
+                draw, epd, x, y, min(4, width - x), min(4, height - y),
+                find_optimal_colors(avg_color, epd),
+            )
+    return processed
+
+
+def _synthetic_icon(width, height):
+    """A gradient disc with hard and soft alpha edges, like a rasterized SVG."""
+    icon = Image.new('RGBA', (width, height))
+    icon.putdata([
+        (
+            (x * 255) // width,
+            (y * 255) // height,
+            (x * y) % 256,
+            255 if (x - width / 2) ** 2 + (y - height / 2) ** 2 < (width / 2.3) ** 2 else (x * 7) % 200,
+        )
+        for y in range(height)
+        for x in range(width)
+    ])
+    return icon
+
+
+@pytest.mark.parametrize("display_type", ["bw", "bwr", "bwry"])
+@pytest.mark.parametrize("size", [(46, 46), (28, 28), (21, 13)])
+def test_process_icon_matches_blockwise_dithering(display_type, size):
+    from dithering import process_icon_for_epd
+
+    os.environ['mock_display_type'] = display_type
+    display = MockDisplay()
+    # The mock B&W display uses RGB fills; process it on an RGB-capable copy
+    display.is_bw_display = False
+    icon = _synthetic_icon(*size)
+
+    assert process_icon_for_epd(icon, display).tobytes() == _blockwise_process_icon(icon, display).tobytes()
+
+
+def test_process_icon_on_one_bit_display_matches_blockwise_dithering():
+    from dithering import process_icon_for_epd
+
+    icon = _synthetic_icon(46, 46)
+    epd = _IntegerBwDisplay()
+
+    assert process_icon_for_epd(icon, epd).tobytes() == _blockwise_process_icon(icon, epd).tobytes()
+
+
+def test_process_icon_without_alpha_leaves_a_blank_icon():
+    from dithering import process_icon_for_epd
+
+    icon = Image.new('RGB', (8, 8), (0, 0, 0))
+    processed = process_icon_for_epd(icon, _IntegerBwDisplay())
+
+    assert processed.tobytes() == Image.new('1', (8, 8), 1).tobytes()
+
+
 if __name__ == "__main__":
     # Save images in a permanent test_output directory
     output_dir = "test_output"
@@ -0,0 +1,58 @@
+from PIL import Image, ImageDraw
+
+from frame_diff import FrameChangeTracker, diff_frames
+
+
+def test_diff_reports_merged_boxes_and_changed_pixel_ratio():
+    previous = Image.new("1", (250, 120), 1)
+    current = previous.copy()
+    draw = ImageDraw.Draw(current)
+    draw.rectangle((10, 4, 19, 19), fill=0)
+    draw.rectangle((200, 100, 204, 101), fill=0)
+
+    diff = diff_frames(previous, current)
+
+    assert diff.boxes == ((10, 4, 20, 20), (200, 100, 205, 102))
+    assert diff.changed_pixels == 10 * 16 + 5 * 2
+    assert diff.changed_ratio == diff.changed_pixels / (250 * 120)
+    assert diff.bbox == (10, 4, 205, 102)
+
+
+def test_diff_detects_single_band_colour_changes_and_identical_frames():
+    previous = Image.new("RGB", (250, 120), (255, 255, 255))
+    current = previous.copy()
+    current.putpixel((3, 7), (255, 254, 255))
+
+    assert diff_frames(previous, current).boxes == ((3, 7, 4, 8),)
+    assert diff_frames(previous, previous.copy()).unchanged
+
+
+def test_missing_or_mismatched_previous_frame_is_a_full_change():
+    current = Image.new("1", (250, 120), 1)
+
+    assert diff_frames(None, current).changed_ratio == 1.0
+    assert diff_frames(current.convert("L"), current).boxes == ((0, 0, 250, 120),)
+
+
+def test_tracker_attributes_changes_to_the_screen_that_rendered_them():
+    tracker = FrameChangeTracker()
+    blank = Image.new("1", (250, 120), 1)
+    marked = blank.copy()
+    marked.putpixel((0, 0), 0)
+
+    tracker.observe(blank)
+    tracker.attribute("transit")
+    tracker.observe(marked)
+    tracker.observe(marked.copy())
+    tracker.attribute("weather")
+
+    stats = tracker.stats()
+    assert stats["transit"]["updates"] == 2
+    assert stats["transit"]["pixels_changed_per_update"] == (250 * 120 + 1) / 2
+    assert stats["weather"] == {
+        "updates": 1,
+        "unchanged": 1,
+        "pixels_changed_per_update": 0.0,
+        "mean_changed_ratio": 0.0,
+        "last_boxes": [],
+    }
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+from PIL import Image, ImageDraw
+
+from display_protocol import FramePublisher
+from frame_history import FrameHistory, FrameRecord
+from publication_display import PublicationDisplay
+from render_lock import RenderLock
+
+NOW = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _record(sequence, sha256, length=100):
+    return FrameRecord(sequence, NOW.isoformat(), sha256, length)
+
+
+def _frame(text):
+    image = Image.new("1", (250, 120), 1)
+    ImageDraw.Draw(image).text((10, 40), text, fill=0)
+    return image
+
+
+def test_history_shares_identical_frames_and_stays_within_its_caps():
+    history = FrameHistory(max_frames=3, max_bytes=250)
+    for sequence, sha256 in enumerate(["a", "b", "a", "b"], start=1):
+        history.add(_record(sequence, sha256), bytes(100))
+
+    assert [record.sequence for record in history.since()] == [2, 3, 4]
+    assert history.stats()["distinct_frames"] == 2
+    assert history.stats()["stored_bytes"] == 200
+    assert history.get(1) is None
+    assert history.get(3) == (_record(3, "a"), bytes(100))
+
+    # A third distinct frame no longer fits next to the other two.
+    history.add(_record(5, "c"), bytes(100))
+    assert [record.sequence for record in history.since(2)] == [4, 5]
+    assert history.stats()["stored_bytes"] == 200
+    # The newest frame is kept even when it alone exceeds the byte cap.
+    history.add(_record(6, "d", 300), bytes(300))
+    assert [record.sequence for record in history.since()] == [6]
+
+
+def test_frames_are_attributed_once_to_the_screen_that_rendered_them():
+    history = FrameHistory()
+    history.add(_record(1, "a"), b"png")
+    history.attribute("weather", "ha:lights")
+    history.attribute("transit")
+    history.add(_record(2, "b"), b"png2")
+
+    assert [(record.screen, record.owner) for record in history.since()] == [
+        ("weather", "ha:lights"),
+        (None, None),
+    ]
+
+
+def test_publication_display_records_render_time_and_screen(tmp_path):
+    ticks = iter([10.0, 10.25, 10.25])
+    lock = RenderLock(clock=lambda: next(ticks))
+    publisher = FramePublisher(tmp_path, clock=lambda: NOW, history_frames=8)
+    display = PublicationDisplay(publisher)
+    display.render_lock = lock
+
+    with lock:
+        display.display(_frame("12 min"))
+    # What DisplayManager does when the render sets its display mode.
+    display.frame_changes.attribute("transit")
+    display.attribute_frame("transit")
+    display.display(_frame("11 min"))
+    # An identical render keeps its sequence and adds no record.
+    display.display(_frame("11 min"))
+
+    first, second = publisher.history.since()
+    assert (first.sequence, first.screen, first.render_seconds) == (1, "transit", 0.25)
+    assert (second.sequence, second.screen, second.render_seconds) == (
+        2,
+        "transit",
+        None,
+    )
+    assert publisher.stats()["history"]["frames"] == 2
+    # A restarted publisher starts its history from the frame on disk.
+    restarted = FramePublisher(tmp_path, clock=lambda: NOW, history_frames=8)
+    assert [record.sequence for record in restarted.history.since()] == [2]
@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+from PIL import Image
+
+from frame_diff import FrameChangeTracker, diff_frames
+from ghosting import GhostingBudget, install_ghosting_budget
+from screen_arbiter import ScreenArbiter
+
+
+def _frames(count, size=(10, 10)):
+    """Alternate a 2x5 block so the same 10 pixels flip on every frame."""
+    frames = []
+    for index in range(count):
+        frame = Image.new("1", size, 1)
+        if index % 2:
+            for x in range(2):
+                for y in range(5):
+                    frame.putpixel((x, y), 0)
+        frames.append(frame)
+    return frames
+
+
+def _charge(budget, frames):
+    for previous, current in zip(frames, frames[1:]):
+        budget.record_partial(diff_frames(previous, current))
+
+
+def test_budget_is_spent_by_repeatedly_flipped_pixels_only():
+    budget = GhostingBudget(pixel_limit=3, budget=0.05)
+
+    _charge(budget, _frames(3))
+    assert not budget.due()
+    _charge(budget, _frames(4)[-2:])
+
+    assert budget.due_reason() == "budget"
+    assert budget.stats()["ghosted_pixels"] == 10
+    assert budget.stats()["max_wear"] == 3
+
+    budget.record_full()
+    assert not budget.due()
+    assert budget.stats()["full_refreshes"] == 1
+
+
+def test_unchanged_frames_cost_nothing_and_ceilings_are_optional():
+    clock = [0.0]
+    budget = GhostingBudget(
+        pixel_limit=255, budget=1.0, max_interval_seconds=60, clock=lambda: clock[0]
+    )
+    frame = Image.new("1", (10, 10), 1)
+
+    budget.record_partial(diff_frames(frame, frame.copy()))
+    clock[0] = 120.0
+    assert not budget.due()
+
+    _charge(budget, _frames(2))
+    clock[0] = 179.0
+    assert not budget.due()
+    clock[0] = 180.0
+    assert budget.due_reason() == "interval"
+
+    counted = GhostingBudget(pixel_limit=255, budget=1.0, max_partial_updates=2)
+    _charge(counted, _frames(3))
+    assert counted.due_reason() == "partial-updates"
+
+
+def test_deferrals_count_once_per_due_refresh():
+    budget = GhostingBudget()
+
+    budget.defer()
+    budget.defer()
+    budget.record_full()
+    budget.defer()
+
+    assert budget.stats()["deferred"] == 2
+
+
+def test_installed_budget_charges_partial_writes_and_resets_on_base_image():
+    writes = []
+    epd = SimpleNamespace(
+        displayPartial=lambda buffer: writes.append(("partial", buffer)),
+        displayPartBaseImage=lambda buffer: writes.append(("base", buffer)),
+    )
+    tracker = FrameChangeTracker()
+    budget = install_ghosting_budget(
+        epd, tracker, GhostingBudget(pixel_limit=1, budget=0.0)
+    )
+    first, second = _frames(2)
+
+    tracker.observe(first)
+    epd.displayPartBaseImage("first")
+    tracker.observe(second)
+    epd.displayPartial("second")
+
+    assert writes == [("base", "first"), ("partial", "second")]
+    assert epd.ghosting is budget
+    assert budget.stats()["ghosted_pixels"] == 10
+    epd.displayPartBaseImage("second")
+    assert not budget.due()
+
+
+def test_display_manager_defers_full_refresh_during_takeover(monkeypatch):
+    import basic
+    from basic import DisplayManager
+
+    refreshed = []
+    monkeypatch.setattr(basic, "display_full_refresh", refreshed.append)
+    budget = GhostingBudget(pixel_limit=1, budget=0.0)
+    _charge(budget, _frames(2))
+    manager = DisplayManager.__new__(DisplayManager)
+    manager.epd = SimpleNamespace(ghosting=budget)
+    manager.screen_arbiter = ScreenArbiter()
+    manager.current_display_mode = "transit"
+    manager.in_weather_mode = False
+
+    manager.screen_arbiter.claim("flight", 50, 60)
+    assert not manager.perform_full_refresh()
+    assert budget.stats()["deferred"] == 1
+
+    manager.screen_arbiter.release("flight")
+    assert manager.perform_full_refresh()
+    assert refreshed == [manager.epd]
+    assert manager.current_display_mode is None
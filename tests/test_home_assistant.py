@@ -757,4 +757,4 @@ def test_all_renderers_are_null_safe(tmp_path, monkeypatch):
             }
         )
         image = draw_home_assistant_screen(epd, config.screens[0], {})
-        assert image.size == (120, 250)
+        assert image.size == (250, 120)
@@ -0,0 +1,130 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from io_runtime import IoRuntime, configured_io_runtime, configured_runtime_mode
+from snapshot_worker import SnapshotWorker
+
+
+def test_jobs_fetch_on_the_io_pool_and_render_on_one_worker():
+    runtime = IoRuntime(io_workers=2)
+    rendered = []
+    done = threading.Event()
+
+    def render(result):
+        rendered.append((result, threading.current_thread().name))
+        if len(rendered) == 3:
+            done.set()
+
+    try:
+        runtime.every("calendar", threading.current_thread, 0.01, render=render)
+        assert done.wait(5)
+    finally:
+        runtime.stop()
+
+    fetch_threads = {result.name for result, _ in rendered}
+    render_threads = {name for _, name in rendered}
+    assert all(name.startswith("RuntimeIO") for name in fetch_threads)
+    assert len(render_threads) == 1
+    assert render_threads.pop().startswith("RuntimeRender")
+
+
+def test_failures_are_reported_and_the_job_keeps_running():
+    runtime = IoRuntime()
+    errors = []
+    attempts = iter(range(100))
+    recovered = threading.Event()
+
+    def fetch():
+        if next(attempts) < 2:
+            raise TimeoutError("slow endpoint")
+        recovered.set()
+
+    try:
+        task = runtime.every("ynab", fetch, 0.01, on_error=errors.append)
+        assert recovered.wait(5)
+        task.cancel()
+        stats = runtime.stats()["tasks"]["ynab"]
+    finally:
+        runtime.stop()
+
+    assert [type(error) for error in errors] == [TimeoutError, TimeoutError]
+    assert stats["failures"] == 2
+
+
+def test_jobs_with_the_same_name_run_side_by_side():
+    # Each display profile schedules its own CalendarPlugin on the shared runtime.
+    runtime = IoRuntime()
+    ran = {"first": threading.Event(), "second": threading.Event()}
+    try:
+        first = runtime.every("CalendarPlugin", ran["first"].set, 0.01)
+        second = runtime.every("CalendarPlugin", ran["second"].set, 0.01)
+        assert ran["first"].wait(5) and ran["second"].wait(5)
+        assert first.running() and second.running()
+        assert (first.name, second.name) == ("CalendarPlugin", "CalendarPlugin#2")
+        tasks = runtime.stats()["tasks"]
+        assert tasks["CalendarPlugin"]["running"]
+        assert tasks["CalendarPlugin#2"]["running"]
+
+        first.cancel()
+        third = runtime.every("CalendarPlugin", lambda: None, 0.01)
+        assert third.name == "CalendarPlugin"
+        assert second.running()
+    finally:
+        runtime.stop()
+
+
+def test_stop_is_final_and_idempotent():
+    runtime = IoRuntime()
+    worker = SnapshotWorker("token-usage", lambda: None, interval_seconds=300)
+    worker.start(runtime)
+    assert runtime.stats()["tasks"]["snapshot-token-usage"]["running"]
+
+    runtime.stop()
+    runtime.stop()
+    worker.stop()
+
+    with pytest.raises(RuntimeError):
+        runtime.every("weather", lambda: None, 60)
+
+
+def test_runtime_mode_defaults_to_threads(monkeypatch):
+    monkeypatch.delenv("display_runtime", raising=False)
+    assert configured_io_runtime() is None
+    monkeypatch.setenv("display_runtime", "fibers")
+    assert configured_runtime_mode() == "threads"
+    monkeypatch.setenv("display_runtime", "asyncio")
+    runtime = configured_io_runtime()
+    try:
+        assert isinstance(runtime, IoRuntime)
+    finally:
+        runtime.stop()
+
+
+def test_profile_cleanup_leaves_the_shared_runtime_running():
+    from basic import DisplayManager
+
+    runtime = IoRuntime()
+    weather = SimpleNamespace(stopped=False)
+    weather.stop = lambda: setattr(weather, "stopped", True)
+    shared = SimpleNamespace(weather_manager=weather, io_runtime=runtime)
+    idle = SimpleNamespace(stop=lambda: None)
+    manager = DisplayManager.__new__(DisplayManager)
+    manager.shared = shared
+    manager.weather_manager = weather
+    manager.io_runtime = runtime
+    manager._stop_event = threading.Event()
+    manager._scheduler = idle
+    manager.iss_tracker = None
+    manager.override_server = idle
+    manager.plugin_registry = SimpleNamespace(stop_all=lambda: None)
+    manager._snapshot_workers = []
+    manager._check_data_thread = manager._flight_thread = manager._iss_thread = None
+    try:
+        manager.cleanup()
+        # Another profile can still schedule work on the shared runtime.
+        assert runtime.every("CalendarPlugin", lambda: None, 60).running()
+        assert not weather.stopped
+    finally:
+        runtime.stop()
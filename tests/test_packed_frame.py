@@ -0,0 +1,123 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+from PIL import Image, ImageDraw
+
+from display_adapter import MockDisplay
+from display_client import FrameClient
+from display_protocol import FramePublisher
+from display_server import create_app
+from packed_frame import (
+    PACKED_CONTENT_TYPE,
+    PackedFrame,
+    install_packed_framebuffer,
+    pack_for_panel,
+)
+
+NOW = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _logical_frame(mode="1"):
+    image = Image.new(mode, (250, 120), "white" if mode == "RGB" else 1)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((3, 5, 60, 40), fill="black" if mode == "RGB" else 0)
+    draw.line((0, 119, 249, 0), fill="black" if mode == "RGB" else 0)
+    return image
+
+
+def test_pack_for_panel_matches_the_driver_conversion_path():
+    for mode in ("1", "RGB"):
+        frame = _logical_frame(mode)
+        panel = Image.new(mode, (122, 250), "white" if mode == "RGB" else 1)
+        panel.paste(frame.rotate(90, expand=True), (1, 0))
+
+        packed = pack_for_panel(frame, 122, 250, 90)
+
+        assert packed.stride == 16
+        assert packed.data == panel.convert("1").tobytes()
+        assert packed.to_image().tobytes() == packed.data
+
+    with pytest.raises(ValueError, match="needs 4000 bytes"):
+        PackedFrame(122, 250, b"\xff" * 10)
+
+
+class ModernEPD:
+    width = 122
+    height = 250
+
+    def getbuffer(self, image):
+        return bytearray(image.convert("1").tobytes("raw"))
+
+
+class LegacyEPD(ModernEPD):
+    """Per-pixel drivers start from 0xFF, so unused row bits stay set."""
+
+    def getbuffer(self, image):
+        stride = (self.width + 7) // 8
+        buffer = [0xFF] * (stride * self.height)
+        pixels = image.convert("1").load()
+        for y in range(self.height):
+            for x in range(self.width):
+                if pixels[x, y] == 0:
+                    buffer[x // 8 + y * stride] &= ~(0x80 >> (x % 8))
+        return buffer
+
+
+class ColumnMajorEPD(ModernEPD):
+    def getbuffer(self, image):
+        return bytearray(image.convert("1").transpose(Image.Transpose.TRANSPOSE).tobytes())
+
+
+def test_packed_adapter_is_enabled_only_for_the_native_row_layout():
+    for driver in (ModernEPD, LegacyEPD):
+        epd = driver()
+        assert install_packed_framebuffer(epd)
+        packed = pack_for_panel(_logical_frame(), 122, 250, 90)
+        assert epd.getbuffer(packed) == bytearray(packed.data)
+        assert epd.accepts_packed_frames
+
+    epd = ColumnMajorEPD()
+    assert not install_packed_framebuffer(epd)
+    assert not hasattr(epd, "accepts_packed_frames")
+
+
+def test_mock_display_decodes_packed_frames_for_debug_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("mock_display_type", "bw")
+    monkeypatch.setenv("display_packed_framebuffer", "true")
+    display = MockDisplay()
+    frame = _logical_frame()
+    packed = pack_for_panel(frame, display.width, display.height, 90)
+
+    assert display.accepts_packed_frames
+    display.displayPartial(display.getbuffer(packed))
+
+    assert display.decode_buffer(packed).tobytes() == frame.tobytes()
+    assert Image.open("debug_output.png").convert("1").tobytes() == frame.tobytes()
+
+
+def test_client_receives_packed_frames_in_panel_layout(
+    tmp_path, flask_session, packed_panel
+):
+    publisher = FramePublisher(tmp_path, clock=lambda: NOW)
+    frame = _logical_frame()
+    publisher.publish(frame)
+    session = flask_session(create_app(publisher).test_client())
+    panel = packed_panel
+    client = FrameClient(
+        panel, url="/api/v1/frame.png", session=session, clock=lambda: NOW
+    )
+
+    assert client.poll_once().status == "displayed"
+    assert panel.buffers == [pack_for_panel(frame, 122, 250, 90).data]
+    assert client.poll_once().status == "not-modified"
+
+    png = session.client.get("/api/v1/frame.png")
+    assert png.content_type == "image/png"
+    mismatched = session.client.get(
+        "/api/v1/frame.png",
+        headers={"Accept": PACKED_CONTENT_TYPE, "X-Panel-Geometry": "10x10@90"},
+    )
+    assert mismatched.content_type == "image/png"
+    assert Image.open(io.BytesIO(mismatched.data)).size == (250, 120)
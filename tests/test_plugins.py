@@ -316,6 +316,27 @@ def test_rotation_stop_releases_all_claims():
     assert not arbiter.has_claim("owner")
 
 
+
+def test_running_rotation_renders_as_soon_as_a_takeover_is_released():
+    arbiter = ScreenArbiter()
+    arbiter.claim("urgent", 99, 100)
+    rendered = threading.Event()
+    rotation = PeriodicRotatingScreen(
+        PluginContext(object(), arbiter, threading.Lock()),
+        [RotatingView("ambient", rendered.set, 30, 10)],
+        interval_seconds=10,
+        poll_seconds=60,
+    )
+    rotation.start()
+    try:
+        assert not rendered.wait(0.2)
+        arbiter.release("urgent")
+        # Without the wake-up this would take a whole poll_seconds.
+        assert rendered.wait(5)
+    finally:
+        rotation.stop()
+    assert rotation._thread is None
+
 class FakeClock:
     def __init__(self):
         self.now = 100.0
@@ -1,3 +1,7 @@
+import random
+import threading
+import time
+
 import pytest
 
 from screen_arbiter import ScreenArbiter
@@ -102,3 +106,131 @@ def test_claim_rejects_empty_owner(owner):
 def test_claim_rejects_non_positive_ttl():
     with pytest.raises(ValueError):
         ScreenArbiter().claim("flight", 1, 0)
+
+
+def test_listeners_hear_ownership_changes_and_next_expiry_is_reported():
+    clock = FakeClock()
+    arbiter = ScreenArbiter(clock)
+    changes = []
+    arbiter.add_listener(lambda previous, current: changes.append((previous, current)))
+
+    assert arbiter.seconds_until_next_expiry() is None
+    arbiter.claim("calendar-upcoming", 30, 300)
+    arbiter.claim("flight", 50, 30)
+    # Refreshing the current owner's claim is not a change.
+    arbiter.claim("flight", 50, 30)
+    clock.advance(10)
+    assert arbiter.seconds_until_next_expiry() == 20
+    clock.advance(20)
+    arbiter.active_owner()
+
+    assert changes == [
+        (None, "calendar-upcoming"),
+        ("calendar-upcoming", "flight"),
+        ("flight", "calendar-upcoming"),
+    ]
+
+
+class ScanningArbiter:
+    """The selection rules as a plain scan over every claim, for reference."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.claims = {}
+        self.current = None
+        self.sequence = 0
+
+    def claim(self, owner, priority, ttl, exclusive=False):
+        self.prune()
+        existing = self.claims.get(owner)
+        if existing is None:
+            self.sequence += 1
+        sequence = existing[3] if existing else self.sequence
+        self.claims[owner] = (priority, self.clock() + ttl, exclusive, sequence)
+        self.select()
+        return self.current == owner
+
+    def release(self, owner):
+        self.prune()
+        was_active = self.current == owner
+        self.claims.pop(owner, None)
+        if was_active:
+            self.current = None
+        self.select()
+        return was_active
+
+    def active_owner(self):
+        self.prune()
+        self.select()
+        return self.current
+
+    def prune(self):
+        now = self.clock()
+        for owner in [o for o, c in self.claims.items() if c[1] <= now]:
+            del self.claims[owner]
+            if self.current == owner:
+                self.current = None
+
+    def select(self):
+        current = self.claims.get(self.current)
+        if current and current[2]:
+            return
+        self.current = min(
+            self.claims,
+            key=lambda o: (-self.claims[o][0], o != self.current, self.claims[o][3]),
+            default=None,
+        )
+
+
+def test_heap_selection_matches_a_full_scan_of_the_claims():
+    clock = FakeClock()
+    arbiter = ScreenArbiter(clock)
+    reference = ScanningArbiter(clock)
+    rng = random.Random(23)
+    owners = [f"plugin-{index}" for index in range(12)]
+
+    for _ in range(5000):
+        action = rng.random()
+        owner = rng.choice(owners)
+        if action < 0.55:
+            args = (owner, rng.choice([10, 30, 50]), rng.choice([1, 5, 30]))
+            exclusive = rng.random() < 0.1
+            assert arbiter.claim(*args, exclusive=exclusive) == reference.claim(
+                *args, exclusive
+            )
+        elif action < 0.75:
+            assert arbiter.release(owner) == reference.release(owner)
+        elif action < 0.9:
+            clock.advance(rng.choice([0.5, 1, 3]))
+        assert arbiter.active_owner() == reference.active_owner()
+
+
+def test_waiters_wake_on_ownership_changes_expiry_and_interrupts():
+    arbiter = ScreenArbiter()
+    generation = arbiter.generation
+    assert arbiter.wait_for_change(generation, 0.01) == generation
+
+    threading.Timer(0.05, arbiter.claim, args=("flight", 50, 30)).start()
+    generation = arbiter.wait_for_change(generation, 5)
+    assert arbiter.active_owner() == "flight"
+
+    # Nobody calls into the arbiter; the waiter notices the expiry itself.
+    arbiter.claim("flight", 50, 0.1)
+    started = time.monotonic()
+    generation = arbiter.wait_for_change(arbiter.generation, 5)
+    assert time.monotonic() - started < 2
+    assert arbiter.active_owner() is None
+
+    threading.Timer(0.05, arbiter.interrupt_waiters).start()
+    assert arbiter.wait_for_change(generation) == generation
+
+
+
+def test_wait_timeout_is_measured_on_the_arbiter_clock():
+    ticks = iter(range(0, 1000, 10))
+    arbiter = ScreenArbiter(lambda: next(ticks))
+
+    started = time.monotonic()
+    # Ten seconds pass on the arbiter's clock between reads.
+    assert arbiter.wait_for_change(arbiter.generation, 5) == arbiter.generation
+    assert time.monotonic() - started < 1
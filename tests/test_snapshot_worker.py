@@ -0,0 +1,55 @@
+import threading
+import time
+
+from render_lock import RenderLock
+from snapshot_worker import SnapshotWorker
+
+
+def test_refresh_records_failures_without_raising():
+    outcomes = iter([None, RuntimeError("timed out")])
+
+    def refresh():
+        outcome = next(outcomes)
+        if outcome:
+            raise outcome
+
+    worker = SnapshotWorker("token-usage", refresh, interval_seconds=1)
+    worker.refresh()
+    worker.refresh()
+
+    assert worker.stats()["refreshes"] == 2
+    assert worker.stats()["failures"] == 1
+    # Refreshing more often than every five seconds only hammers the source.
+    assert worker.interval_seconds == 5
+
+
+def test_slow_source_does_not_hold_the_display_lock():
+    lock = RenderLock()
+    cached = {"snapshot": None}
+    release_source = threading.Event()
+
+    def slow_fetch():
+        release_source.wait(5)
+        cached["snapshot"] = "usage"
+
+    worker = SnapshotWorker("token-usage", slow_fetch, interval_seconds=300)
+    fetching = threading.Thread(target=worker.refresh)
+    fetching.start()
+    try:
+        # Renders keep going, on whatever snapshot is ready, while it fetches.
+        for _ in range(3):
+            assert lock.acquire(timeout=1)
+            rendered = cached["snapshot"]
+            lock.release()
+        assert rendered is None
+    finally:
+        release_source.set()
+        fetching.join()
+
+    with lock:
+        time.sleep(0.01)
+    stats = lock.stats()
+    assert stats["acquisitions"] == 4
+    assert stats["held_seconds_max"] >= 0.01
+    assert stats["longest_holder"] == threading.current_thread().name
+    assert cached["snapshot"] == "usage"
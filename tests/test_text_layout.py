@@ -1,7 +1,7 @@
 from PIL import Image, ImageDraw
 
-from font_utils import get_font_paths
-from text_layout import fit_wrapped_text
+from font_utils import get_font, get_font_paths, load_font
+from text_layout import ellipsize, fit_wrapped_text, longest_fitting_prefix, measure_text
 
 
 def _draw():
@@ -77,3 +77,47 @@ def test_unbreakable_overflow_keeps_visible_ellipsized_text():
     assert fitted.truncated
     assert fitted.lines[0]
     assert fitted.lines[0].endswith("…")
+
+
+def test_font_registry_shares_faces_between_roles_and_paths():
+    paths = get_font_paths()
+
+    assert get_font("dejavu_bold", 17) is get_font("dejavu_bold", 17)
+    assert get_font("dejavu", 17) is load_font(paths["dejavu"], 17)
+    assert get_font("dejavu", 17) is not get_font("dejavu", 18)
+
+
+def test_measurements_are_memoized_per_font_and_font_mode(monkeypatch):
+    font = load_font(get_font_paths()["dejavu"], 15)
+    draw = _draw()
+    calls = []
+    original = draw.textbbox
+
+    def counting_textbbox(*args, **kwargs):
+        calls.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(draw, "textbbox", counting_textbbox)
+    first = measure_text(draw, "memoized glyph run", font)
+
+    assert measure_text(draw, "memoized glyph run", font) == first
+    assert calls == ["memoized glyph run"]
+    antialiased = ImageDraw.Draw(Image.new("L", (250, 120), 255))
+    assert measure_text(antialiased, "memoized glyph run", font) == antialiased.textbbox(
+        (0, 0), "memoized glyph run", font=font
+    )
+
+
+def test_ellipsize_keeps_longest_prefix_that_fits_with_suffix():
+    font = load_font(get_font_paths()["dejavu"], 12)
+    draw = _draw()
+    text = "Ellipsized headline about a timetable change"
+
+    shortened = ellipsize(draw, text, font, 120)
+
+    trimmed = text
+    while trimmed and draw.textbbox((0, 0), trimmed + "…", font=font)[2] > 120:
+        trimmed = trimmed[:-1]
+    assert shortened == trimmed.rstrip() + "…"
+    assert ellipsize(draw, "  short   text ", font, 120) == "short text"
+    assert longest_fitting_prefix(draw, text, font, 1, "…") == 0
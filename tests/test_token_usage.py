@@ -116,17 +116,17 @@ def test_scheduled_token_mode_requires_live_activity(monkeypatch):
     manager.display_schedule = DisplaySchedule("token@00:00-00:00")
     manager.token_usage_client = SimpleNamespace(
         enabled=True,
-        get_snapshot=lambda: SimpleNamespace(active=False, stale=False),
+        cached_snapshot=lambda: SimpleNamespace(active=False, stale=False),
     )
     monkeypatch.setenv("token_usage_fallback_mode", "weather")
     now = datetime(2026, 7, 10, 12, 0)
 
     assert manager._scheduled_mode(now) == "weather"
-    manager.token_usage_client.get_snapshot = lambda: SimpleNamespace(
+    manager.token_usage_client.cached_snapshot = lambda: SimpleNamespace(
         active=True, stale=False
     )
     assert manager._scheduled_mode(now) == "token"
-    manager.token_usage_client.get_snapshot = lambda: SimpleNamespace(
+    manager.token_usage_client.cached_snapshot = lambda: SimpleNamespace(
         active=True, stale=True
     )
     assert manager._scheduled_mode(now) == "weather"
@@ -141,12 +141,12 @@ def test_token_always_mode_ignores_activity_but_not_staleness(monkeypatch):
     manager.display_schedule = DisplaySchedule("token-always@weekends@00:00-00:00")
     manager.token_usage_client = SimpleNamespace(
         enabled=True,
-        get_snapshot=lambda: SimpleNamespace(active=False, stale=False),
+        cached_snapshot=lambda: SimpleNamespace(active=False, stale=False),
     )
     monkeypatch.setenv("token_usage_fallback_mode", "weather")
 
     assert manager._scheduled_mode(datetime(2026, 7, 11, 12, 0)) == "token-always"
-    manager.token_usage_client.get_snapshot = lambda: SimpleNamespace(
+    manager.token_usage_client.cached_snapshot = lambda: SimpleNamespace(
         active=False, stale=True
     )
     assert manager._scheduled_mode(datetime(2026, 7, 11, 12, 0)) == "weather"
@@ -159,7 +159,7 @@ def test_reset_notice_temporarily_satisfies_token_activity_requirement(monkeypat
     manager.display_schedule = DisplaySchedule("token@00:00-00:00")
     manager.token_usage_client = SimpleNamespace(
         enabled=True,
-        get_snapshot=lambda: SimpleNamespace(
+        cached_snapshot=lambda: SimpleNamespace(
             active=False, stale=False, reset_notice="primary"
         ),
     )
@@ -182,6 +182,21 @@ def test_file_client_reads_and_caches_snapshot(tmp_path, monkeypatch):
     assert client.get_snapshot() is snapshot
 
 
+def test_cached_snapshot_never_reads_the_source(tmp_path, monkeypatch):
+    source = tmp_path / "snapshot.json"
+    source.write_text(json.dumps(SAMPLE), encoding="utf-8")
+    monkeypatch.setenv("token_usage_enabled", "true")
+    monkeypatch.setenv("token_usage_source", "file")
+    monkeypatch.setenv("token_usage_file", str(source))
+    monkeypatch.setenv("token_usage_cache_file", str(tmp_path / "cache.json"))
+    client = TokenUsageClient()
+    assert client.cached_snapshot() is None
+
+    snapshot = client.get_snapshot()
+    monkeypatch.setattr(client, "_read_payload", pytest.fail)
+    assert client.cached_snapshot() is snapshot
+
+
 def test_client_discards_cache_after_maximum_stale_age(tmp_path, monkeypatch):
     source = tmp_path / "snapshot.json"
     cache = tmp_path / "cache.json"
@@ -290,7 +305,7 @@ def test_draw_token_usage_prioritizes_reset_notice(monkeypatch):
     manager.current_token_view = "limits"
     manager.in_weather_mode = True
     manager.token_usage_client = SimpleNamespace(
-        get_snapshot=lambda: SimpleNamespace(
+        cached_snapshot=lambda: SimpleNamespace(
             active=False, stale=False, reset_notice="primary"
         )
     )
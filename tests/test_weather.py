@@ -109,3 +109,79 @@ def test_get_air_quality_without_data(weather_service, weather_data):
     )
 
     assert service.get_air_quality() is None
+
+
+class _IconDisplay:
+    def __init__(self, bw):
+        self.is_bw_display = bw
+
+
+@pytest.fixture
+def icon_cache(tmp_path, monkeypatch):
+    import weather.display as weather_display
+    import weather.icons as weather_icons
+
+    monkeypatch.setenv("weather_icon_cache_dir", str(tmp_path / "icons"))
+    weather_display._load_svg_icon.cache_clear()
+    weather_icons.svg_digest.cache_clear()
+    yield tmp_path / "icons"
+    weather_display._load_svg_icon.cache_clear()
+
+
+def test_svg_icon_is_rasterized_once_and_reused_from_disk(icon_cache, monkeypatch):
+    from PIL import Image
+    import weather.display as weather_display
+    from weather.icons import ICONS_DIR
+
+    calls = []
+
+    def fake_rasterize(svg_path, size, bw):
+        calls.append((svg_path.name, size, bw))
+        return Image.new('1' if bw else 'RGB', size, 0)
+
+    monkeypatch.setattr(weather_display, "_rasterize_svg_icon", fake_rasterize)
+    icon = weather_display.load_svg_icon(ICONS_DIR / "sun.svg", (28, 28), _IconDisplay(True))
+    # A new display object and a fresh process share the on-disk raster
+    weather_display._load_svg_icon.cache_clear()
+    again = weather_display.load_svg_icon(ICONS_DIR / "sun.svg", (28, 28), _IconDisplay(True))
+    colour = weather_display.load_svg_icon(ICONS_DIR / "sun.svg", (28, 28), _IconDisplay(False))
+
+    assert calls == [("sun.svg", (28, 28), True), ("sun.svg", (28, 28), False)]
+    assert again.tobytes() == icon.tobytes()
+    assert (again.mode, colour.mode) == ('1', 'RGB')
+    assert len(list(icon_cache.glob("*.png"))) == 2
+
+
+def test_cached_svg_icon_loads_without_cairosvg(icon_cache, monkeypatch):
+    import sys
+    from PIL import Image
+    import weather.display as weather_display
+    from weather.icons import ICONS_DIR, cached_icon_path, write_cached_icon
+
+    svg_path = ICONS_DIR / "cloud.svg"
+    write_cached_icon(cached_icon_path(svg_path, (46, 46), 'RGB'), Image.new('RGB', (46, 46), (255, 0, 0)))
+    monkeypatch.setitem(sys.modules, "cairosvg", None)
+
+    icon = weather_display.load_svg_icon(svg_path, (46, 46), _IconDisplay(False))
+
+    assert icon.getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_mismatched_cached_icon_is_rasterized_again(icon_cache, monkeypatch):
+    from PIL import Image
+    import weather.display as weather_display
+    from weather.icons import ICONS_DIR, cached_icon_path
+
+    svg_path = ICONS_DIR / "moon.svg"
+    path = cached_icon_path(svg_path, (20, 20), '1')
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a png")
+    monkeypatch.setattr(
+        weather_display, "_rasterize_svg_icon",
+        lambda svg_path, size, bw: Image.new('1', size, 1),
+    )
+
+    icon = weather_display.load_svg_icon(svg_path, (20, 20), _IconDisplay(True))
+
+    assert icon.size == (20, 20)
+    assert Image.open(path).mode == '1'
@@ -236,3 +236,16 @@ def test_skipped_slot_does_not_consume_next_view(monkeypatch):
     assert plugin.views.index(rendered[-1][1]) == (
         plugin.views.index(first_view) + 1
     ) % len(plugin.views)
+
+
+def test_idle_runtime_ticks_sleep_until_the_next_glance_window(monkeypatch):
+    plugin = _plugin(monkeypatch, [])
+    start = datetime(2026, 7, 12, 8, 15)
+
+    assert plugin._seconds_until_due(start - timedelta(minutes=5)) == 300
+    plugin.tick(start, _snapshot())
+    assert plugin._seconds_until_due(start + timedelta(seconds=30)) == 1
+    # The tick that ends the window still runs, to release the claim.
+    assert plugin._seconds_until_due(start + timedelta(seconds=60)) == 1
+    plugin.tick(start + timedelta(seconds=60), _snapshot())
+    assert plugin._seconds_until_due(start + timedelta(seconds=60)) == 1740
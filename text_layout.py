@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import weakref
 from dataclasses import dataclass
-from functools import lru_cache
+from threading import Lock
 
 from PIL import ImageDraw, ImageFont
 
+from font_utils import load_font
+
+# Measurements are kept per font object and dropped with it; the registry in
+# font_utils keeps faces alive, so repeated renders share one table per face.
+MAX_MEASUREMENTS_PER_FONT = 4096
+_measurements: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_measurements_lock = Lock()
+
 
 @dataclass(frozen=True)
 class FittedText:
@@ -20,33 +29,85 @@ class FittedText:
     truncated: bool = False
 
 
-@lru_cache(maxsize=128)
 def _truetype(font_path: str, size: int):
-    return ImageFont.truetype(font_path, size)
+    return load_font(font_path, size)
 
 
 def _normalize(text: str) -> str:
     return " ".join(str(text).split())
 
 
-def _ellipsize(draw, text: str, font, max_width: int) -> str:
+def measure_text(draw, text: str, font) -> tuple[int, int, int, int]:
+    """Return ``draw.textbbox((0, 0), text, font=font)``, memoized per font.
+
+    Bounding boxes depend only on the font, the text and the draw's font mode
+    (anti-aliased or 1-bit), so the same glyph run is measured once no matter
+    how many sizes, wraps or frames ask for it.
+    """
+    key = (draw.fontmode, text)
+    try:
+        with _measurements_lock:
+            table = _measurements.setdefault(font, {})
+            bounds = table.get(key)
+    except TypeError:
+        # Objects that cannot be weakly referenced are measured every time.
+        return draw.textbbox((0, 0), text, font=font)
+    if bounds is None:
+        bounds = draw.textbbox((0, 0), text, font=font)
+        with _measurements_lock:
+            if len(table) >= MAX_MEASUREMENTS_PER_FONT:
+                table.clear()
+            table[key] = bounds
+    return bounds
+
+
+def text_width(draw, text: str, font) -> int:
+    """Right edge of ``text`` drawn at the origin, as used for fitting."""
+    return measure_text(draw, text, font)[2]
+
+
+def longest_fitting_prefix(
+    draw, text: str, font, max_width: int, suffix: str = ""
+) -> int:
+    """Return the largest ``n`` with ``text[:n] + suffix`` within ``max_width``.
+
+    Glyph runs only grow as characters are appended, so the prefix widths are
+    bisected instead of trimming and re-measuring one character at a time.
+    Returns 0 when even the bare suffix does not fit.
+    """
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if text_width(draw, text[:middle] + suffix, font) <= max_width:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def ellipsize(draw, text: str, font, max_width: int) -> str:
+    """Collapse whitespace and shorten ``text`` with "…" to fit ``max_width``."""
     text = _normalize(text)
-    if draw.textbbox((0, 0), text, font=font)[2] <= max_width:
+    if text_width(draw, text, font) <= max_width:
         return text
     suffix = "…"
-    while text and draw.textbbox((0, 0), text + suffix, font=font)[2] > max_width:
-        text = text[:-1]
+    text = text[: longest_fitting_prefix(draw, text, font, max_width, suffix)]
     return text.rstrip() + suffix if text else suffix
 
 
-def _wrap_all(draw, text: str, font, max_width: int) -> list[str]:
+def _wrap_all(
+    draw, text: str, font, max_width: int, line_limit: int | None = None
+) -> list[str]:
+    """Greedily wrap words; stop once more than ``line_limit`` lines exist."""
     words = _normalize(text).split()
     lines: list[str] = []
     current = ""
     for word in words:
         candidate = f"{current} {word}".strip()
-        if current and draw.textbbox((0, 0), candidate, font=font)[2] > max_width:
+        if current and text_width(draw, candidate, font) > max_width:
             lines.append(current)
+            if line_limit is not None and len(lines) > line_limit:
+                return lines
             current = word
         else:
             current = candidate
@@ -56,7 +117,7 @@ def _wrap_all(draw, text: str, font, max_width: int) -> list[str]:
 
 
 def _line_metrics(draw, font, spacing: int) -> tuple[int, int]:
-    bounds = draw.textbbox((0, 0), "Ag", font=font)
+    bounds = measure_text(draw, "Ag", font)
     line_bottom = max(1, bounds[3])
     line_advance = max(1, bounds[3] - bounds[1] + spacing)
     return line_advance, line_bottom
@@ -67,7 +128,7 @@ def _fits(draw, lines, font, max_width, max_height, max_lines, spacing):
         return True, 1
     if max_lines is not None and len(lines) > max_lines:
         return False, 1
-    if any(draw.textbbox((0, 0), line, font=font)[2] > max_width for line in lines):
+    if any(text_width(draw, line, font) > max_width for line in lines):
         return False, 1
     advance, bottom = _line_metrics(draw, font, spacing)
     height = (len(lines) - 1) * advance + bottom
@@ -88,7 +149,8 @@ def fit_wrapped_text(
 ) -> FittedText:
     """Choose the largest font that contains all text inside the given bounds.
 
-    Font sizes are tried progressively from ``min_size`` through ``max_size``.
+    The largest fitting size between ``min_size`` and ``max_size`` is found by
+    bisection, with every glyph run measured once through ``measure_text``.
     If the text cannot fit even at the minimum, the minimum-size result is
     clipped to the available line count and ellipsized.
     """
@@ -108,39 +170,53 @@ def fit_wrapped_text(
             min(height_lines, max_lines) if max_lines is not None else height_lines
         )
         truncated = len(lines) > line_limit or any(
-            draw.textbbox((0, 0), line, font=font)[2] > max_width for line in lines
+            text_width(draw, line, font) > max_width for line in lines
         )
         visible = lines[:line_limit]
         if truncated:
-            visible[-1] = _ellipsize(draw, visible[-1] + "…", font, max_width)
+            visible[-1] = ellipsize(draw, visible[-1] + "…", font, max_width)
         height = (len(visible) - 1) * advance + bottom
         return FittedText(font, tuple(visible), advance, min_size, height, truncated)
 
-    first_font = None
-    best = None
-    for size in range(min_size, max_size + 1):
-        try:
-            font = _truetype(font_path, size)
-        except OSError:
-            # A bitmap fallback cannot be progressively resized. Return it as
-            # the minimum-size layout instead of pretending it reached max_size.
-            return minimum_result(ImageFont.load_default())
-        if first_font is None:
-            first_font = font
-        lines = _wrap_all(draw, text, font, max_width)
+    def layout(size: int):
+        """Return (font, fitted text or None) for one candidate size."""
+        font = _truetype(font_path, size)
+        advance, bottom = _line_metrics(draw, font, spacing)
+        # Wrapping past the lines the area can hold cannot change the verdict.
+        line_limit = 1 + (max_height - bottom) // advance if bottom <= max_height else 0
+        if max_lines is not None:
+            line_limit = min(line_limit, max_lines)
+        lines = _wrap_all(draw, text, font, max_width, line_limit)
         fits, advance = _fits(
             draw, lines, font, max_width, max_height, max_lines, spacing
         )
         if not fits:
-            # Larger fonts cannot recover width, height, or line-count space.
-            break
-        _, bottom = _line_metrics(draw, font, spacing)
+            return font, None
         height = (len(lines) - 1) * advance + bottom if lines else 0
-        best = FittedText(font, tuple(lines), advance, size, height)
-        if not hasattr(font, "size"):
-            break
-
-    if best is not None:
+        return font, FittedText(font, tuple(lines), advance, size, height)
+
+    try:
+        first_font, best = layout(min_size)
+    except OSError:
+        # A bitmap fallback cannot be progressively resized. Return it as
+        # the minimum-size layout instead of pretending it reached max_size.
+        return minimum_result(ImageFont.load_default())
+    if best is None:
+        return minimum_result(first_font)
+    if not hasattr(first_font, "size"):
         return best
 
-    return minimum_result(first_font)
+    # Larger fonts cannot recover width, height, or line-count space, so the
+    # fitting sizes form a prefix of the range and can be bisected.
+    low, high = min_size, max_size
+    while low < high:
+        middle = (low + high + 1) // 2
+        try:
+            _, fitted = layout(middle)
+        except OSError:
+            return minimum_result(ImageFont.load_default())
+        if fitted is None:
+            high = middle - 1
+        else:
+            low, best = middle, fitted
+    return best
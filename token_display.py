@@ -8,7 +8,8 @@ from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
 
 from display_adapter import return_display_lock
-from font_utils import get_font_paths
+from font_utils import get_font
+from panel_orientation import panel_frame
 from token_usage import RateWindow, TokenUsageSnapshot
 
 display_lock = return_display_lock()
@@ -16,13 +17,12 @@ DISPLAY_SCREEN_ROTATION = int(os.getenv("screen_rotation", 90))
 
 
 def _fonts():
-    paths = get_font_paths()
     try:
         return (
-            ImageFont.truetype(paths["dejavu_bold"], 14),
-            ImageFont.truetype(paths["dejavu_bold"], 22),
-            ImageFont.truetype(paths["dejavu"], 11),
-            ImageFont.truetype(paths["dejavu_bold"], 10),
+            get_font("dejavu_bold", 14),
+            get_font("dejavu_bold", 22),
+            get_font("dejavu", 11),
+            get_font("dejavu_bold", 10),
         )
     except OSError:
         fallback = ImageFont.load_default()
@@ -39,7 +39,7 @@ def _canvas(epd):
 
 
 def _finish(epd, image, set_base_image: bool):
-    image = image.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    image = panel_frame(epd, image, DISPLAY_SCREEN_ROTATION)
     with display_lock:
         buffer = epd.getbuffer(image)
         if hasattr(epd, "displayPartial"):
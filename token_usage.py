@@ -346,6 +346,16 @@ class TokenUsageClient:
                 self._snapshot.stale = True
         return self._apply_reset_notice(self._snapshot, now)
 
+    def cached_snapshot(self) -> Optional[TokenUsageSnapshot]:
+        """The last fetched snapshot, without touching the source.
+
+        Render paths read this under the display lock; ``get_snapshot`` runs
+        on a ``SnapshotWorker`` instead.
+        """
+        if not self.enabled:
+            return None
+        return self._apply_reset_notice(self._snapshot, time.monotonic())
+
     def _apply_reset_notice(
         self, snapshot: Optional[TokenUsageSnapshot], now: float
     ) -> Optional[TokenUsageSnapshot]:
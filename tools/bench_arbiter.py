@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark ScreenArbiter claim, release and active_owner under contention.
+
+For each ``--claimants`` count, that many threads share one arbiter for
+``--duration`` seconds. Each thread refreshes its claim (random priority, short
+TTL so some expire), asks for the active owner and now and then releases its
+claim, the way plugin loops do. The report gives operations per second and
+latency percentiles per operation, plus the arbiter's generation count, which
+is how many times a waiting plugin would have been woken.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from screen_arbiter import ScreenArbiter
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench_claimants(claimants: int, duration: float, ttl: float) -> dict:
+    arbiter = ScreenArbiter()
+    latencies: dict[str, list[float]] = {"claim": [], "active_owner": [], "release": []}
+    lock = threading.Lock()
+    start = threading.Barrier(claimants + 1)
+    deadline = [0.0]
+
+    def claimant(index: int) -> None:
+        rng = random.Random(index)
+        owner = f"plugin-{index}"
+        samples: dict[str, list[float]] = {name: [] for name in latencies}
+        start.wait()
+        while time.perf_counter() < deadline[0]:
+            started = time.perf_counter()
+            arbiter.claim(owner, rng.choice([10, 30, 50, 99]), rng.uniform(0.1, ttl))
+            samples["claim"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            arbiter.active_owner()
+            samples["active_owner"].append(time.perf_counter() - started)
+            if rng.random() < 0.1:
+                started = time.perf_counter()
+                arbiter.release(owner)
+                samples["release"].append(time.perf_counter() - started)
+        with lock:
+            for name, values in samples.items():
+                latencies[name].extend(values)
+
+    threads = [
+        threading.Thread(target=claimant, args=(index,), daemon=True)
+        for index in range(claimants)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline[0] = time.perf_counter() + duration
+    start.wait()
+    for thread in threads:
+        thread.join()
+
+    operations = sum(len(samples) for samples in latencies.values())
+    return {
+        "claimants": claimants,
+        "operations_per_second": round(operations / duration),
+        "ownership_generations": arbiter.generation,
+        "latency_us": {
+            name: {
+                "count": len(samples),
+                "p50": round(percentile(samples, 0.50) * 1e6, 1),
+                "p99": round(percentile(samples, 0.99) * 1e6, 1),
+                "max": round(max(samples) * 1e6, 1),
+            }
+            for name, samples in latencies.items()
+            if samples
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--claimants", type=int, nargs="+", default=[8, 64, 512])
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument(
+        "--ttl", type=float, default=2.0, help="longest claim TTL in seconds"
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+    if min(args.claimants) < 1 or args.duration <= 0 or args.ttl <= 0.1:
+        parser.error("--claimants, --duration and --ttl must be positive")
+
+    report = {
+        "duration_seconds": args.duration,
+        "results": [
+            bench_claimants(count, args.duration, args.ttl) for count in args.claimants
+        ],
+    }
+    for result in report["results"]:
+        latency = result["latency_us"]
+        print(
+            f"{result['claimants']} claimants: "
+            f"{result['operations_per_second']} ops/s, "
+            f"claim p99 {latency['claim']['p99']} us, "
+            f"active_owner p99 {latency['active_owner']['p99']} us, "
+            f"{result['ownership_generations']} generations"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
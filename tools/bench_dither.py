@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Compare the cached bulk dither engine with the former per-pixel draw.point loops."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from PIL import Image, ImageDraw
+
+from display_adapter import MockDisplay
+from color_utils import find_optimal_colors
+from dithering import (
+    dither_tile_cache_stats,
+    draw_dithered_box,
+    draw_multicolor_dither,
+    process_icon_for_epd,
+)
+
+
+# Transit line boxes are 50+ px wide and 25-40 px high; the last case is a
+# 4x4 block the icon path used to dither one at a time.
+BOX_SIZES = [(50, 40), (80, 30), (50, 25), (4, 4)]
+LINE_COLORS = [('red', 0.55), ('black', 0.25), ('white', 0.2)]
+# Current and forecast weather icon sizes from weather/display.py.
+ICON_SIZES = [(46, 46), (28, 28)]
+ICON_SVG = ROOT / "weather" / "icons" / "cloud-sun.svg"
+
+
+def legacy_dithered_box(draw, x, y, width, height, primary, secondary, ratio):
+    """The draw_dithered_box background loop before the bulk engine."""
+    primary_pixel_count = 0
+    for i in range(width):
+        for j in range(height):
+            offset = (j % 2) * 1
+            use_primary = ((i + offset + j) % 2 == 0) if (i + j) / (width + height) < ratio else \
+                         ((i + offset + j) % 2 != 0)
+            if use_primary:
+                primary_pixel_count += 1
+            draw.point((x + i, y + j), fill=primary if use_primary else secondary)
+    draw.rectangle([x, y, x + width - 1, y + height - 1], outline=primary)
+    return primary_pixel_count
+
+
+def legacy_multicolor_dither(draw, x, y, width, height, fills_with_ratios):
+    """The draw_multicolor_dither pixel loop before the bulk engine."""
+    cumulative_ratios = []
+    cumsum = 0
+    for fill, ratio in fills_with_ratios:
+        cumsum += ratio
+        cumulative_ratios.append((fill, cumsum))
+    for i in range(width):
+        for j in range(height):
+            offset = (j % 2) * 1
+            pattern_value = ((i + offset + j) % 4) / 4.0
+            noise = ((i * 37 + j * 17) % 7) / 28.0
+            selection_value = (pattern_value + noise) % 1.0
+            chosen = fills_with_ratios[-1][0]
+            for fill, cumulative_ratio in cumulative_ratios:
+                if selection_value <= cumulative_ratio:
+                    chosen = fill
+                    break
+            draw.point((x + i, y + j), fill=chosen)
+    dominant = max(fills_with_ratios, key=lambda item: item[1])[0]
+    draw.rectangle([x, y, x + width - 1, y + height - 1], outline=dominant)
+
+
+def legacy_process_icon(icon, display, fills):
+    """The block-wise process_icon_for_epd before the whole-image quantizer."""
+    processed = Image.new("RGB", icon.size, display.WHITE)
+    draw = ImageDraw.Draw(processed)
+    width, height = icon.size
+    for x in range(0, width, 4):
+        for y in range(0, height, 4):
+            block = icon.crop((x, y, min(x + 4, width), min(y + 4, height)))
+            r, g, b, valid_pixels = 0, 0, 0, 0
+            for j in range(block.height):
+                for i in range(block.width):
+                    px = block.getpixel((i, j))
+                    if px[3] > 128:
+                        r += px[0]
+                        g += px[1]
+                        b += px[2]
+                        valid_pixels += 1
+            if valid_pixels == 0:
+                continue
+            avg_color = (r // valid_pixels, g // valid_pixels, b // valid_pixels)
+            colors_with_ratios = find_optimal_colors(avg_color, display)
+            block_width, block_height = min(4, width - x), min(4, height - y)
+            if len(colors_with_ratios) == 1:
+                draw.rectangle(
+                    [x, y, x + block_width - 1, y + block_height - 1],
+                    fill=fills[colors_with_ratios[0][0]],
+                )
+                continue
+            legacy_multicolor_dither(
+                draw, x, y, block_width, block_height,
+                [(fills[color], ratio) for color, ratio in colors_with_ratios],
+            )
+    return processed
+
+
+def load_icon(size):
+    """Rasterize a real weather icon, or draw a stand-in without cairo."""
+    try:
+        import cairosvg
+        from io import BytesIO
+
+        png_data = cairosvg.svg2png(
+            url=str(ICON_SVG),
+            output_width=size[0],
+            output_height=size[1],
+            background_color="transparent",
+        )
+        return Image.open(BytesIO(png_data)).convert("RGBA")
+    except (ImportError, OSError):
+        icon = Image.new("RGBA", size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(icon)
+        draw.ellipse([2, 2, size[0] // 2 + 6, size[1] // 2 + 6], fill=(255, 200, 0, 255))
+        draw.ellipse([size[0] // 4, size[1] // 3, size[0] - 2, size[1] - 4], fill=(120, 120, 140, 255))
+        return icon
+
+
+def best_of(function, iterations: int, repeats: int = 3) -> float:
+    """Return the best mean seconds per call over a few repeats."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["mock_display_type"] = "bwr"
+    display = MockDisplay()
+    fills = {
+        "black": display.BLACK,
+        "white": display.WHITE,
+        "red": display.RED,
+        "yellow": display.YELLOW,
+    }
+    fills_with_ratios = [(fills[color], ratio) for color, ratio in LINE_COLORS]
+    image = Image.new("RGB", (display.height, display.width), display.WHITE)
+    draw = ImageDraw.Draw(image)
+
+    print(f"{'case':<28}{'legacy ms':>12}{'engine ms':>12}{'speedup':>10}")
+    for width, height in BOX_SIZES:
+        cases = [
+            (
+                f"dithered_box {width}x{height}",
+                lambda: legacy_dithered_box(
+                    draw, 10, 10, width, height, display.RED, display.WHITE, 0.6
+                ),
+                lambda: draw_dithered_box(
+                    draw, display, 10, 10, width, height, "", "red", "white", 0.6, None
+                ),
+            ),
+            (
+                f"multicolor {width}x{height}",
+                lambda: legacy_multicolor_dither(
+                    draw, 10, 10, width, height, fills_with_ratios
+                ),
+                lambda: draw_multicolor_dither(
+                    draw, display, 10, 10, width, height, LINE_COLORS
+                ),
+            ),
+        ]
+        for name, legacy, engine in cases:
+            legacy_seconds = best_of(legacy, args.iterations)
+            engine_seconds = best_of(engine, args.iterations)
+            print(
+                f"{name:<28}{legacy_seconds * 1000:>12.3f}"
+                f"{engine_seconds * 1000:>12.3f}"
+                f"{legacy_seconds / engine_seconds:>9.1f}x"
+            )
+    for width, height in ICON_SIZES:
+        icon = load_icon((width, height))
+        legacy_seconds = best_of(
+            lambda: legacy_process_icon(icon, display, fills), args.iterations // 10 or 1
+        )
+        engine_seconds = best_of(
+            lambda: process_icon_for_epd(icon, display), args.iterations // 10 or 1
+        )
+        print(
+            f"{f'icon {width}x{height}':<28}{legacy_seconds * 1000:>12.3f}"
+            f"{engine_seconds * 1000:>12.3f}"
+            f"{legacy_seconds / engine_seconds:>9.1f}x"
+        )
+    print(f"tile cache: {dither_tile_cache_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Count TrueType loads per rendered frame with and without the shared font registry."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# The transit frame renders without weather so the benchmark needs no API key,
+# and the debug PNG is written once rather than on every frame.
+os.environ.setdefault("weather_enabled", "false")
+os.environ.setdefault("debug_image_min_interval_seconds", "3600")
+os.environ.setdefault("mock_display_type", "bwr")
+
+from PIL import ImageFont
+
+import bus_service
+import font_utils
+from display_adapter import MockDisplay
+
+
+BUS_DATA = [
+    {
+        "line": "2",
+        "times": ["3", "7", "12"],
+        "colors": [("red", 0.6), ("white", 0.4)],
+        "messages": [None, None, None],
+    },
+    {
+        "line": "6",
+        "times": ["1", "9"],
+        "colors": [("black", 0.7), ("white", 0.3)],
+        "messages": [None, "Last"],
+    },
+]
+
+
+class TruetypeCounter:
+    """Count ImageFont.truetype calls made while rendering."""
+
+    def __init__(self):
+        self.calls = 0
+        self._truetype = ImageFont.truetype
+
+    def __enter__(self):
+        def counting_truetype(*args, **kwargs):
+            self.calls += 1
+            return self._truetype(*args, **kwargs)
+
+        ImageFont.truetype = counting_truetype
+        return self
+
+    def __exit__(self, *exc_info):
+        ImageFont.truetype = self._truetype
+
+
+def render_frames(display, frames: int, per_frame_loading: bool) -> tuple[float, float]:
+    """Return (ms per frame, TrueType loads per frame)."""
+    with TruetypeCounter() as counter:
+        started = time.perf_counter()
+        for _ in range(frames):
+            if per_frame_loading:
+                # Every renderer used to open its faces again on each frame.
+                font_utils.load_font.cache_clear()
+            bus_service.update_display(display, None, BUS_DATA, stop_name="Bel-Air")
+        elapsed = time.perf_counter() - started
+    return elapsed / frames * 1000, counter.calls / frames
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        display = MockDisplay()
+        bus_service.update_display(display, None, BUS_DATA, stop_name="Bel-Air")
+
+        print(f"{'mode':<20}{'ms/frame':>10}{'loads/frame':>14}")
+        for name, per_frame_loading in (("per-frame loading", True), ("shared registry", False)):
+            ms, loads = render_frames(display, args.frames, per_frame_loading)
+            print(f"{name:<20}{ms:>10.2f}{loads:>14.1f}")
+    print(f"font cache: {font_utils.font_cache_info()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark FramePublisher throughput and disk writes per hour of rendering.
+
+An hour of renders is replayed on simulated clocks: a frame every
+``--render-interval`` seconds, of which every ``--change-every``-th differs
+from the last (a minute countdown rendered every 30 seconds changes every
+second render). Each ``--flush-intervals`` value is measured separately and
+reported as publishes per second of wall time, plus the flushes, fsync'd files
+and bytes written during the simulated hour.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from display_protocol import FRAME_HEIGHT, FRAME_WIDTH, FramePublisher
+
+START = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def countdown_frame(minutes: int) -> Image.Image:
+    image = Image.new("1", (FRAME_WIDTH, FRAME_HEIGHT), 1)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, FRAME_WIDTH - 1, 22), fill=0)
+    draw.text((10, 40), "Line 71  Delta", fill=0)
+    draw.text((200, 40), f"{minutes % 60} min", fill=0)
+    return image
+
+
+def bench_flush_interval(
+    flush_interval: float, *, render_interval: float, change_every: int, hours: float
+) -> dict:
+    renders = int(hours * 3600 / render_interval)
+    frames = [countdown_frame(index) for index in range(renders // change_every + 1)]
+    elapsed = [0.0]
+    with tempfile.TemporaryDirectory(prefix="bench-publish-") as directory:
+        publisher = FramePublisher(
+            directory,
+            clock=lambda: START + timedelta(seconds=elapsed[0]),
+            flush_interval_seconds=flush_interval,
+            monotonic=lambda: elapsed[0],
+        )
+        started = time.perf_counter()
+        for render in range(renders):
+            elapsed[0] = render * render_interval
+            publisher.publish(frames[render // change_every])
+        wall = time.perf_counter() - started
+        publisher.close()
+        stats = publisher.stats()
+    return {
+        "flush_interval_seconds": flush_interval,
+        "renders": renders,
+        "new_sequences": stats["published"],
+        "unchanged": stats["unchanged"],
+        "publishes_per_second": round(renders / wall, 1),
+        "flushes_per_hour": round(stats["flushes"] / hours, 1),
+        "bytes_written_per_hour": round(stats["bytes_written"] / hours),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--render-interval", type=float, default=30.0)
+    parser.add_argument("--change-every", type=int, default=2)
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument(
+        "--flush-intervals", type=float, nargs="+", default=[0.0, 30.0, 300.0]
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+    if args.render_interval <= 0 or args.change_every < 1 or args.hours <= 0:
+        parser.error("intervals, --change-every and --hours must be positive")
+
+    report = {
+        "render_interval_seconds": args.render_interval,
+        "change_every": args.change_every,
+        "results": [
+            bench_flush_interval(
+                interval,
+                render_interval=args.render_interval,
+                change_every=args.change_every,
+                hours=args.hours,
+            )
+            for interval in args.flush_intervals
+        ],
+    }
+    for result in report["results"]:
+        print(
+            "flush every {flush_interval_seconds:g}s: {publishes_per_second}/s, "
+            "{new_sequences} new of {renders} renders, "
+            "{flushes_per_hour} flushes/h, {bytes_written_per_hour} B/h".format(**result)
+        )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""Benchmark every screen renderer on MockDisplay and catch render regressions.
+
+Each screen is rendered from deterministic fixtures in B&W and colour mock
+modes. Wall time (p50/p95), the tracemalloc peak of one render (Python heap
+only; Pillow pixel buffers show up in peak RSS) and the process peak RSS are
+written as JSON. ``--compare`` fails when a screen got slower or hungrier
+than a saved baseline by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Renderers must not spend the benchmark writing debug PNGs, and the weather
+# screen's moon phase reuses the ephemeris already downloaded into the checkout
+# even though the benchmark runs from a scratch directory.
+os.environ.setdefault("debug_image_min_interval_seconds", "3600")
+os.environ.setdefault("skyfield_data_dir", str(ROOT / "cache" / "skyfield"))
+
+from breaking_news_display import draw_breaking_news
+from bus_service import update_display
+from calendar_display import draw_calendar_agenda, draw_upcoming_event
+from calendar_service import CalendarEvent
+from display_adapter import MockDisplay
+from flight_statistics import (
+    update_display_with_flight_records,
+    update_display_with_flight_statistics,
+)
+from flights import update_display_with_flights, update_display_with_recent_flights
+from home_assistant_display import draw_home_assistant_screen
+from home_assistant_models import parse_config
+from home_assistant_service import EntityState
+from iss import display_iss_info, display_next_iss_pass
+from rss_display import draw_feed_entry
+from rss_service import FeedEntry
+from token_display import draw_month_usage, draw_usage_limits
+from token_usage import TokenUsageSnapshot
+from weather.display import draw_weather_display
+from weather.models import (
+    AirQuality,
+    CurrentWeather,
+    DailyForecast,
+    TemperatureUnit,
+    WeatherCondition,
+    WeatherData,
+)
+from ynab_budget import YnabSnapshot
+from ynab_display import draw_ynab_view
+
+
+MODES = {"bw": "bw", "colour": "bwr"}
+COMPARED_METRICS = ("p50_ms", "p95_ms", "alloc_peak_kib")
+
+NOW = datetime(2026, 7, 11, 9, 20, tzinfo=ZoneInfo("Europe/Brussels"))
+UTC_NOW = datetime(2026, 7, 11, 12, 0, tzinfo=timezone.utc)
+
+CONDITION = WeatherCondition(description="Partly cloudy", icon="cloud-sun")
+WEATHER = WeatherData(
+    current=CurrentWeather(
+        temperature=15.3,
+        feels_like=14.8,
+        humidity=65,
+        pressure=1015,
+        condition=CONDITION,
+        unit=TemperatureUnit.CELSIUS,
+    ),
+    air_quality=AirQuality(aqi=2, label="Fair", components={"pm2_5": 11.2}),
+    daily_forecast=[
+        DailyForecast(
+            date=datetime(2026, 7, 11 + day),
+            min_temp=8 + day,
+            max_temp=16 + day,
+            condition=CONDITION,
+        )
+        for day in range(1, 4)
+    ],
+    sunrise=datetime(2026, 7, 11, 5, 45),
+    sunset=datetime(2026, 7, 11, 21, 55),
+    is_day=True,
+)
+
+BUS_DATA = [
+    {
+        "line": "2",
+        "times": ["3", "7", "12"],
+        "colors": [("red", 0.6), ("white", 0.4)],
+        "messages": [None, None, None],
+    },
+    {
+        "line": "6",
+        "times": ["1", "9"],
+        "colors": [("black", 0.7), ("white", 0.3)],
+        "messages": [None, "Last"],
+    },
+]
+
+FLIGHT = {
+    "operator_name": "Brussels Airlines",
+    "flight_number": "SN2093",
+    "callsign": "BEL2093",
+    "registration": "OO-SSA",
+    "origin_code": "BRU",
+    "origin_city": "Brussels",
+    "destination_code": "LHR",
+    "destination_city": "London",
+    "last_distance": 2.4,
+    "manufacturer": "Airbus",
+    "type": "A320",
+    "altitude": 3200,
+}
+RECENT_FLIGHTS = [
+    {
+        "callsign": "BEL123",
+        "origin_code": "BRU",
+        "destination_code": "LHR",
+        "observed_at": datetime(2026, 7, 11, 9, 5),
+    },
+    {"registration": "OO-ABC", "observed_at": datetime(2026, 7, 11, 9, 4)},
+    {
+        "callsign": "RYR4KX",
+        "origin_code": "CRL",
+        "destination_code": "MAD",
+        "observed_at": datetime(2026, 7, 11, 8, 51),
+    },
+]
+FLIGHT_SUMMARY = {
+    "label": "This week",
+    "encounters": 12,
+    "unique_aircraft": 8,
+    "top_routes": [("BRU>LHR", 4)],
+    "top_operators": [("Brussels Airlines", 5)],
+    "top_types": [("Airbus A320", 4)],
+    "repeat": ("OO-ABC", 3),
+    "busiest_hour": (9, 4),
+}
+FLIGHT_RECORDS = {
+    "encounters": 12,
+    "oldest": {"label": "OO-OLD", "year": 1998},
+    "youngest": {"label": "OO-NEW", "year": 2024},
+    "repeat": ("OO-ABC", 3),
+    "closest": ("OO-NEAR", 0.8),
+    "fastest": ("OO-FAST", 475),
+}
+
+ISS_PASS = {
+    "risetime": int(UTC_NOW.timestamp()) + 3700,
+    "duration": 362,
+    "position": {"max": {"direction": "SE", "altitude": 48.2}},
+    "darkness": {"fully_dark": True},
+}
+ISS_INFO = {
+    "latitude": 50.8,
+    "longitude": 4.4,
+    "altitude": 418.2,
+    "distance": 912.4,
+    "azimuth": 134.0,
+    "visible_until_human": "21:42",
+}
+
+REVIEW = CalendarEvent(
+    uid="weekly-review",
+    summary="Weekly product review and planning",
+    start=NOW + timedelta(minutes=10),
+    end=NOW + timedelta(minutes=55),
+    location="Meeting room 12",
+)
+AGENDA = [
+    REVIEW,
+    CalendarEvent(
+        uid="lunch",
+        summary="Lunch with Sam",
+        start=NOW + timedelta(hours=3, minutes=10),
+        end=NOW + timedelta(hours=4),
+    ),
+    CalendarEvent(
+        uid="train",
+        summary="Train to Brussels",
+        start=NOW + timedelta(days=1, hours=5),
+        end=NOW + timedelta(days=1, hours=6),
+    ),
+]
+
+ARTICLE = FeedEntry(
+    key="rss-demo",
+    source_url="https://example.test/feed.xml",
+    kind="rss",
+    publication="Transit Updates",
+    title="Weekend service changes begin this evening across the city",
+    author="Operations desk",
+    published=datetime(2026, 7, 11, 9, 5, tzinfo=timezone.utc),
+)
+BREAKING = FeedEntry(
+    key="breaking-1",
+    source_url="https://example.test/feed",
+    kind="breaking",
+    publication="Example News Wire",
+    title=(
+        "Breaking: a sufficiently long headline wraps cleanly across "
+        "the compact e-paper display"
+    ),
+    published=datetime(2026, 7, 11, 10, 0, tzinfo=timezone.utc),
+)
+
+TOKEN_USAGE = TokenUsageSnapshot.from_dict(
+    {
+        "generated_at": NOW.isoformat(),
+        "active": True,
+        "currency": "USD",
+        "limits": {
+            "resets_available": 2,
+            "primary": {"used_percent": 18, "resets_at": "2026-07-11T13:00:00Z"},
+            "secondary": {"used_percent": 45, "resets_at": "2026-07-14T15:00:00Z"},
+        },
+        "month_to_date": {"cost_usd": 124, "total_tokens": 234_000_000},
+        "daily": [
+            {"date": f"2026-07-{day:02d}", "cost_usd": cost, "total_tokens": 0}
+            for day, cost in enumerate((8, 13, 9, 18, 14, 22, 17, 23, 20, 31, 27), 1)
+        ],
+    }
+)
+
+YNAB = YnabSnapshot.from_dict(
+    {
+        "generated_at": "2026-07-11T10:42:00+02:00",
+        "month": "2026-07-01",
+        "currency_symbol": "€",
+        "categories": [
+            {"name": "Dining", "group": "Food", "assigned": 400, "activity": -82.43, "available": 317.57},
+            {"name": "Groceries", "group": "Food", "assigned": 400, "activity": -18.24, "available": 381.76},
+            {"name": "Gadgets", "group": "Fun", "assigned": 150, "activity": -92.51, "available": 138.57},
+            {"name": "Holiday", "group": "Savings Goals", "assigned": 500, "activity": 0, "available": 2500},
+            {"name": "Uncategorized", "group": "Internal", "assigned": 0, "activity": -85.51, "available": -85.51},
+        ],
+    }
+)
+
+HOME_ASSISTANT = parse_config(
+    {
+        "screens": [
+            {
+                "id": "climate",
+                "type": "temperatures",
+                "title": "Temperatures",
+                "entities": [
+                    {"entity_id": "sensor.living_room", "label": "Living room"},
+                    {"entity_id": "sensor.bedroom", "label": "Bedroom"},
+                    {"entity_id": "sensor.outside", "label": "Outside"},
+                ],
+            }
+        ]
+    }
+).screens[0]
+HOME_ASSISTANT_STATES = {
+    entity_id: EntityState.from_message(
+        {
+            "entity_id": entity_id,
+            "state": state,
+            "attributes": {"unit_of_measurement": "°C"},
+            "last_updated": "2026-07-11T09:15:00Z",
+        },
+        monotonic=0.0,
+    )
+    for entity_id, state in (
+        ("sensor.living_room", "21.4"),
+        ("sensor.bedroom", "19.8"),
+        ("sensor.outside", "unavailable"),
+    )
+}
+
+SCREENS = {
+    "transit": lambda epd: update_display(epd, WEATHER, BUS_DATA, stop_name="Bel-Air"),
+    "weather": lambda epd: draw_weather_display(epd, WEATHER),
+    "flight": lambda epd: update_display_with_flights(epd, [FLIGHT]),
+    "recent_flights": lambda epd: update_display_with_recent_flights(epd, RECENT_FLIGHTS),
+    "flight_statistics": lambda epd: update_display_with_flight_statistics(epd, FLIGHT_SUMMARY),
+    "flight_records": lambda epd: update_display_with_flight_records(epd, FLIGHT_RECORDS),
+    "iss_pass": lambda epd: display_next_iss_pass(epd, ISS_PASS, now=UTC_NOW),
+    "iss_info": lambda epd: display_iss_info(epd, ISS_INFO),
+    "calendar_event": lambda epd: draw_upcoming_event(epd, REVIEW, NOW),
+    "calendar_agenda": lambda epd: draw_calendar_agenda(epd, AGENDA, NOW),
+    "rss": lambda epd: draw_feed_entry(epd, ARTICLE),
+    "breaking_news": lambda epd: draw_breaking_news(epd, BREAKING),
+    "token_month": lambda epd: draw_month_usage(epd, TOKEN_USAGE),
+    "token_limits": lambda epd: draw_usage_limits(epd, TOKEN_USAGE),
+    "ynab": lambda epd: draw_ynab_view(epd, YNAB, "month", now=datetime(2026, 7, 11)),
+    "home_assistant": lambda epd: draw_home_assistant_screen(
+        epd, HOME_ASSISTANT, HOME_ASSISTANT_STATES
+    ),
+}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_kib() -> int:
+    """Process peak RSS in KiB (ru_maxrss is reported in bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def bench_screen(render, epd, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        render(epd)
+
+    samples = []
+    gc.collect()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        render(epd)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    # Measured on its own render: tracing slows every allocation down.
+    tracemalloc.start()
+    try:
+        render(epd)
+        _, alloc_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "max_ms": round(max(samples), 3),
+        "alloc_peak_kib": round(alloc_peak / 1024, 1),
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def run(screens: list[str], modes: list[str], iterations: int, warmup: int) -> dict:
+    results: dict[str, dict] = {}
+    for mode in modes:
+        os.environ["mock_display_type"] = MODES[mode]
+        epd = MockDisplay()
+        for screen in screens:
+            results[f"{screen}/{mode}"] = bench_screen(
+                SCREENS[screen], epd, iterations, warmup
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return one line per metric that regressed by more than ``threshold``."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if change > threshold:
+                regressions.append(
+                    f"{key} {metric}: {before} -> {after} (+{change:.0%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--screens", nargs="+", choices=sorted(SCREENS), default=list(SCREENS)
+    )
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=list(MODES))
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="baseline report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown before --compare fails (default: 0.25)",
+    )
+    args = parser.parse_args()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    output = args.output.resolve() if args.output else None
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        results = run(args.screens, args.modes, args.iterations, args.warmup)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "screens": results,
+    }
+    if output:
+        output.write_text(json.dumps(report, indent=2) + "\n")
+    print(json.dumps(report, indent=2))
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline.get("screens", {}), args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
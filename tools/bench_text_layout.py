@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compare memoized, bisected text fitting with the former linear size scan."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from PIL import Image, ImageDraw
+
+import text_layout
+from font_utils import get_font_paths, load_font
+
+
+# Calendar summary, RSS title and breaking-news headline areas.
+CASES = [
+    ("calendar summary", "Quarterly planning review with the design team", "dejavu_bold", 13, 24, 236, 58, 3),
+    ("rss title", "Regional rail timetable changes take effect next Monday across the network", "dejavu", 11, 20, 196, 64, 4),
+    ("breaking news", "Storm warning issued for the lake region; ferries suspended until further notice", "dejavu_bold", 12, 30, 236, 82, None),
+    ("overflowing text", " ".join(["Lorem ipsum dolor sit amet"] * 12), "dejavu", 11, 24, 236, 70, 4),
+]
+
+
+def legacy_ellipsize(draw, text, font, max_width):
+    """The one-character-at-a-time trim before prefix bisection."""
+    text = " ".join(str(text).split())
+    if draw.textbbox((0, 0), text, font=font)[2] <= max_width:
+        return text
+    while text and draw.textbbox((0, 0), text + "…", font=font)[2] > max_width:
+        text = text[:-1]
+    return text.rstrip() + "…" if text else "…"
+
+
+def legacy_fit(draw, text, font_path, min_size, max_size, max_width, max_height, max_lines, spacing=2):
+    """The linear min_size..max_size scan with an uncached textbbox per line."""
+
+    def width(value, font):
+        return draw.textbbox((0, 0), value, font=font)[2]
+
+    def wrap(font):
+        lines, current = [], ""
+        for word in " ".join(text.split()).split():
+            candidate = f"{current} {word}".strip()
+            if current and width(candidate, font) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        return lines + [current] if current else lines
+
+    def metrics(font):
+        bounds = draw.textbbox((0, 0), "Ag", font=font)
+        return max(1, bounds[3] - bounds[1] + spacing), max(1, bounds[3])
+
+    best = None
+    for size in range(min_size, max_size + 1):
+        font = load_font(font_path, size)
+        lines = wrap(font)
+        advance, bottom = metrics(font)
+        height = (len(lines) - 1) * advance + bottom if lines else 0
+        if (max_lines is not None and len(lines) > max_lines) or height > max_height or any(
+            width(line, font) > max_width for line in lines
+        ):
+            break
+        best = (tuple(lines), size)
+    if best is not None:
+        return best
+    font = load_font(font_path, min_size)
+    advance, bottom = metrics(font)
+    lines = wrap(font) or [""]
+    line_limit = max(1, 1 + max(0, max_height - bottom) // advance)
+    if max_lines is not None:
+        line_limit = min(line_limit, max_lines)
+    visible = lines[:line_limit]
+    visible[-1] = legacy_ellipsize(draw, visible[-1] + "…", font, max_width)
+    return tuple(visible), min_size
+
+
+def best_of(function, iterations: int, repeats: int = 3) -> float:
+    """Return the best mean seconds per call over a few repeats."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    draw = ImageDraw.Draw(Image.new("1", (250, 120), 1))
+    paths = get_font_paths()
+
+    print(f"{'case':<20}{'legacy ms':>11}{'cold ms':>10}{'warm ms':>10}{'speedup':>10}")
+    for name, text, role, min_size, max_size, max_width, max_height, max_lines in CASES:
+        arguments = dict(
+            min_size=min_size,
+            max_size=max_size,
+            max_width=max_width,
+            max_height=max_height,
+            max_lines=max_lines,
+        )
+
+        def fit():
+            return text_layout.fit_wrapped_text(draw, text, paths[role], **arguments)
+
+        def cold_fit():
+            text_layout._measurements.clear()
+            return fit()
+
+        expected = legacy_fit(draw, text, paths[role], *arguments.values())
+        fitted = fit()
+        assert (fitted.lines, fitted.size) == expected, name
+
+        legacy = best_of(lambda: legacy_fit(draw, text, paths[role], *arguments.values()), args.iterations)
+        cold = best_of(cold_fit, args.iterations)
+        warm = best_of(fit, args.iterations)
+        print(
+            f"{name:<20}{legacy * 1000:>11.3f}{cold * 1000:>10.3f}"
+            f"{warm * 1000:>10.3f}{legacy / cold:>9.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
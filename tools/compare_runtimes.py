@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Compare the threaded and asyncio (``display_runtime``) modes offline.
+
+Each mode runs in a fresh child process for ``--duration`` seconds. The
+fetchers moved onto the runtime are simulated at their default cadences
+(weather every 60 s, token usage 300 s, YNAB 900 s, calendar and the YNAB
+glance every second), plus ``--extra-fetchers`` more every ``--interval``
+seconds. Each fetch sleeps ``--io-ms`` to stand in for a network call, then
+draws a small frame. In threaded mode every fetcher owns a thread that sleeps
+on an Event, as the components do; in asyncio mode they are ``IoRuntime``
+jobs, and the calendar and glance jobs sleep until their next deadline while
+idle (the calendar client's 300 s refresh, the 1800 s glance window) instead
+of polling every second.
+
+The report gives each child's thread count, RSS and wakeups per minute, summed
+over its threads' context switches from /proc.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from io_runtime import IoRuntime
+
+DEFAULT_FETCHERS = {
+    "weather": 60.0,
+    "token-usage": 300.0,
+    "ynab": 900.0,
+    "calendar": 1.0,
+    "ynab-glance": 1.0,
+}
+# Idle cadences of the deadline-scheduled runtime jobs.
+RUNTIME_IDLE_INTERVALS = {"calendar": 300.0, "ynab-glance": 1800.0}
+
+
+def _render(_result=None) -> None:
+    image = Image.new("1", (250, 120), 1)
+    ImageDraw.Draw(image).text((10, 40), time.strftime("%H:%M:%S"), fill=0)
+
+
+def _context_switches() -> int:
+    total = 0
+    for status in Path("/proc/self/task").glob("*/status"):
+        try:
+            for line in status.read_text().splitlines():
+                if line.startswith(("voluntary_ctxt", "nonvoluntary_ctxt")):
+                    total += int(line.split()[1])
+        except OSError:
+            continue
+    return total
+
+
+def _rss_kib() -> int | None:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    return None
+
+
+def measure(args: argparse.Namespace) -> dict:
+    """Child process: run one mode and report its footprint."""
+    fetchers = dict(DEFAULT_FETCHERS)
+    for index in range(args.extra_fetchers):
+        fetchers[f"extra-{index}"] = args.interval
+
+    def fetch() -> None:
+        time.sleep(args.io_ms / 1000)
+
+    stop = threading.Event()
+    runtime = None
+    if args.serve == "asyncio":
+        runtime = IoRuntime(io_workers=args.io_workers)
+        for name, interval in fetchers.items():
+            interval = RUNTIME_IDLE_INTERVALS.get(name, interval)
+            runtime.every(name, fetch, interval, render=_render)
+    else:
+        def loop(interval: float) -> None:
+            while not stop.wait(interval):
+                fetch()
+                _render()
+
+        for name, interval in fetchers.items():
+            threading.Thread(
+                target=loop, args=(interval,), name=name, daemon=True
+            ).start()
+
+    time.sleep(args.warmup)
+    switches = _context_switches()
+    started = time.monotonic()
+    threads = threading.active_count()
+    time.sleep(args.duration)
+    elapsed = time.monotonic() - started
+    report = {
+        "mode": args.serve,
+        "fetchers": len(fetchers),
+        "threads": max(threads, threading.active_count()),
+        "rss_kib": _rss_kib(),
+        "wakeups_per_minute": round(
+            (_context_switches() - switches) / elapsed * 60
+        ),
+    }
+    stop.set()
+    if runtime is not None:
+        runtime.stop()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--extra-fetchers", type=int, default=0)
+    parser.add_argument("--interval", type=float, default=30.0)
+    parser.add_argument("--io-ms", type=float, default=50.0)
+    parser.add_argument("--io-workers", type=int, default=2)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument(
+        "--serve", choices=("threads", "asyncio"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+    if args.duration <= 0 or args.interval <= 0 or args.extra_fetchers < 0:
+        parser.error("--duration and --interval must be positive")
+    if args.serve:
+        print(json.dumps(measure(args)))
+        return 0
+
+    results = []
+    for mode in ("threads", "asyncio"):
+        command = [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "--serve", mode,
+            "--duration", str(args.duration),
+            "--warmup", str(args.warmup),
+            "--extra-fetchers", str(args.extra_fetchers),
+            "--interval", str(args.interval),
+            "--io-ms", str(args.io_ms),
+            "--io-workers", str(args.io_workers),
+        ]
+        output = subprocess.run(command, check=True, capture_output=True, text=True)
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    for result in results:
+        print(
+            "{mode}: {fetchers} fetchers, {threads} threads, RSS {rss_kib} KiB, "
+            "{wakeups_per_minute} wakeups/min".format(**result)
+        )
+    if args.output:
+        args.output.write_text(json.dumps({"results": results}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Load-test display_server with many simulated display clients, offline.
+
+The render server (``create_app`` on threaded werkzeug, as in production) runs
+in a child process on loopback. A stand-in publisher there publishes synthetic
+countdown frames at ``--publish-rate`` frames per second; no data source or
+network beyond loopback is touched. ``--clients`` real ``FrameClient``
+instances, spread over ``--workers`` processes, poll it with bearer tokens,
+ETags and 304s (and long polls with ``--long-poll``). Their panels discard
+frames after verification.
+
+The report gives request rate, poll latency percentiles per result, error
+categories, and the server process's CPU (share of one core) and RSS read from
+/proc, plus the generator's own CPU so a saturated generator is visible.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import requests
+from PIL import Image, ImageDraw
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from display_client import FrameClient, categorize_poll_error
+from display_protocol import (
+    FRAME_HEIGHT,
+    FRAME_WIDTH,
+    FramePublisher,
+    parse_utc,
+    utc_now,
+)
+from display_server import create_app
+
+TOKEN = "load-test-token"
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def countdown_frame(tick: int) -> Image.Image:
+    image = Image.new("1", (FRAME_WIDTH, FRAME_HEIGHT), 1)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, FRAME_WIDTH - 1, 22), fill=0)
+    draw.text((10, 40), "Line 71  Delta", fill=0)
+    draw.text((200, 40), f"{tick % 60} min", fill=0)
+    draw.text((10, 70), f"Line N10  {tick // 60 % 24:02d}:{tick % 60:02d}", fill=0)
+    return image
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Child process: the render server plus a synthetic frame publisher."""
+    from werkzeug.serving import make_server
+
+    # One access-log line per request would dominate the server's CPU.
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    stopping = threading.Event()
+    with tempfile.TemporaryDirectory(prefix="load-test-frames-") as directory:
+        publisher = FramePublisher(
+            directory,
+            flush_interval_seconds=args.flush_interval,
+            history_frames=args.history_frames,
+        )
+        publisher.publish(countdown_frame(0))
+        app = create_app(
+            publisher, token=TOKEN, long_poll_max_seconds=max(args.long_poll, 1.0)
+        )
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+
+        def publish_frames():
+            tick = 1
+            while args.publish_rate > 0 and not stopping.wait(1 / args.publish_rate):
+                publisher.publish(countdown_frame(tick))
+                tick += 1
+
+        def stop(_signum=None, _frame=None):
+            stopping.set()
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        threading.Thread(target=publish_frames, daemon=True).start()
+        print(f"PORT {server.server_port}", flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            publisher.close()
+    return 0
+
+
+class DiscardingPanel:
+    """A B&W panel that accepts every buffer and drops it."""
+
+    width = 122
+    height = 250
+
+    def __init__(self, packed: bool) -> None:
+        self.accepts_packed_frames = packed
+
+    def init(self):
+        return None
+
+    def init_Fast(self):
+        return None
+
+    def Clear(self):
+        return None
+
+    def getbuffer(self, image):
+        return image
+
+    def display(self, buffer):
+        return None
+
+    def displayPartial(self, buffer):
+        return None
+
+    def displayPartBaseImage(self, buffer):
+        return None
+
+
+def run_clients(
+    url: str,
+    clients: int,
+    duration: float,
+    poll_interval: float,
+    long_poll: float,
+    packed: bool,
+) -> dict:
+    """Worker process: ``clients`` FrameClients polling until the deadline."""
+    deadline = time.monotonic() + duration
+    latencies: dict[str, list[float]] = {}
+    # Publication to verified receipt, for every new frame a client took.
+    deliveries: list[float] = []
+    errors: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    def simulate(index: int) -> None:
+        client = FrameClient(
+            DiscardingPanel(packed),
+            url=url,
+            token=TOKEN,
+            long_poll_seconds=long_poll,
+            timeout_seconds=10,
+        )
+        # Every client owns its panel; they must not share the process-wide lock.
+        client.display_lock = threading.Lock()
+        time.sleep(random.Random(index).uniform(0, poll_interval))
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                result = client.poll_once()
+                status = result.status
+            except (requests.RequestException, ValueError, KeyError) as exc:
+                status = None
+                category = categorize_poll_error(exc)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if status is None:
+                    errors[category] += 1
+                else:
+                    latencies.setdefault(status, []).append(elapsed)
+                if status == "displayed":
+                    delivered = utc_now() - parse_utc(result.frame_source_created_at)
+                    deliveries.append(delivered.total_seconds() * 1000)
+            pause = 0.0 if status and client.long_polling else poll_interval
+            remaining = min(pause, deadline - time.monotonic())
+            if remaining > 0:
+                time.sleep(remaining)
+
+    started_cpu = time.process_time()
+    threads = [
+        threading.Thread(target=simulate, args=(index,), daemon=True)
+        for index in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "latencies": latencies,
+        "deliveries": deliveries,
+        "errors": dict(errors),
+        "cpu_seconds": time.process_time() - started_cpu,
+    }
+
+
+def _proc_cpu_seconds(pid: int) -> float | None:
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are fields 14 and 15 of stat; 11 and 12 after the name.
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _proc_memory_kib(pid: int) -> dict:
+    memory = {}
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in {"VmRSS", "VmHWM"}:
+                memory[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return {"rss_kib": memory.get("VmRSS"), "peak_rss_kib": memory.get("VmHWM")}
+
+
+def load_test(args: argparse.Namespace) -> dict:
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--serve",
+        "--publish-rate", str(args.publish_rate),
+        "--long-poll", str(args.long_poll),
+        "--flush-interval", str(args.flush_interval),
+        "--history-frames", str(args.history_frames),
+    ]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        line = ""
+        while not line.startswith("PORT "):
+            line = server.stdout.readline()
+            if not line:
+                raise RuntimeError("the load-test server exited before listening")
+        port = int(line.split()[1])
+        base = f"http://127.0.0.1:{port}/api/v1"
+        url = f"{base}/frame.png"
+        server_cpu = _proc_cpu_seconds(server.pid)
+        workers = max(1, min(args.workers, args.clients))
+        shares = [
+            args.clients // workers + (index < args.clients % workers)
+            for index in range(workers)
+        ]
+        started = time.monotonic()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    run_clients,
+                    [url] * workers,
+                    shares,
+                    [args.duration] * workers,
+                    [args.poll_interval] * workers,
+                    [args.long_poll] * workers,
+                    [args.packed] * workers,
+                )
+            )
+        elapsed = time.monotonic() - started
+        server_cpu_after = _proc_cpu_seconds(server.pid)
+        memory = _proc_memory_kib(server.pid)
+        status = requests.get(
+            f"{base}/status", headers={"Authorization": f"Bearer {TOKEN}"}, timeout=5
+        ).json()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    latencies: dict[str, list[float]] = {}
+    deliveries: list[float] = []
+    errors: Counter[str] = Counter()
+    for result in results:
+        for name, samples in result["latencies"].items():
+            latencies.setdefault(name, []).extend(samples)
+        deliveries.extend(result["deliveries"])
+        errors.update(result["errors"])
+    every = [sample for samples in latencies.values() for sample in samples]
+    requests_made = len(every) + sum(errors.values())
+
+    def summary(samples: list[float]) -> dict:
+        return {
+            "count": len(samples),
+            "p50_ms": round(percentile(samples, 0.50), 2),
+            "p90_ms": round(percentile(samples, 0.90), 2),
+            "p99_ms": round(percentile(samples, 0.99), 2),
+            "max_ms": round(max(samples), 2),
+        }
+
+    return {
+        "clients": args.clients,
+        "workers": workers,
+        "duration_seconds": round(elapsed, 2),
+        "publish_rate": args.publish_rate,
+        "poll_interval_seconds": args.poll_interval,
+        "long_poll_seconds": args.long_poll,
+        "packed": args.packed,
+        "requests": requests_made,
+        "requests_per_second": round(requests_made / elapsed, 1),
+        "latency": summary(every) if every else None,
+        "latency_by_result": {
+            name: summary(samples) for name, samples in sorted(latencies.items())
+        },
+        "delivery": summary(deliveries) if deliveries else None,
+        "errors": dict(errors),
+        "frames_published": status["frame"]["sequence"],
+        "server": {
+            "cpu_percent": (
+                round((server_cpu_after - server_cpu) / elapsed * 100, 1)
+                if server_cpu is not None and server_cpu_after is not None
+                else None
+            ),
+            **memory,
+            "publisher": status["publisher"],
+        },
+        "generator_cpu_percent": round(
+            sum(result["cpu_seconds"] for result in results) / elapsed * 100, 1
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument(
+        "--long-poll", type=float, default=0.0, help="client long poll seconds; 0 polls"
+    )
+    parser.add_argument(
+        "--publish-rate", type=float, default=1 / 30, help="frames per second"
+    )
+    parser.add_argument(
+        "--packed", action="store_true", help="simulate packed B&W panels (frame.bin)"
+    )
+    parser.add_argument("--flush-interval", type=float, default=30.0)
+    parser.add_argument("--history-frames", type=int, default=120)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args)
+    if args.clients < 1 or args.duration <= 0 or args.poll_interval < 0:
+        parser.error("--clients and --duration must be positive")
+
+    report = load_test(args)
+    latency = report["latency"] or {}
+    print(
+        f"{report['clients']} clients: {report['requests_per_second']} req/s, "
+        f"p50 {latency.get('p50_ms')} ms, p99 {latency.get('p99_ms')} ms, "
+        f"delivery p50 {(report['delivery'] or {}).get('p50_ms')} ms, "
+        f"server CPU {report['server']['cpu_percent']}%, "
+        f"RSS {report['server']['rss_kib']} KiB, errors {report['errors'] or 'none'}"
+    )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,9 @@ import qrcode
 from io import BytesIO
 import logging
 from dithering import process_icon_for_epd
-from font_utils import get_font_paths
+from font_utils import get_font
 from display_adapter import return_display_lock
+from panel_orientation import panel_frame
 from astronomy_utils import get_moon_phase
 import log_config
 import json
@@ -16,8 +17,13 @@ import traceback
 from pathlib import Path
 from backoff import ExponentialBackoff
 from weather.providers.factory import create_weather_provider
-from weather.icons import WEATHER_ICONS, ICONS_DIR
-import cairosvg
+from weather.icons import (
+    WEATHER_ICONS,
+    ICONS_DIR,
+    cached_icon_path,
+    read_cached_icon,
+    write_cached_icon,
+)
 from typing import Tuple
 from functools import lru_cache
 from weather.models import TemperatureUnit
@@ -28,44 +34,61 @@ logger = logging.getLogger(__name__)
 show_sunshine = os.getenv('show_sunshine_hours', 'true').lower() == 'true'
 show_precipitation = os.getenv('show_precipitation', 'true').lower() == 'true'
 
+def _rasterize_svg_icon(svg_path: Path, size: Tuple[int, int], bw: bool) -> Image.Image:
+    """Render an SVG onto a white background in the display's image mode."""
+    # Imported here so processes whose icons are all cached never load cairo.
+    import cairosvg
+
+    # Convert SVG to PNG in memory with transparency
+    png_data = cairosvg.svg2png(
+        url=str(svg_path),
+        output_width=size[0],
+        output_height=size[1],
+        background_color="transparent"
+    )
+
+    # Create PIL Image from PNG data
+    icon = Image.open(BytesIO(png_data))
+
+    # Create a white background image
+    if bw:
+        bg = Image.new('1', icon.size, 1)  # 1 = white
+    else:
+        bg = Image.new('RGB', icon.size, 'white')
+
+    # Convert icon to RGBA to handle transparency
+    icon = icon.convert('RGBA')
+
+    # Paste the icon onto the white background using the alpha channel as mask
+    bg.paste(icon, (0, 0), icon.split()[3])
+
+    # Convert to final mode
+    if bw:
+        return bg.convert('1')
+    return bg.convert('RGB')
+
+
 @lru_cache(maxsize=1000)
+def _load_svg_icon(svg_path: Path, size: Tuple[int, int], bw: bool) -> Image.Image:
+    mode = '1' if bw else 'RGB'
+    cache_path = cached_icon_path(svg_path, size, mode)
+    icon = read_cached_icon(cache_path, size, mode)
+    if icon is None:
+        icon = _rasterize_svg_icon(svg_path, size, bw)
+        write_cached_icon(cache_path, icon)
+    logger.debug(f"Loaded SVG with mode: {icon.mode}, size: {icon.size}")
+    return icon
+
+
 def load_svg_icon(svg_path: Path, size: Tuple[int, int], epd) -> Image.Image:
     """Load and resize an SVG icon.
     
-    Size is a tuple of (width, height)
+    Size is a tuple of (width, height). Rasters are kept on disk by SVG
+    content hash, size and display mode, so restarts and other processes
+    reuse them instead of running cairosvg again.
     """
     try:
-        # Convert SVG to PNG in memory with transparency
-        png_data = cairosvg.svg2png(
-            url=str(svg_path),
-            output_width=size[0],
-            output_height=size[1],
-            background_color="transparent"
-        )
-        
-        # Create PIL Image from PNG data
-        icon = Image.open(BytesIO(png_data))
-        
-        # Create a white background image
-        if epd.is_bw_display:
-            bg = Image.new('1', icon.size, 1)  # 1 = white
-        else:
-            bg = Image.new('RGB', icon.size, 'white')
-            
-        # Convert icon to RGBA to handle transparency
-        icon = icon.convert('RGBA')
-        
-        # Paste the icon onto the white background using the alpha channel as mask
-        bg.paste(icon, (0, 0), icon.split()[3])
-        
-        # Convert to final mode
-        if epd.is_bw_display:
-            bg = bg.convert('1')
-        else:
-            bg = bg.convert('RGB')
-            
-        logger.debug(f"Loaded SVG with mode: {bg.mode}, size: {bg.size}")
-        return bg
+        return _load_svg_icon(Path(svg_path), tuple(size), bool(epd.is_bw_display))
     except Exception as e:
         logger.error(f"Error loading SVG icon {svg_path}: {e}")
         return None
@@ -314,14 +337,13 @@ def draw_weather_display(epd, weather_data, last_weather_data=None, set_base_ima
         Himage = Image.new('RGB', (epd.height, epd.width), WHITE)
         
     draw = ImageDraw.Draw(Himage)
-    font_paths = get_font_paths()
     try:
-        font_xl = ImageFont.truetype(font_paths['dejavu_bold'], 42)
-        font_large = ImageFont.truetype(font_paths['dejavu_bold'], 28)
-        font_medium = ImageFont.truetype(font_paths['dejavu'], 16)
-        font_emoji = ImageFont.truetype(font_paths['emoji'], 16)
-        font_small = ImageFont.truetype(font_paths['dejavu'], 14)
-        font_tiny = ImageFont.truetype(font_paths['dejavu'], 10)
+        font_xl = get_font("dejavu_bold", 42)
+        font_large = get_font("dejavu_bold", 28)
+        font_medium = get_font("dejavu", 16)
+        font_emoji = get_font("emoji", 16)
+        font_small = get_font("dejavu", 14)
+        font_tiny = get_font("dejavu", 10)
     except Exception as e:
         logger.error(f"Error loading fonts: {e}")
         font_xl = ImageFont.load_default()
@@ -614,7 +636,7 @@ def draw_weather_display(epd, weather_data, last_weather_data=None, set_base_ima
     # draw.rectangle([(0, 0), (Himage.width-1, Himage.height-1)], outline=border_color)
 
     # Rotate the image 90 degrees
-    Himage = Himage.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    Himage = panel_frame(epd, Himage, DISPLAY_SCREEN_ROTATION)
 
     with display_lock:
         # Display the image
@@ -1,9 +1,14 @@
 """Weather icons and icon mapping."""
 
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional, Tuple
+import hashlib
 import os
 import logging
 
+from PIL import Image
+
 logger = logging.getLogger(__name__)
 
 # Icon paths
@@ -26,4 +31,43 @@ WEATHER_ICONS = {
     'cloud-moon-rain': '🌧',
     'moon': '🌙',
     'unknown': '?',
-} 
\ No newline at end of file
+}
+
+
+def icon_cache_dir() -> Path:
+    """Directory of rasterized icons shared by every process on this host."""
+    return Path(os.getenv("weather_icon_cache_dir", str(CACHE_DIR))).expanduser()
+
+
+@lru_cache(maxsize=None)
+def svg_digest(svg_path: Path) -> str:
+    """Content hash of an SVG, so edited icons never reuse stale rasters."""
+    return hashlib.sha256(Path(svg_path).read_bytes()).hexdigest()
+
+
+def cached_icon_path(svg_path: Path, size: Tuple[int, int], mode: str) -> Path:
+    """Location of the raster for an SVG at a size in a display mode ('1' or 'RGB')."""
+    return icon_cache_dir() / f"{svg_digest(svg_path)[:32]}-{size[0]}x{size[1]}-{mode}.png"
+
+
+def read_cached_icon(path: Path, size: Tuple[int, int], mode: str) -> Optional[Image.Image]:
+    """Return a cached raster, or None when it is missing or does not match."""
+    try:
+        with Image.open(path) as cached:
+            cached.load()
+            if cached.size != tuple(size) or cached.mode != mode:
+                return None
+            return cached.copy()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def write_cached_icon(path: Path, icon: Image.Image) -> None:
+    """Atomically store a raster; a read-only cache only costs a re-render."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        icon.save(temporary, format="PNG")
+        temporary.replace(path)
+    except OSError as exc:
+        logger.warning("Could not persist icon cache %s (%s)", path.name, type(exc).__name__)
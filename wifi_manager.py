@@ -9,6 +9,8 @@ import platform
 from PIL import Image, ImageDraw, ImageFont
 import qrcode
 from display_adapter import return_display_lock
+from font_utils import load_font
+from panel_orientation import panel_frame
 logger = logging.getLogger(__name__)
 dotenv.load_dotenv(override=True)
 app = Flask(__name__)
@@ -261,8 +263,8 @@ def show_no_wifi_display(epd):
     draw = ImageDraw.Draw(Himage)
     
     try:
-        font_tiny = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', 8)
-        font_medium = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 16)
+        font_tiny = load_font('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', 8)
+        font_medium = load_font('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 16)
     except:
         font_medium = ImageFont.load_default()
         font_tiny = font_medium
@@ -319,7 +321,7 @@ def show_no_wifi_display(epd):
     draw.rectangle([(0, 0), (Himage.width-1, Himage.height-1)], outline=epd.BLACK)
 
     # Rotate the image 90 degrees
-    Himage = Himage.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    Himage = panel_frame(epd, Himage, DISPLAY_SCREEN_ROTATION)
     
     # Display the image
     with display_lock:
@@ -209,6 +209,13 @@ class YnabBudgetClient:
                 self._last_fetch_monotonic = time.monotonic()
             return snapshot
 
+    def cached_snapshot(self) -> Optional[YnabSnapshot]:
+        """The last fetched snapshot, without touching the API or the cache."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._snapshot
+
 
 def configured_views() -> List[str]:
     allowed = {"month", "daily", "active", "funding", "exception"}
@@ -10,7 +10,8 @@ from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 
 from display_adapter import return_display_lock
-from font_utils import get_font_paths
+from font_utils import get_font
+from panel_orientation import panel_frame
 from ynab_budget import YnabSnapshot
 
 display_lock = return_display_lock()
@@ -19,13 +20,12 @@ DISPLAY_SCREEN_ROTATION = int(os.getenv("screen_rotation", "90"))
 
 @lru_cache(maxsize=1)
 def _fonts():
-    paths = get_font_paths()
     try:
         return (
-            ImageFont.truetype(paths["dejavu_bold"], 13),
-            ImageFont.truetype(paths["dejavu_bold"], 25),
-            ImageFont.truetype(paths["dejavu_bold"], 10),
-            ImageFont.truetype(paths["dejavu"], 9),
+            get_font("dejavu_bold", 13),
+            get_font("dejavu_bold", 25),
+            get_font("dejavu_bold", 10),
+            get_font("dejavu", 9),
         )
     except OSError:
         fallback = ImageFont.load_default()
@@ -42,7 +42,7 @@ def _canvas(epd):
 
 
 def _finish(epd, image, set_base_image):
-    image = image.rotate(DISPLAY_SCREEN_ROTATION, expand=True)
+    image = panel_frame(epd, image, DISPLAY_SCREEN_ROTATION)
     with display_lock:
         buffer = epd.getbuffer(image)
         if hasattr(epd, "displayPartial"):
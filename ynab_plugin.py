@@ -36,6 +36,7 @@ class YnabGlancePlugin:
         on_release: Optional[Callable[[], None]] = None,
         is_current: Optional[Callable[[], bool]] = None,
         base_mode_at: Optional[Callable[[datetime], str]] = None,
+        runtime=None,
     ):
         self.epd = epd
         self.arbiter = arbiter
@@ -67,24 +68,40 @@ class YnabGlancePlugin:
         self._was_selected = False
         self._stop_event = threading.Event()
         self._thread = None
+        self.runtime = runtime
+        self._task = None
 
     def start(self):
         if not self.enabled:
             return
         if self._thread and self._thread.is_alive():
             return
+        if self._task is not None and self._task.running():
+            return
         self._thread = None
         self._stop_event.clear()
-        self._thread = threading.Thread(
-            target=self._run,
-            name="YnabGlancePlugin",
-            daemon=True,
-        )
-        self._thread.start()
+        if self.runtime is not None:
+            self._task = self.runtime.every(
+                "YnabGlancePlugin",
+                self._fetch,
+                lambda: self._seconds_until_due(datetime.now()),
+                render=self._update,
+                on_error=self._failed,
+            )
+        else:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="YnabGlancePlugin",
+                daemon=True,
+            )
+            self._thread.start()
         logger.info("YNAB glance plugin started")
 
     def stop(self):
         self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
         thread = self._thread
         if thread:
             thread.join(timeout=1.0)
@@ -95,17 +112,25 @@ class YnabGlancePlugin:
     def _run(self):
         while not self._stop_event.is_set():
             try:
-                now = datetime.now()
-                snapshot = self.client.get_snapshot() if self._is_due(now) else None
-                now = datetime.now()
+                snapshot = self._fetch()
                 if self._stop_event.is_set():
                     break
-                self.tick(now, snapshot)
+                self._update(snapshot)
             except Exception as exc:
-                logger.error("YNAB glance update failed (%s)", type(exc).__name__)
-                self._release()
+                self._failed(exc)
             self._stop_event.wait(self.poll_seconds)
 
+    def _fetch(self):
+        return self.client.get_snapshot() if self._is_due(datetime.now()) else None
+
+    def _update(self, snapshot):
+        if not self._stop_event.is_set():
+            self.tick(datetime.now(), snapshot)
+
+    def _failed(self, exc):
+        logger.error("YNAB glance update failed (%s)", type(exc).__name__)
+        self._release()
+
     def tick(self, now: datetime, snapshot: Optional[YnabSnapshot]):
         if not self.enabled or not self._is_due(now):
             self._release()
@@ -164,6 +189,20 @@ class YnabGlancePlugin:
                 return False
         return self._cycle_position(now) < self.duration
 
+    def _seconds_until_due(self, now: datetime) -> float:
+        """Seconds a runtime job may sleep before the next tick matters.
+
+        Inside a glance window the claim is refreshed every poll; the first
+        tick after it releases the claim, and the job then sleeps until the
+        next window opens.
+        """
+        if not self.enabled or not self.interval or not self.duration:
+            return float(max(self.poll_seconds, self.interval or 3600))
+        position = self._cycle_position(now)
+        if position < self.duration or self._was_selected:
+            return float(self.poll_seconds)
+        return float(max(self.poll_seconds, self.interval - position))
+
     def _absolute_seconds(self, now: datetime) -> int:
         seconds_since_midnight = now.hour * 3600 + now.minute * 60 + now.second
         return now.toordinal() * 86400 + seconds_since_midnight